@@ -0,0 +1,58 @@
+import datetime
+from wowapi import MultiRegionAPI
+from wowapi.aggregate import PriceAggregator, ensure_price_history_indexes, write_price_history
+from wowapi.archive import SnapshotArchive
+from wowapi.ingest import IncrementalIngestor, write_auction_delta
+from wowapi.poller import AuctionPoller
+from pymongo import MongoClient
+from pylog import get_logger
+from dotenv import load_dotenv
+
+load_dotenv()
+
+REGIONS = ("us", "eu")
+
+# ah_scan.py has always written US auctions to "commodities"
+COLLECTIONS = {"us": "commodities"}
+
+logger = get_logger("auction_poller",
+                    local_mongo_uri="mongodb://localhost:27017",
+                    local_db_name="wow",
+                    local_collection_name="logs"
+                    )
+
+client = MongoClient("mongodb://localhost:27017")
+db = client.get_database("wow")
+price_collection = db.get_collection("price_history")
+ensure_price_history_indexes(price_collection)
+
+ingestors = {region: IncrementalIngestor(f".cache/commodities-{region}.npz") for region in REGIONS}
+aggregators = {region: PriceAggregator(f".cache/prices-{region}.npz") for region in REGIONS}
+archives = {region: SnapshotArchive(f"archive/commodities-{region}") for region in REGIONS}
+
+def archive_snapshot(region, snapshot):
+    archives[region].write(snapshot)
+
+def ingest_snapshot(region, snapshot):
+    # Write only the delta against the previous snapshot, as ah_scan.py does
+    ingestor = ingestors[region]
+    collection = db.get_collection(COLLECTIONS.get(region, f"commodities_{region}"))
+    collection.create_index("id")
+    diff = ingestor.diff(snapshot)
+    ts = datetime.datetime.now(datetime.timezone.utc)
+    new, changed, removed = write_auction_delta(collection, snapshot, diff, ts)
+    ingestor.commit(snapshot)
+    logger.info(f"{region}: added {new} new, updated {changed} and marked {removed} removed auctions.")
+
+def aggregate_snapshot(region, snapshot):
+    write_price_history(price_collection, aggregators[region], snapshot, region)
+
+if __name__ == "__main__":
+    with MultiRegionAPI(REGIONS) as api:
+        poller = AuctionPoller(
+            api.clients.values(),
+            sinks=[archive_snapshot, ingest_snapshot, aggregate_snapshot],
+            state_path=".cache/ah-poller.json",
+        )
+        stats = poller.run()
+    logger.info(f"Auction poller finished: {stats}")
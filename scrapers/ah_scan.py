@@ -1,4 +1,10 @@
+import datetime
 from wowapi import WoWAPI
+from wowapi.aggregate import PriceAggregator, ensure_price_history_indexes, write_price_history
+from wowapi.archive import SnapshotArchive
+from wowapi.ingest import IncrementalIngestor, write_auction_delta
+from wowapi.poller import parse_last_modified
+from wowapi.snapshot import CommoditySnapshot
 from pymongo import MongoClient
 from pylog import get_logger
 from dotenv import load_dotenv
@@ -15,24 +21,37 @@ if __name__ == "__main__":
 
     try:
         api = WoWAPI()
-        
-        # Fetch WoW AH data
-        commodities_data = api.get_ah_commodities_data()
+        ingestor = IncrementalIngestor(".cache/commodities-us.npz")
+        aggregator = PriceAggregator(".cache/prices-us.npz")
+        archive = SnapshotArchive("archive/commodities-us")
 
         # Connect to MongoDB
         client = MongoClient("mongodb://localhost:27017")
         db = client.get_database("wow")
         collection = db.get_collection("commodities")
+        collection.create_index("id")
+        price_collection = db.get_collection("price_history")
+        ensure_price_history_indexes(price_collection)
 
-        existing_ids = set(collection.distinct("id"))
-        new_auctions = [auction for auction in commodities_data["auctions"] if auction["id"] not in existing_ids]
-        
-        if new_auctions:
-            ts_data = [WoWAPI.add_timestamp(auction) for auction in new_auctions]
-            collection.insert_many(ts_data)
-            logger.info(f"Added {len(ts_data)} new auctions to the database.")
-        else:
-            logger.info("No new auctions to add.")
+        # Fetch WoW AH data stamped with its Last-Modified time, so a rerun before the
+        # next publication is recognized as the same snapshot by the aggregator
+        last_modified, auctions = api.open_ah_commodities()
+        try:
+            snapshot = CommoditySnapshot.from_auctions(auctions, timestamp=parse_last_modified(last_modified))
+        finally:
+            auctions.close()
+
+        # Diff it against the previous scan
+        archive.write(snapshot)
+        diff = ingestor.diff(snapshot)
+        ts = datetime.datetime.now(datetime.timezone.utc)
+
+        new, changed, removed = write_auction_delta(collection, snapshot, diff, ts)
+        ingestor.commit(snapshot)
+        logger.info(f"Added {new} new, updated {changed} and marked {removed} removed auctions.")
+
+        # Roll the snapshot into the hourly and daily price series
+        write_price_history(price_collection, aggregator, snapshot, "us")
 
     except Exception as e:
         logger.error(f"Error: {str(e)}")
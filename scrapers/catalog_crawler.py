@@ -0,0 +1,85 @@
+import logging
+import os
+from pymongo import MongoClient
+from wowapi.WoWapi import WoWAPI
+from wowapi.crawler import CatalogCrawler
+from wowapi.http_cache import ResponseCache
+from wowapi.metrics import RequestMetrics
+from wowapi.persistence import BulkWriter
+from dotenv import load_dotenv
+from pylog import get_logger
+
+load_dotenv()
+
+# MongoDB connection setup
+mongo_client = MongoClient("mongodb://localhost:27017")
+db = mongo_client["wow"]
+profession_collection = db["professions"]
+recipe_collection = db["recipes"]
+item_collection = db["reagents"]
+slot_type_cache_collection = db["slot_type_cache"]
+
+api_logger = get_logger(
+    "wowapi",
+    console=False,
+    file=False,
+    mongo_uri="mongodb://localhost:27018",
+    mongo_db_name="logs",
+    mongo_collection_name="testing",
+    log_level=logging.DEBUG,
+    app_name="Catalog Crawler",
+)
+
+scraper_logger = get_logger(
+    "scraper",
+    console=True,
+    file=False,
+    mongo_uri="mongodb://localhost:27018",
+    mongo_db_name="logs",
+    mongo_collection_name="testing",
+    log_level=logging.DEBUG,
+    app_name="Catalog Crawler",
+)
+
+metrics = RequestMetrics()
+api = WoWAPI(response_cache=ResponseCache(), pool_maxsize=32, metrics=metrics)
+
+def crawl_catalog():
+    scraper_logger.info("Crawling professions, skill tiers, recipes and reagents")
+
+    with BulkWriter(profession_collection) as profession_writer, \
+            BulkWriter(recipe_collection) as recipe_writer, \
+            BulkWriter(item_collection) as item_writer, \
+            BulkWriter(slot_type_cache_collection) as slot_type_writer:
+        crawler = CatalogCrawler(
+            api,
+            sinks={
+                CatalogCrawler.SKILL_TIER: profession_writer.add,
+                CatalogCrawler.RECIPE: recipe_writer.add,
+                CatalogCrawler.ITEM: item_writer.add,
+                CatalogCrawler.SLOT_TYPE: lambda slot_type: slot_type_writer.add({'id': slot_type['id'], 'data': slot_type}),
+            },
+            is_known={
+                CatalogCrawler.ITEM: item_writer.contains,
+                CatalogCrawler.SLOT_TYPE: slot_type_writer.contains,
+            },
+            skill_tier_filter=lambda tier: 'Khaz Algar' in tier['name'],
+            workers=32,
+        )
+        stats = crawler.run()
+
+    for (kind, key, _), error in stats.failed:
+        scraper_logger.error(f"Error crawling {kind} {key}: {str(error)}")
+    scraper_logger.info(f"Finished crawling catalog: {stats}")
+
+    # Export request metrics for the node_exporter textfile collector
+    os.makedirs(".cache/metrics", exist_ok=True)
+    with open(".cache/metrics/catalog_crawler.prom", "w") as f:
+        f.write(metrics.to_prometheus())
+    for (region, template), summary in metrics.summary().items():
+        scraper_logger.info(f"{region} {template}: {summary['requests']} requests, "
+                            f"{summary['mean_latency'] * 1000:.0f}ms mean, {summary['retries']} retries, "
+                            f"cache {summary['cache']}")
+
+if __name__ == "__main__":
+    crawl_catalog()
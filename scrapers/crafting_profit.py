@@ -0,0 +1,72 @@
+import datetime
+import logging
+import time
+import numpy as np
+from pymongo import MongoClient
+from wowapi.category_index import CategoryIndex
+from wowapi.ingest import IncrementalIngestor
+from wowapi.persistence import BulkWriter
+from wowapi.profit import RecipeBook, slot_options_from
+from dotenv import load_dotenv
+from pylog import get_logger
+
+load_dotenv()
+
+# MongoDB connection setup
+mongo_client = MongoClient("mongodb://localhost:27017")
+db = mongo_client["wow"]
+recipe_collection = db["recipes"]
+item_collection = db["reagents"]
+slot_type_cache_collection = db["slot_type_cache"]
+profit_collection = db["recipe_profits"]
+
+scraper_logger = get_logger(
+    "scraper",
+    console=True,
+    file=False,
+    mongo_uri="mongodb://localhost:27018",
+    mongo_db_name="logs",
+    mongo_collection_name="testing",
+    log_level=logging.DEBUG,
+    app_name="Crafting Profit",
+)
+
+# Written by scrapers/ah_scan.py after every scan
+SNAPSHOT_PATH = ".cache/commodities-us.npz"
+
+def compute_profits():
+    snapshot = IncrementalIngestor(SNAPSHOT_PATH).previous
+    if snapshot is None:
+        scraper_logger.error(f"No commodities snapshot found at {SNAPSHOT_PATH}; run ah_scan.py first")
+        return
+
+    recipes = list(recipe_collection.find({}, {"_id": 0, "id": 1, "name": 1, "profession": 1, "category": 1,
+                                               "crafted_item": 1, "alliance_crafted_item": 1, "crafted_quantity": 1,
+                                               "reagents": 1, "modified_crafting_slots": 1}))
+    category_index = CategoryIndex(item_collection).build()
+    slot_options = slot_options_from((doc["data"] for doc in slot_type_cache_collection.find()), category_index)
+    book = RecipeBook.from_recipes(recipes, slot_options)
+
+    start = time.perf_counter()
+    table = book.profit(snapshot)
+    scraper_logger.info(f"Priced {len(book)} recipes ({int(table.priced.sum())} fully priced) "
+                        f"in {time.perf_counter() - start:.3f}s")
+
+    ts = datetime.datetime.now(datetime.timezone.utc)
+    with BulkWriter(profit_collection, key="recipe_id") as writer:
+        for row, recipe in enumerate(recipes):
+            writer.add({
+                "recipe_id": recipe["id"],
+                "name": recipe.get("name"),
+                "profession": recipe.get("profession"),
+                "category": recipe.get("category"),
+                "cost": None if np.isnan(table.cost[row]) else float(table.cost[row]),
+                "revenue": None if np.isnan(table.revenue[row]) else float(table.revenue[row]),
+                "profit": float(table.profit[row]) if table.priced[row] else None,
+                "snapshot_ts": snapshot.timestamp,
+                "ts": ts,
+            })
+    scraper_logger.info(f"Stored profits for {len(book)} recipes")
+
+if __name__ == "__main__":
+    compute_profits()
@@ -0,0 +1,42 @@
+import logging
+from pymongo import MongoClient
+from wowapi.WoWapi import WoWAPI
+from wowapi.catalog import ItemCatalogSync
+from wowapi.http_cache import ResponseCache
+from wowapi.persistence import BulkWriter
+from dotenv import load_dotenv
+from pylog import get_logger
+
+load_dotenv()
+
+# MongoDB connection setup
+mongo_client = MongoClient("mongodb://localhost:27017")
+db = mongo_client["wow"]
+item_collection = db["items"]
+
+scraper_logger = get_logger(
+    "scraper",
+    console=True,
+    file=False,
+    mongo_uri="mongodb://localhost:27018",
+    mongo_db_name="logs",
+    mongo_collection_name="testing",
+    log_level=logging.INFO,
+    app_name="Item Catalog Sync",
+)
+
+api = WoWAPI(response_cache=ResponseCache())
+
+def sync_item_catalog():
+    scraper_logger.info("Syncing the item catalog")
+    with BulkWriter(item_collection, batch_size=1000) as item_writer:
+        catalog_sync = ItemCatalogSync(api, item_writer.add_many, ".cache/item_catalog_digests.json",
+                                       confirm=item_writer.confirm)
+        stats = catalog_sync.run()
+
+    for range_start, error in stats.failed:
+        scraper_logger.error(f"Error syncing item range starting at {range_start}: {str(error)}")
+    scraper_logger.info(f"Finished syncing item catalog: {stats}")
+
+if __name__ == "__main__":
+    sync_item_catalog()
@@ -8,6 +8,9 @@ profession_collection = db["professions"]
 recipe_collection = db["recipes"]
 
 from wowapi.WoWapi import WoWAPI
+from wowapi.http_cache import ResponseCache
+from wowapi.persistence import BulkWriter
+from wowapi.pipeline import Pipeline
 from dotenv import load_dotenv
 from pylog import get_logger
 
@@ -46,7 +49,7 @@ scraper_logger = get_logger(
     app_name="Scraper",
 )
 
-api = WoWAPI()
+api = WoWAPI(response_cache=ResponseCache())
 
 scraper_logger.info("Fetching profession index")
 try:
@@ -61,43 +64,32 @@ profession_ids = [profession['id'] for profession in profession_index['professio
 scraper_logger.info(f"Extracted {len(profession_ids)} profession IDs")
 scraper_logger.debug(f"Profession IDs: {profession_ids}")
 
-# Dictionary to store profession IDs and their Khaz Algar skill tier IDs
-profession_skill_tiers = {}
-
-for profession_id in profession_ids:
+def fetch_khaz_algar_skill_tier(profession_id):
     scraper_logger.info(f"Fetching details for profession ID: {profession_id}")
-    try:
-        profession_details = api.get_profession(profession_id)
-        scraper_logger.debug(f"Details retrieved for profession ID: {profession_id}")
-        
-        # Look for the Khaz Algar skill tier
-        khaz_algar_tier = next((tier for tier in profession_details.get('skill_tiers', []) 
-                                if 'Khaz Algar' in tier['name']), None)
-        
-        if khaz_algar_tier:
-            profession_skill_tiers[profession_id] = khaz_algar_tier['id']
-            scraper_logger.info(f"Khaz Algar skill tier ID for profession {profession_id}: {khaz_algar_tier['id']}")
-        else:
-            scraper_logger.warning(f"No Khaz Algar skill tier found for profession {profession_id}")
-    
-    except Exception as e:
-        scraper_logger.error(f"Error fetching details for profession {profession_id}: {str(e)}")
-
-scraper_logger.info(f"Collected Khaz Algar skill tier IDs for {len(profession_skill_tiers)} professions")
-scraper_logger.debug(f"Profession Khaz Algar skill tiers: {profession_skill_tiers}")
-
-for profession_id, skill_tier_id in profession_skill_tiers.items():
-    scraper_logger.info(f"Fetching skill tier {skill_tier_id} for profession {profession_id}")
-    try:
-        skill_tier_data = api.get_profession_skill_tier(profession_id, skill_tier_id)
-        scraper_logger.debug(f"Skill tier data retrieved for profession {profession_id}")
-        
-        result = profession_collection.insert_one(skill_tier_data)
-        scraper_logger.info(f"Inserted new skill tier data for profession {profession_id}")
-    
-    except Exception as e:
-        scraper_logger.error(f"Error fetching or storing skill tier {skill_tier_id} for profession {profession_id}: {str(e)}")
+    profession_details = api.get_profession(profession_id)
+    scraper_logger.debug(f"Details retrieved for profession ID: {profession_id}")
+
+    # Look for the Khaz Algar skill tier
+    khaz_algar_tier = next((tier for tier in profession_details.get('skill_tiers', [])
+                            if 'Khaz Algar' in tier['name']), None)
+
+    if not khaz_algar_tier:
+        scraper_logger.warning(f"No Khaz Algar skill tier found for profession {profession_id}")
+        return None
+
+    scraper_logger.info(f"Fetching skill tier {khaz_algar_tier['id']} for profession {profession_id}")
+    skill_tier_data = api.get_profession_skill_tier(profession_id, khaz_algar_tier['id'])
+    scraper_logger.debug(f"Skill tier data retrieved for profession {profession_id}")
+    return skill_tier_data
+
+with BulkWriter(profession_collection) as profession_writer:
+    pipeline = Pipeline(fetch_khaz_algar_skill_tier, sink=profession_writer.add_many)
+    stats = pipeline.run(profession_ids)
+
+for profession_id, error in stats.failed:
+    scraper_logger.error(f"Error fetching or storing skill tier for profession {profession_id}: {str(error)}")
 
+scraper_logger.info(f"Stored Khaz Algar skill tier data for {stats.written} professions")
 scraper_logger.info("Finished fetching and storing skill tier data")
 
 
@@ -1,8 +1,14 @@
 import logging
-import time
 from wowapi.WoWapi import WoWAPI
+from wowapi.category_index import CategoryIndex
+from wowapi.checkpoint import Checkpoint
+from wowapi.http_cache import ResponseCache
+from wowapi.memo import MemoCache
+from wowapi.persistence import BulkWriter
+from wowapi.pipeline import Pipeline
 from dotenv import load_dotenv
 from pylog import get_logger
+from bson import ObjectId
 from pymongo import MongoClient
 from tqdm import tqdm
 
@@ -14,6 +20,9 @@ item_collection = db["reagents"]
 slot_type_cache_collection = db["slot_type_cache"]
 category_cache_collection = db["category_cache"]
 
+# Recipes processed between checkpoints
+RECIPE_BATCH_SIZE = 200
+
 # New collection for missed items
 missed_items_collection = db["missed_items"]
 
@@ -41,10 +50,9 @@ scraper_logger = get_logger(
     app_name="Item Scraper",
 )
 
-api = WoWAPI()
-
-def rate_limit():
-    time.sleep(0.1)  # Sleep for 100ms between API calls
+api = WoWAPI(response_cache=ResponseCache(), memo_cache=MemoCache())
+item_writer = BulkWriter(item_collection)
+category_index = CategoryIndex(item_collection, missed_items_collection)
 
 def controlled_pause(message):
     # input(f"{message}  Press Enter to continue...")
@@ -52,7 +60,6 @@ def controlled_pause(message):
 
 def fetch_item_data(item_id):
     try:
-        rate_limit()
         item_data = api.get_item_data(item_id)
         scraper_logger.debug(f"Item data retrieved for ID: {item_id}, Name: {item_data.get('name', 'Unknown')}")
         controlled_pause(f"Fetched item data for ID: {item_id}, Name: {item_data.get('name', 'Unknown')}")
@@ -60,63 +67,146 @@ def fetch_item_data(item_id):
     except Exception as e:
         scraper_logger.error(f"Error fetching item {item_id}: {str(e)}")
         controlled_pause(f"Error fetching item {item_id}: {str(e)}")
-        return None
+        raise
 
 def process_recipes():
     scraper_logger.info("Starting to process recipes and fetch item data")
-    
-    recipes = list(recipe_collection.find({}))
-    total_recipes = len(recipes)
-    
+    category_index.build()
+
+    # Resume after the last recipe batch completed by a previous run
+    checkpoint = Checkpoint(".cache/checkpoints/reagent_scraper.json")
+    last_id = ObjectId(checkpoint.cursor) if checkpoint.cursor else None
+    total_recipes = recipe_collection.count_documents({'_id': {'$gt': last_id}} if last_id else {})
+
     scraper_logger.info(f"Found {total_recipes} recipes to process")
     controlled_pause(f"Found {total_recipes} recipes to process")
-    
+
+    # Retry reagents and slot types that failed last time
+    failed_slot_type_ids = [int(unit.split(':', 1)[1]) for unit in checkpoint.failed if unit.startswith('slot_type:')]
+    failed_item_ids = [int(unit) for unit in checkpoint.failed if not unit.startswith('slot_type:')]
+    if failed_item_ids or failed_slot_type_ids:
+        scraper_logger.info(f"Retrying {len(failed_item_ids)} reagents and {len(failed_slot_type_ids)} slot types "
+                            f"that failed in a previous run")
+        stored_item_ids = fetch_reagents(failed_item_ids, checkpoint)
+        slot_type_items = process_slot_types(failed_slot_type_ids, checkpoint)
+        commit_batch(stored_item_ids, slot_type_items, checkpoint)
+
+    # Page by _id instead of holding one cursor open for the whole run, which the
+    # server times out while batches are being processed
     with tqdm(total=total_recipes, desc="Processing Recipes") as pbar:
-        for recipe in recipes:
-            recipe_name = recipe.get('name', 'Unknown Recipe')
-            recipe_id = recipe.get('id', 'Unknown ID')
-            scraper_logger.info(f"Processing recipe: {recipe_name} (ID: {recipe_id})")
-            controlled_pause(f"Processing recipe: {recipe_name} (ID: {recipe_id})")
-            
-            # Process reagents
-            if 'reagents' in recipe:
-                scraper_logger.info(f"Processing {len(recipe['reagents'])} reagents for recipe: {recipe_name}")
-                controlled_pause(f"Processing {len(recipe['reagents'])} reagents for recipe: {recipe_name}")
-                for reagent in recipe['reagents']:
-                    item_id = reagent['reagent'].get('id')
-                    item_name = reagent['reagent'].get('name', 'Unknown Reagent')
-                    if item_id:
-                        scraper_logger.debug(f"Processing reagent: {item_name} (ID: {item_id})")
-                        controlled_pause(f"Processing reagent: {item_name} (ID: {item_id})")
-                        process_item(item_id)
-            
-            # Process modified crafting slots
-            if 'modified_crafting_slots' in recipe:
-                scraper_logger.info(f"Processing {len(recipe['modified_crafting_slots'])} modified crafting slots for recipe: {recipe_name}")
-                controlled_pause(f"Processing {len(recipe['modified_crafting_slots'])} modified crafting slots for recipe: {recipe_name}")
-                for slot in recipe['modified_crafting_slots']:
-                    slot_type_id = slot['slot_type'].get('id')
-                    slot_type_name = slot['slot_type'].get('name', 'Unknown Slot Type')
-                    if slot_type_id:
-                        scraper_logger.debug(f"Processing modified crafting slot: {slot_type_name} (ID: {slot_type_id})")
-                        controlled_pause(f"Processing modified crafting slot: {slot_type_name} (ID: {slot_type_id})")
-                        process_modified_crafting_slot(slot_type_id)
-            
-            pbar.update(1)
+        while True:
+            query = {'_id': {'$gt': last_id}} if last_id else {}
+            recipes = list(recipe_collection.find(query).sort('_id', 1).limit(RECIPE_BATCH_SIZE))
+            if not recipes:
+                break
+            stored_item_ids, slot_type_items = process_recipe_batch(recipes, checkpoint)
+            commit_batch(stored_item_ids, slot_type_items, checkpoint)
+            last_id = recipes[-1]['_id']
+            checkpoint.set_cursor(str(last_id))
+            pbar.update(len(recipes))
+
+    item_writer.close()
+    checkpoint.finish()
+
+def process_recipe_batch(recipes, checkpoint):
+    # Collect reagent and slot type IDs first so the items can be fetched concurrently
+    reagent_ids = {}
+    slot_type_ids = {}
+    for recipe in recipes:
+        recipe_name = recipe.get('name', 'Unknown Recipe')
+        recipe_id = recipe.get('id', 'Unknown ID')
+        scraper_logger.info(f"Processing recipe: {recipe_name} (ID: {recipe_id})")
+        controlled_pause(f"Processing recipe: {recipe_name} (ID: {recipe_id})")
+
+        # Process reagents
+        if 'reagents' in recipe:
+            scraper_logger.info(f"Processing {len(recipe['reagents'])} reagents for recipe: {recipe_name}")
+            for reagent in recipe['reagents']:
+                item_id = reagent['reagent'].get('id')
+                if item_id:
+                    reagent_ids[item_id] = reagent['reagent'].get('name', 'Unknown Reagent')
+
+        # Process modified crafting slots
+        if 'modified_crafting_slots' in recipe:
+            scraper_logger.info(f"Processing {len(recipe['modified_crafting_slots'])} modified crafting slots for recipe: {recipe_name}")
+            for slot in recipe['modified_crafting_slots']:
+                slot_type_id = slot['slot_type'].get('id')
+                if slot_type_id:
+                    slot_type_ids[slot_type_id] = slot['slot_type'].get('name', 'Unknown Slot Type')
+
+    new_reagent_ids = [item_id for item_id in reagent_ids if not item_writer.contains(item_id)]
+    scraper_logger.info(f"Found {len(reagent_ids)} distinct reagents, {len(new_reagent_ids)} not yet in the database")
+    controlled_pause(f"Found {len(reagent_ids)} distinct reagents, {len(new_reagent_ids)} not yet in the database")
+    stored_item_ids = fetch_reagents(new_reagent_ids, checkpoint)
+
+    pending_slot_type_ids = [slot_type_id for slot_type_id in slot_type_ids
+                             if not checkpoint.is_done(f"slot_type:{slot_type_id}")]
+    return stored_item_ids, process_slot_types(pending_slot_type_ids, checkpoint)
+
+def process_slot_types(slot_type_ids, checkpoint):
+    # Returns the slot types processed without errors, with the IDs of the items each one queued;
+    # they are marked done once those items are written
+    slot_type_items = {}
+    for slot_type_id in slot_type_ids:
+        scraper_logger.debug(f"Processing modified crafting slot ID: {slot_type_id}")
+        controlled_pause(f"Processing modified crafting slot ID: {slot_type_id}")
+        try:
+            item_ids = process_modified_crafting_slot(slot_type_id)
+        except Exception as e:
+            scraper_logger.error(f"Modified crafting slot {slot_type_id} not completed: {str(e)}")
+            checkpoint.mark_failed(f"slot_type:{slot_type_id}", e)
+            continue
+        slot_type_items[f"slot_type:{slot_type_id}"] = item_ids
+    return slot_type_items
+
+def fetch_reagents(item_ids, checkpoint):
+    # Returns the IDs of the reagents queued for writing; they are marked done once written
+    stored_item_ids = []
+
+    def store_reagents(items):
+        for item in items:
+            store_item(item)
+        stored_item_ids.extend(item['id'] for item in items)
+
+    pipeline = Pipeline(api.get_item_data, sink=store_reagents)
+    stats = pipeline.run(item_ids)
+    for item_id, error in stats.failed:
+        scraper_logger.error(f"Error fetching item {item_id}: {str(error)}")
+        checkpoint.mark_failed(item_id, error)
+    scraper_logger.info(f"Queued {stats.written} new reagents")
+    return stored_item_ids
+
+def commit_batch(stored_item_ids, slot_type_items, checkpoint):
+    # Flush before marking anything done, so a failed write is retried by the next run
+    slot_type_item_ids = [item_id for item_ids in slot_type_items.values() for item_id in item_ids]
+    rejected = item_writer.confirm(stored_item_ids + slot_type_item_ids)
+    for item_id in rejected:
+        scraper_logger.error(f"Error writing item {item_id}: {item_writer.failed[item_id]}")
+        checkpoint.mark_failed(item_id, item_writer.failed[item_id])
+    done_slot_types = []
+    for slot_type, item_ids in slot_type_items.items():
+        unwritten = rejected.intersection(item_ids)
+        if unwritten:
+            checkpoint.mark_failed(slot_type, f"{len(unwritten)} items were not written")
+        else:
+            done_slot_types.append(slot_type)
+    checkpoint.mark_done(*(item_id for item_id in stored_item_ids if item_id not in rejected), *done_slot_types)
 
 def process_item(item_id):
-    existing_item = item_collection.find_one({'id': item_id})
-    if existing_item:
-        scraper_logger.info(f"Item {item_id} ({existing_item.get('name', 'Unknown')}) already exists in the database")
-        controlled_pause(f"Item {item_id} ({existing_item.get('name', 'Unknown')}) already exists in the database")
-    else:
-        item_data = fetch_item_data(item_id)
-        if item_data:
-            item_collection.insert_one(item_data)
-            scraper_logger.info(f"Inserted new item data for ID: {item_id}, Name: {item_data.get('name', 'Unknown')}")
-            controlled_pause(f"Inserted new item data for ID: {item_id}, Name: {item_data.get('name', 'Unknown')}")
+    # Returns True if the item was queued for writing; a failed fetch raises
+    if item_writer.contains(item_id):
+        scraper_logger.info(f"Item {item_id} already exists in the database")
+        controlled_pause(f"Item {item_id} already exists in the database")
+        return False
+    item_data = fetch_item_data(item_id)
+    store_item(item_data)
+    scraper_logger.info(f"Queued new item data for ID: {item_id}, Name: {item_data.get('name', 'Unknown')}")
+    controlled_pause(f"Queued new item data for ID: {item_id}, Name: {item_data.get('name', 'Unknown')}")
+    return True
 
 def process_modified_crafting_slot(slot_type_id):
+    # Returns the IDs of the items queued for the slot type's categories
+    queued_item_ids = []
     cached_slot_type = slot_type_cache_collection.find_one({'id': slot_type_id})
     if cached_slot_type:
         scraper_logger.debug(f"Using cached data for slot type ID: {slot_type_id}, Description: {cached_slot_type['data'].get('description', 'Unknown')}")
@@ -124,7 +214,6 @@ def process_modified_crafting_slot(slot_type_id):
         slot_type_data = cached_slot_type['data']
     else:
         try:
-            rate_limit()
             slot_type_data = api.get_modified_crafting_reagent_slot_type(slot_type_id)
             scraper_logger.debug(f"Slot type data retrieved for ID: {slot_type_id}, Description: {slot_type_data.get('description', 'Unknown')}")
             controlled_pause(f"Slot type data retrieved for ID: {slot_type_id}, Description: {slot_type_data.get('description', 'Unknown')}")
@@ -132,7 +221,7 @@ def process_modified_crafting_slot(slot_type_id):
         except Exception as e:
             scraper_logger.error(f"Error processing modified crafting slot {slot_type_id}: {str(e)}")
             controlled_pause(f"Error processing modified crafting slot {slot_type_id}: {str(e)}")
-            return
+            raise
 
     slot_type_name = slot_type_data.get('description', '')
     
@@ -143,11 +232,12 @@ def process_modified_crafting_slot(slot_type_id):
             category_id = category.get('id')
             category_name = category.get('name', 'Unknown Category')
             if category_id:
-                process_modified_crafting_category(category_id, category_name, slot_type_name)
+                process_modified_crafting_category(category_id, category_name, slot_type_name, queued_item_ids)
+    return queued_item_ids
 
-def process_modified_crafting_category(category_id, category_name, slot_type_name):
+def process_modified_crafting_category(category_id, category_name, slot_type_name, queued_item_ids):
     # Check if the category is already marked as missed
-    if missed_items_collection.find_one({'category_id': category_id}):
+    if category_index.is_missed(category_id):
         scraper_logger.info(f"Skipping category {category_id} as it is marked as missed.")
         return
 
@@ -155,9 +245,7 @@ def process_modified_crafting_category(category_id, category_name, slot_type_nam
     controlled_pause(f"Processing category: {category_name} (ID: {category_id}) for slot type: {slot_type_name}")
 
     # Check if we have any items with this category in our database
-    existing_item_count = item_collection.count_documents({
-        'modified_crafting.category.id': category_id
-    })
+    existing_item_count = len(category_index.items_for(category_id))
 
     if existing_item_count > 0:
         scraper_logger.info(f"Found {existing_item_count} items in database for category {category_id}. Skipping API search.")
@@ -168,37 +256,32 @@ def process_modified_crafting_category(category_id, category_name, slot_type_nam
     controlled_pause(f"No items found in database for category {category_id}. Searching via API for slot type: {slot_type_name}")
 
     # If no items found in our database, then search using the API
-    rate_limit()
-    search_results = api.search_items(slot_type_name)
-    items_to_process = []
+    search_results = list(api.iter_search_items(slot_type_name))
 
-    if 'results' in search_results:
-        # Filter the search results to only include items matching the category
-        items_to_process = [
-            item['data'] for item in search_results['results']
-            if item['data'].get('modified_crafting', {}).get('category', {}).get('id') == category_id
-        ]
-        scraper_logger.info(f"Found {len(items_to_process)} items matching category {category_id} out of {len(search_results['results'])} search results")
-        controlled_pause(f"Found {len(items_to_process)} items matching category {category_id} out of {len(search_results['results'])} search results")
+    # Filter the search results to only include items matching the category
+    items_to_process = [
+        item['data'] for item in search_results
+        if item['data'].get('modified_crafting', {}).get('category', {}).get('id') == category_id
+    ]
+    scraper_logger.info(f"Found {len(items_to_process)} items matching category {category_id} out of {len(search_results)} search results")
+    controlled_pause(f"Found {len(items_to_process)} items matching category {category_id} out of {len(search_results)} search results")
 
     # If no items found with slot_type_name, try searching with category_name
     if not items_to_process:
         scraper_logger.info(f"No items found for slot type: {slot_type_name}. Trying search with category name: {category_name}")
         controlled_pause(f"No items found for slot type: {slot_type_name}. Trying search with category name: {category_name}")
-        rate_limit()
-        search_results = api.search_items(category_name)
-        if 'results' in search_results:
-            items_to_process = [
-                item['data'] for item in search_results['results']
-                if item['data'].get('modified_crafting', {}).get('category', {}).get('id') == category_id
-            ]
-            scraper_logger.info(f"Found {len(items_to_process)} items matching category {category_id} out of {len(search_results['results'])} search results using category name")
-            controlled_pause(f"Found {len(items_to_process)} items matching category {category_id} out of {len(search_results['results'])} search results using category name")
+        search_results = list(api.iter_search_items(category_name))
+        items_to_process = [
+            item['data'] for item in search_results
+            if item['data'].get('modified_crafting', {}).get('category', {}).get('id') == category_id
+        ]
+        scraper_logger.info(f"Found {len(items_to_process)} items matching category {category_id} out of {len(search_results)} search results using category name")
+        controlled_pause(f"Found {len(items_to_process)} items matching category {category_id} out of {len(search_results)} search results using category name")
 
     if not items_to_process:
         # Log the missing category
         scraper_logger.error(f"No items found for category {category_id}. Logging as missed.")
-        missed_items_collection.insert_one({'category_id': category_id, 'category_name': category_name, 'slot_type_name': slot_type_name})
+        category_index.mark_missed(category_id, category_name=category_name, slot_type_name=slot_type_name)
         return
 
     total_items = len(items_to_process)
@@ -216,14 +299,14 @@ def process_modified_crafting_category(category_id, category_name, slot_type_nam
                 item_name = 'Unknown Item'
             
             if item_id:
-                existing_item = item_collection.find_one({'id': item_id})
-                if existing_item:
+                if item_writer.contains(item_id):
                     scraper_logger.debug(f"Item {item_id} ({item_name}) already exists in the database")
                     controlled_pause(f"Item {item_id} ({item_name}) already exists in the database")
                 else:
                     scraper_logger.debug(f"Processing item: {item_name} (ID: {item_id})")
                     controlled_pause(f"Processing item: {item_name} (ID: {item_id})")
-                    process_item(item_id)
+                    if process_item(item_id):
+                        queued_item_ids.append(item_id)
             pbar.update(1)
 
     scraper_logger.info(f"Processed modified crafting category: {category_id} (Slot Type: {slot_type_name}, Category Name: {category_name})")
@@ -0,0 +1,49 @@
+import datetime
+from wowapi import WoWAPI
+from wowapi.ingest import IncrementalIngestor, write_auction_delta
+from wowapi.realm_scan import RealmAuctionScanner, buyout_auctions
+from wowapi.snapshot import CommoditySnapshot
+from pymongo import MongoClient
+from pylog import get_logger
+from dotenv import load_dotenv
+
+load_dotenv()
+
+REGION = "us"
+
+if __name__ == "__main__":
+    # Initialize logger
+    logger = get_logger("realm_auction_scanner",
+                        local_mongo_uri="mongodb://localhost:27017",
+                        local_db_name="wow",
+                        local_collection_name="logs"
+                        )
+
+    try:
+        api = WoWAPI(REGION, pool_maxsize=16)
+
+        # Connect to MongoDB
+        client = MongoClient("mongodb://localhost:27017")
+        db = client.get_database("wow")
+        collection = db.get_collection("auctions")
+        collection.create_index([("connected_realm_id", 1), ("id", 1)])
+
+        def ingest_realm(realm_id, auctions, last_modified):
+            # Diff each realm's snapshot against its previous scan and write only the delta
+            ingestor = IncrementalIngestor(f".cache/auctions/{REGION}-{realm_id}.npz")
+            snapshot = CommoditySnapshot.from_auctions(buyout_auctions(auctions))
+            diff = ingestor.diff(snapshot)
+            ts = datetime.datetime.now(datetime.timezone.utc)
+            new, changed, removed = write_auction_delta(collection, snapshot, diff, ts, connected_realm_id=realm_id)
+            ingestor.commit(snapshot)
+            logger.info(f"Connected realm {realm_id}: added {new} new, updated {changed} and "
+                        f"marked {removed} removed auctions.")
+
+        scanner = RealmAuctionScanner(api, ingest_realm, f".cache/realm-scan-{REGION}.json", workers=16)
+        stats = scanner.run()
+        for realm_id, error in stats.failed:
+            logger.error(f"Error scanning connected realm {realm_id}: {str(error)}")
+        logger.info(f"Finished realm auction scan: {stats}")
+
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
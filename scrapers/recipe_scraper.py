@@ -2,6 +2,10 @@ import logging
 import json
 from pymongo import MongoClient
 from wowapi.WoWapi import WoWAPI
+from wowapi.checkpoint import Checkpoint
+from wowapi.http_cache import ResponseCache
+from wowapi.persistence import BulkWriter
+from wowapi.pipeline import Pipeline
 from dotenv import load_dotenv
 from pylog import get_logger
 
@@ -13,7 +17,7 @@ db = mongo_client["wow"]
 recipe_collection = db["recipes"]
 profession_collection = db["professions"]
 
-api = WoWAPI()
+api = WoWAPI(response_cache=ResponseCache())
 
 scraper_logger = get_logger(
     "scraper",
@@ -37,11 +41,7 @@ api_logger = get_logger(
     app_name="Recipe Scraper",
 )
 
-def fetch_recipes():
-    scraper_logger.info("Fetching profession data from MongoDB")
-    professions = list(profession_collection.find({}))
-    scraper_logger.info(f"Found {len(professions)} professions")
-
+def iter_recipe_work(professions):
     for profession in professions:
         profession_name = profession.get('name', 'Unknown Profession')
         scraper_logger.info(f"Processing profession: {profession_name}")
@@ -54,22 +54,55 @@ def fetch_recipes():
                 recipe_id = recipe.get('id')
                 if recipe_id:
                     scraper_logger.info(f"Fetching recipe: {recipe.get('name', 'Unknown Recipe')} (ID: {recipe_id})")
-                    try:
-                        recipe_data = api.get_recipe(recipe_id)
-                        scraper_logger.debug(f"Recipe data retrieved for ID: {recipe_id}")
-                        
-                        # Add profession and category information to the recipe data
-                        recipe_data['profession'] = profession_name
-                        recipe_data['category'] = category_name
-                        
-                        result = recipe_collection.insert_one(recipe_data)
-                        scraper_logger.info(f"Inserted new recipe data for ID: {recipe_id}")
-                    except Exception as e:
-                        scraper_logger.error(f"Error fetching or storing recipe {recipe_id}: {str(e)}")
+                    yield recipe_id, profession_name, category_name
                 else:
                     scraper_logger.warning(f"No recipe ID found for recipe in category {category_name}")
 
-    scraper_logger.info("Finished fetching and storing recipe data")
+def fetch_recipe(work_item):
+    recipe_id, _, _ = work_item
+    recipe_data = api.get_recipe(recipe_id)
+    scraper_logger.debug(f"Recipe data retrieved for ID: {recipe_id}")
+    return recipe_data
+
+def add_profession_info(work_item, recipe_data):
+    # Add profession and category information to the recipe data
+    _, profession_name, category_name = work_item
+    recipe_data['profession'] = profession_name
+    recipe_data['category'] = category_name
+    return recipe_data
+
+def fetch_recipes():
+    scraper_logger.info("Fetching profession data from MongoDB")
+    professions = list(profession_collection.find({}))
+    scraper_logger.info(f"Found {len(professions)} professions")
+
+    # Skip recipes stored by a previous, interrupted run
+    checkpoint = Checkpoint(".cache/checkpoints/recipe_scraper.json")
+    work_items = (work_item for work_item in iter_recipe_work(professions) if not checkpoint.is_done(work_item[0]))
+
+    with BulkWriter(recipe_collection) as recipe_writer:
+        def store_recipes(recipes):
+            # Confirm the writes before checkpointing, so rejected recipes are retried by the next run
+            recipe_ids = [recipe['id'] for recipe in recipes]
+            recipe_writer.add_many(recipes)
+            rejected = recipe_writer.confirm(recipe_ids)
+            for recipe_id in rejected:
+                scraper_logger.error(f"Error writing recipe {recipe_id}: {recipe_writer.failed[recipe_id]}")
+                checkpoint.mark_failed(recipe_id, recipe_writer.failed[recipe_id])
+            checkpoint.mark_done(*(recipe_id for recipe_id in recipe_ids if recipe_id not in rejected))
+
+        pipeline = Pipeline(fetch_recipe, sink=store_recipes, transform=add_profession_info)
+        stats = pipeline.run(work_items)
+
+    for (recipe_id, _, _), error in stats.failed:
+        scraper_logger.error(f"Error fetching recipe {recipe_id}: {str(error)}")
+        checkpoint.mark_failed(recipe_id, error)
+    for recipe, error in stats.unwritten:
+        scraper_logger.error(f"Error storing recipe {recipe['id']}: {str(error)}")
+        checkpoint.mark_failed(recipe['id'], error)
+    checkpoint.finish()
+    scraper_logger.info(f"Finished fetching and storing recipe data ({stats.written} stored, "
+                        f"{len(stats.failed) + len(stats.unwritten)} failed)")
 
 if __name__ == "__main__":
     fetch_recipes()
@@ -0,0 +1,41 @@
+import datetime
+
+import numpy as np
+
+from wowapi.aggregate import PriceAggregator
+from wowapi.snapshot import CommoditySnapshot
+
+
+def make_snapshot(hour, prices):
+    count = len(prices)
+    return CommoditySnapshot(
+        np.arange(count, dtype=np.int64), np.full(count, 7, dtype=np.int32), np.ones(count, dtype=np.int32),
+        np.asarray(prices, dtype=np.int64), np.zeros(count, dtype=np.int8),
+        timestamp=datetime.datetime(2024, 9, 1, hour, 5, tzinfo=datetime.timezone.utc),
+    )
+
+
+def test_same_snapshot_is_aggregated_once(tmp_path):
+    state_path = str(tmp_path / "prices.npz")
+    aggregator = PriceAggregator(state_path, periods=("day",))
+    snapshot = make_snapshot(1, [100, 200])
+    assert aggregator.update(snapshot)[0].snapshots == 1
+    aggregator.commit()
+
+    reloaded = PriceAggregator(state_path, periods=("day",))
+    assert reloaded.update(make_snapshot(1, [100, 200])) == []
+    assert reloaded.update(make_snapshot(2, [300]))[0].snapshots == 2
+
+
+def test_uncommitted_update_is_not_persisted(tmp_path):
+    state_path = str(tmp_path / "prices.npz")
+    aggregator = PriceAggregator(state_path, periods=("day",))
+    aggregator.update(make_snapshot(1, [100]))
+    aggregator.commit()
+    aggregator.update(make_snapshot(2, [50]))
+
+    reloaded = PriceAggregator(state_path, periods=("day",))
+    bucket = reloaded.update(make_snapshot(2, [50]))[0]
+    assert bucket.snapshots == 2
+    assert bucket.min_price.tolist() == [50]
+    assert aggregator.buckets["day"].snapshots == 1
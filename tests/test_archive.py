@@ -0,0 +1,51 @@
+import datetime
+
+import numpy as np
+
+from wowapi.archive import SnapshotArchive, SnapshotReader
+from wowapi.snapshot import CommoditySnapshot
+
+
+def make_snapshot(rows=1000, hour=12):
+    rng = np.random.default_rng(42)
+    return CommoditySnapshot(
+        np.arange(rows, dtype=np.int64) + 10 ** 9,
+        rng.integers(1000, 1050, rows),
+        rng.integers(1, 200, rows),
+        rng.integers(1, 10 ** 7, rows),
+        rng.integers(0, 4, rows),
+        timestamp=datetime.datetime(2024, 10, 1, hour, tzinfo=datetime.timezone.utc),
+    )
+
+
+def assert_same_rows(actual, expected):
+    for column in ("auction_id", "item_id", "quantity", "unit_price", "time_left"):
+        np.testing.assert_array_equal(getattr(actual, column), getattr(expected, column))
+
+
+def test_round_trip(tmp_path):
+    snapshot = make_snapshot()
+    path = SnapshotArchive(str(tmp_path), chunk_rows=64).write(snapshot)
+    with SnapshotReader(path) as reader:
+        assert len(reader) == len(snapshot)
+        assert reader.timestamp == snapshot.timestamp
+        assert_same_rows(reader.read(), snapshot)
+
+
+def test_read_item_spanning_chunks(tmp_path):
+    snapshot = make_snapshot()
+    path = SnapshotArchive(str(tmp_path), chunk_rows=7).write(snapshot)
+    with SnapshotReader(path) as reader:
+        rows = snapshot.item_id == 1010
+        item = reader.read_item(1010)
+        np.testing.assert_array_equal(item.auction_id, snapshot.auction_id[rows])
+        np.testing.assert_array_equal(item.unit_price, snapshot.unit_price[rows])
+        assert len(reader.read_item(999)) == 0
+
+
+def test_item_history_in_time_order(tmp_path):
+    archive = SnapshotArchive(str(tmp_path))
+    for hour in (14, 12, 13):
+        archive.write(make_snapshot(rows=50, hour=hour))
+    history = list(archive.item_history(1010, start=datetime.datetime(2024, 10, 1, 13, tzinfo=datetime.timezone.utc)))
+    assert [snapshot.timestamp.hour for snapshot in history] == [13, 14]
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import threading
+
+from wowapi import AsyncWoWAPI
+from wowapi.http_cache import ResponseCache
+
+
+class FakeResponse:
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+class ThreadRecordingCache(ResponseCache):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = set()
+
+    def lookup(self, endpoint, params):
+        self.threads.add(threading.get_ident())
+        return super().lookup(endpoint, params)
+
+    def store(self, key, headers, body):
+        self.threads.add(threading.get_ident())
+        super().store(key, headers, body)
+
+    def revalidated(self, key, headers=None):
+        self.threads.add(threading.get_ident())
+        super().revalidated(key, headers)
+
+
+def make_api(monkeypatch, **kwargs):
+    monkeypatch.setenv("BNET_ACCESS_TOKEN", "token")
+    monkeypatch.delenv("BNET_CLIENT_ID", raising=False)
+    return AsyncWoWAPI(**kwargs)
+
+
+def test_response_cache_is_used_off_the_event_loop(monkeypatch, tmp_path):
+    cache = ThreadRecordingCache(str(tmp_path / "responses.sqlite3"), ttls={"static": 0})
+    api = make_api(monkeypatch, response_cache=cache)
+    responses = [(FakeResponse(200, {"ETag": '"v1"'}), json.dumps({"id": 1}).encode()), (FakeResponse(304), b"")]
+    sent_headers = []
+
+    async def send(endpoint, params, headers=None):
+        sent_headers.append(headers)
+        return responses.pop(0)
+
+    api._send = send
+
+    async def main():
+        loop_thread = threading.get_ident()
+        first = await api.get_item_data(1)
+        second = await api.get_item_data(1)
+        return loop_thread, first, second
+
+    loop_thread, first, second = asyncio.run(main())
+    cache.close()
+    assert first == second == {"id": 1}
+    assert sent_headers == [None, {"If-None-Match": '"v1"'}]
+    assert cache.threads and loop_thread not in cache.threads
+
+
+def test_abandoned_search_waits_for_cancelled_prefetches(monkeypatch):
+    api = make_api(monkeypatch)
+    prefetches = []
+
+    async def make_request(endpoint, params):
+        if params["_page"] <= 2:
+            return {"pageCount": 10, "results": [{"key": params["_page"]}]}
+        prefetches.append(asyncio.current_task())
+        await asyncio.sleep(60)
+
+    api._make_request = make_request
+
+    async def main():
+        results = api.iter_search_items(prefetch=3)
+        assert [await results.__anext__(), await results.__anext__()] == [{"key": 1}, {"key": 2}]
+        # Pages 3-5 are being prefetched; abandon the search while they are still pending
+        await results.aclose()
+        return [task.cancelled() for task in prefetches]
+
+    assert asyncio.run(main()) == [True] * 3
@@ -0,0 +1,148 @@
+import os
+import sqlite3
+
+import pytest
+
+from wowapi import http_cache
+from wowapi.http_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(http_cache, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "responses.sqlite3")
+
+
+def static(**params):
+    return {"namespace": "static-us", "locale": "en_US", **params}
+
+
+def accessed_at(path, key):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT accessed_at FROM responses WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_key_ignores_access_token_and_param_order():
+    assert (ResponseCache.make_key("/data/wow/item/1", {"locale": "en_US", "namespace": "static-us"})
+            == ResponseCache.make_key("/data/wow/item/1", {"namespace": "static-us", "locale": "en_US",
+                                                            "access_token": "secret"}))
+
+
+def test_uncached_namespace_is_not_looked_up(clock, cache_path):
+    cache = ResponseCache(cache_path)
+    assert cache.lookup("/data/wow/auctions/commodities", {"namespace": "dynamic-us"}) == (None, None)
+    assert cache.lookup("/data/wow/item/1", {}) == (None, None)
+    cache.close()
+
+
+def test_entry_is_fresh_until_ttl_expires(clock, cache_path):
+    cache = ResponseCache(cache_path, ttls={"static": 60})
+    key, entry = cache.lookup("/data/wow/item/1", static())
+    assert entry is None
+    cache.store(key, {}, b'{"id": 1}')
+
+    _, entry = cache.lookup("/data/wow/item/1", static())
+    assert entry.json() == {"id": 1}
+    assert entry.is_fresh
+    clock.now += 59
+    assert entry.is_fresh
+    clock.now += 1
+    assert not entry.is_fresh
+    cache.close()
+
+
+def test_conditional_headers_and_revalidation(clock, cache_path):
+    cache = ResponseCache(cache_path, ttls={"static": 60})
+    key, _ = cache.lookup("/data/wow/item/1", static())
+    cache.store(key, {"ETag": '"v1"', "Last-Modified": "Tue, 01 Oct 2024 12:00:00 GMT"}, b"{}")
+    _, entry = cache.lookup("/data/wow/item/1", static())
+    assert entry.conditional_headers() == {"If-None-Match": '"v1"',
+                                           "If-Modified-Since": "Tue, 01 Oct 2024 12:00:00 GMT"}
+
+    clock.now += 120
+    _, entry = cache.lookup("/data/wow/item/1", static())
+    assert not entry.is_fresh
+    cache.revalidated(key, {"ETag": '"v2"'})
+    _, entry = cache.lookup("/data/wow/item/1", static())
+    assert entry.is_fresh
+    # A 304 without a validator keeps the stored one
+    assert entry.conditional_headers() == {"If-None-Match": '"v2"',
+                                           "If-Modified-Since": "Tue, 01 Oct 2024 12:00:00 GMT"}
+    cache.close()
+
+
+def test_entry_without_validators_has_no_conditional_headers(clock, cache_path):
+    cache = ResponseCache(cache_path)
+    key, _ = cache.lookup("/data/wow/item/1", static())
+    cache.store(key, {}, b"{}")
+    assert cache.lookup("/data/wow/item/1", static())[1].conditional_headers() == {}
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted(clock, cache_path):
+    # Random bodies do not compress, so each entry takes a little over 1000 bytes
+    cache = ResponseCache(cache_path, max_size=2500)
+    for item_id in (1, 2):
+        key, _ = cache.lookup(f"/data/wow/item/{item_id}", static())
+        cache.store(key, {}, os.urandom(1000))
+        clock.now += 1
+    cache.lookup("/data/wow/item/1", static())
+    clock.now += 1
+    key, _ = cache.lookup("/data/wow/item/3", static())
+    cache.store(key, {}, os.urandom(1000))
+
+    assert cache.lookup("/data/wow/item/1", static())[1] is not None
+    assert cache.lookup("/data/wow/item/2", static())[1] is None
+    assert cache.lookup("/data/wow/item/3", static())[1] is not None
+    cache.close()
+
+
+def test_access_times_are_written_in_batches(clock, cache_path):
+    cache = ResponseCache(cache_path, touch_batch=2)
+    keys = []
+    for item_id in (1, 2):
+        key, _ = cache.lookup(f"/data/wow/item/{item_id}", static())
+        cache.store(key, {}, b"{}")
+        keys.append(key)
+
+    clock.now += 10
+    cache.lookup("/data/wow/item/1", static())
+    assert accessed_at(cache_path, keys[0]) == 1000.0
+    cache.lookup("/data/wow/item/2", static())
+    assert accessed_at(cache_path, keys[0]) == 1010.0
+    assert accessed_at(cache_path, keys[1]) == 1010.0
+    cache.close()
+
+
+def test_pending_access_times_are_flushed_on_close(clock, cache_path):
+    cache = ResponseCache(cache_path, touch_batch=100)
+    key, _ = cache.lookup("/data/wow/item/1", static())
+    cache.store(key, {}, b"{}")
+    clock.now += 10
+    cache.lookup("/data/wow/item/1", static())
+    assert accessed_at(cache_path, key) == 1000.0
+    cache.close()
+    assert accessed_at(cache_path, key) == 1010.0
+
+
+def test_clear(clock, cache_path):
+    cache = ResponseCache(cache_path)
+    key, _ = cache.lookup("/data/wow/item/1", static())
+    cache.store(key, {}, b"{}")
+    cache.clear()
+    assert cache.lookup("/data/wow/item/1", static()) == (key, None)
+    cache.close()
@@ -0,0 +1,242 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from wowapi import WoWAPI, memo
+from wowapi.memo import MemoCache
+
+STATIC = {"namespace": "static-us", "locale": "en_US"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(memo, "time", clock)
+    return clock
+
+
+def test_hits_and_misses_are_counted_per_template():
+    cache = MemoCache()
+    assert cache.get("/data/wow/item/1", STATIC) == (False, None)
+    cache.set("/data/wow/item/1", dict(STATIC, access_token="a"), {"id": 1})
+    assert cache.get("/data/wow/item/1", dict(STATIC, access_token="b")) == (True, {"id": 1})
+    assert cache.get("/data/wow/item/2", STATIC) == (False, None)
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 2)
+    assert stats["by_endpoint"]["/data/wow/item/{id}"] == {"hits": 1, "misses": 2}
+
+
+def test_values_are_copied_in_and_out():
+    cache = MemoCache()
+    value = {"id": 1, "tags": []}
+    cache.set("/data/wow/item/1", STATIC, value)
+    value["tags"].append("changed")
+    _, cached = cache.get("/data/wow/item/1", STATIC)
+    cached["_id"] = "mongo"
+    assert cache.get("/data/wow/item/1", STATIC) == (True, {"id": 1, "tags": []})
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = MemoCache(ttl=60)
+    cache.set("/data/wow/item/1", STATIC, {"id": 1})
+    clock.now += 59
+    assert cache.peek("/data/wow/item/1", STATIC)
+    assert cache.get("/data/wow/item/1", STATIC)[0]
+    clock.now += 1
+    assert not cache.peek("/data/wow/item/1", STATIC)
+    assert cache.get("/data/wow/item/1", STATIC) == (False, None)
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = MemoCache(max_entries=2)
+    cache.set("/data/wow/item/1", STATIC, 1)
+    cache.set("/data/wow/item/2", STATIC, 2)
+    cache.get("/data/wow/item/1", STATIC)
+    cache.set("/data/wow/item/3", STATIC, 3)
+    assert cache.peek("/data/wow/item/1", STATIC)
+    assert not cache.peek("/data/wow/item/2", STATIC)
+    assert cache.peek("/data/wow/item/3", STATIC)
+
+
+def test_invalidate_by_endpoint_and_template():
+    cache = MemoCache()
+    for item_id in (1, 2):
+        cache.set(f"/data/wow/item/{item_id}", STATIC, item_id)
+    cache.set("/data/wow/profession/index", STATIC, [])
+    assert cache.invalidate("/data/wow/item/1") == 1
+    assert cache.invalidate("/data/wow/item/{id}") == 1
+    assert cache.invalidate() == 1
+
+
+def test_only_configured_namespaces_are_cacheable():
+    cache = MemoCache()
+    assert cache.is_cacheable(STATIC)
+    assert not cache.is_cacheable({"namespace": "dynamic-us"})
+    assert not cache.is_cacheable({})
+
+
+def test_get_or_load_caches_the_loaded_value():
+    cache = MemoCache()
+    assert cache.get_or_load("/data/wow/item/1", STATIC, lambda: {"id": 1}) == (False, {"id": 1})
+    assert cache.get_or_load("/data/wow/item/1", STATIC, lambda: pytest.fail("loaded twice")) == (True, {"id": 1})
+
+
+def test_concurrent_threads_share_one_load():
+    cache = MemoCache()
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def load():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"id": 1}
+
+    results = []
+
+    def lookup():
+        results.append(cache.get_or_load("/data/wow/item/1", STATIC, load))
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # Give the waiters time to block on the pending load before it completes
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(hit for hit, _ in results) == [False] + [True] * 7
+    assert all(value == {"id": 1} for _, value in results)
+    assert cache.stats()["misses"] == 1
+
+
+def test_failed_load_is_raised_to_waiters_and_not_cached():
+    cache = MemoCache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def load():
+        started.set()
+        release.wait(5)
+        raise ValueError("boom")
+
+    errors = []
+
+    def lookup():
+        try:
+            cache.get_or_load("/data/wow/item/1", STATIC, load)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=lookup) for _ in range(3)]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(errors) == 3
+    assert cache.get_or_load("/data/wow/item/1", STATIC, lambda: 1) == (False, 1)
+
+
+def test_concurrent_tasks_share_one_load():
+    cache = MemoCache()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"id": 1}
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_load_async("/data/wow/item/1", STATIC, load)
+                                      for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert [hit for hit, _ in results] == [False] + [True] * 4
+    assert all(value == {"id": 1} for _, value in results)
+
+
+def test_cancelled_waiter_does_not_cancel_the_load():
+    cache = MemoCache()
+
+    async def load():
+        await asyncio.sleep(0.05)
+        return 1
+
+    async def main():
+        loader = asyncio.create_task(cache.get_or_load_async("/data/wow/item/1", STATIC, load))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_load_async("/data/wow/item/1", STATIC, load))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        return await loader
+
+    assert asyncio.run(main()) == (False, 1)
+    assert cache.get("/data/wow/item/1", STATIC) == (True, 1)
+
+
+class JsonResponse:
+    status_code = 200
+    headers = {}
+    content = b'{"id": 1}'
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"id": 1}
+
+    def close(self):
+        pass
+
+
+class SlowSession:
+    def __init__(self):
+        self.requests = 0
+
+    def get(self, url, **kwargs):
+        self.requests += 1
+        time.sleep(0.05)
+        return JsonResponse()
+
+    def close(self):
+        pass
+
+
+def test_client_threads_share_one_request(monkeypatch):
+    monkeypatch.setenv("BNET_ACCESS_TOKEN", "token")
+    monkeypatch.delenv("BNET_CLIENT_ID", raising=False)
+    api = WoWAPI(memo_cache=MemoCache())
+    api.session = SlowSession()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(api.get_item_data(1))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [{"id": 1}] * 4
+    assert api.session.requests == 1
@@ -0,0 +1,61 @@
+import json
+import time
+
+from wowapi import RequestMetrics, WoWAPI
+
+
+class StreamedResponse:
+    status_code = 200
+
+    def __init__(self, body, chunk_delay):
+        self.body = body
+        self.chunk_delay = chunk_delay
+        self.headers = {"Last-Modified": "Tue, 01 Oct 2024 12:00:00 GMT", "Content-Length": "1"}
+
+    def iter_content(self, chunk_size):
+        for offset in range(0, len(self.body), chunk_size):
+            time.sleep(self.chunk_delay)
+            yield self.body[offset:offset + chunk_size]
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+
+    def get(self, url, **kwargs):
+        return self.response
+
+    def close(self):
+        pass
+
+
+def test_streamed_response_is_measured_as_it_is_read(monkeypatch):
+    monkeypatch.setenv("BNET_ACCESS_TOKEN", "token")
+    monkeypatch.delenv("BNET_CLIENT_ID", raising=False)
+    body = json.dumps({"auctions": [{"id": i, "item": {"id": 7}, "unit_price": 100} for i in range(50)]}).encode()
+    metrics = RequestMetrics()
+    events = []
+    metrics.add_hook(events.append)
+    api = WoWAPI(metrics=metrics)
+    api.session = FakeSession(StreamedResponse(body, chunk_delay=0.01))
+
+    last_modified, auctions = api.open_ah_commodities(chunk_size=256)
+    assert not events
+    assert len(list(auctions)) == 50
+
+    event, = events
+    assert event.status == 200
+    assert event.bytes == len(body)
+    assert event.latency >= 0.01 * (len(body) // 256)
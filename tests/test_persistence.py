@@ -0,0 +1,50 @@
+import pytest
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from wowapi.persistence import BulkWriter
+
+
+class FakeCollection:
+    name = "fake"
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.documents = {}
+
+    def bulk_write(self, operations, ordered=True):
+        error = self.errors.pop(0) if self.errors else None
+        if isinstance(error, Exception) and not isinstance(error, BulkWriteError):
+            raise error
+        rejected = {e["index"] for e in error.details["writeErrors"]} if error is not None else set()
+        for index, operation in enumerate(operations):
+            if index not in rejected:
+                self.documents[operation._filter["id"]] = operation._doc
+        if error is not None:
+            raise error
+
+    def distinct(self, key):
+        return list(self.documents)
+
+
+def test_failed_flush_keeps_buffer():
+    collection = FakeCollection([AutoReconnect("down")])
+    writer = BulkWriter(collection, flush_interval=None)
+    writer.add_many([{"id": 1}, {"id": 2}])
+    with pytest.raises(AutoReconnect):
+        writer.flush()
+    assert writer.written == 0
+    assert writer.flush() == 2
+    assert set(collection.documents) == {1, 2}
+
+
+def test_rejected_documents_are_exposed():
+    error = BulkWriteError({"writeErrors": [{"index": 1, "errmsg": "bad document"}]})
+    collection = FakeCollection([error])
+    writer = BulkWriter(collection, flush_interval=None)
+    writer.add_many([{"id": 1}, {"id": 2}])
+    assert writer.flush() == 1
+    assert writer.failed == {2: "bad document"}
+    assert not writer.contains(2)
+    writer.add({"id": 2})
+    writer.flush()
+    assert writer.failed == {}
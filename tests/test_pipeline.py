@@ -0,0 +1,43 @@
+import threading
+
+from wowapi.pipeline import Pipeline
+
+
+def test_run_stores_fetched_documents():
+    written = []
+    pipeline = Pipeline(lambda i: {"id": i}, sink=written.extend, workers=3, batch_size=4)
+    stats = pipeline.run(range(10))
+    assert sorted(document["id"] for document in written) == list(range(10))
+    assert stats.fetched == 10
+    assert stats.written == 10
+
+
+def test_fetch_and_sink_failures_are_recorded():
+    def fetch(i):
+        if i == 3:
+            raise ValueError("not found")
+        return {"id": i}
+
+    def sink(batch):
+        raise RuntimeError("database down")
+
+    stats = Pipeline(fetch, sink=sink, workers=2).run(range(5))
+    assert [work_item for work_item, _ in stats.failed] == [3]
+    assert len(stats.unwritten) == 4
+
+
+def test_run_finishes_when_on_item_raises():
+    def on_item(work_item):
+        raise RuntimeError("progress bar closed")
+
+    written = []
+    pipeline = Pipeline(lambda i: {"id": i}, sink=written.extend, workers=2, queue_size=2, on_item=on_item)
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(stats=pipeline.run(range(50))), daemon=True)
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive(), "pipeline blocked after an on_item failure"
+    stats = result["stats"]
+    assert stats.written == 50
+    assert len(stats.callback_errors) == 50
+    assert len(written) == 50
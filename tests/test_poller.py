@@ -0,0 +1,30 @@
+from wowapi.poller import AuctionPoller
+
+LAST_MODIFIED = "Tue, 01 Oct 2024 12:00:00 GMT"
+
+
+class FakeClient:
+    region = "us"
+
+    def open_ah_commodities(self, if_modified_since=None):
+        if if_modified_since == LAST_MODIFIED:
+            return LAST_MODIFIED, None
+        auctions = ({"id": i, "item": {"id": 7}, "quantity": 1, "unit_price": 100} for i in range(3))
+        return LAST_MODIFIED, auctions
+
+
+def test_failed_sink_does_not_advance_last_modified():
+    delivered = []
+
+    def failing_sink(region, snapshot):
+        raise RuntimeError("database down")
+
+    poller = AuctionPoller([FakeClient()], sinks=[lambda region, snapshot: delivered.append(snapshot), failing_sink])
+    assert not poller.poll("us")
+    assert "us" not in poller.last_modified
+
+    poller.sinks = [lambda region, snapshot: delivered.append(snapshot)]
+    assert poller.poll("us")
+    assert poller.last_modified["us"] == LAST_MODIFIED
+    assert len(delivered) == 2
+    assert not poller.poll("us")
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from wowapi.profit import RecipeBook
+from wowapi.snapshot import CommoditySnapshot
+
+
+def make_snapshot(prices):
+    # item_id -> unit price, one auction each
+    item_ids = list(prices)
+    return CommoditySnapshot(
+        np.arange(len(item_ids)) + 1,
+        item_ids,
+        np.ones(len(item_ids)),
+        [prices[item_id] for item_id in item_ids],
+        np.zeros(len(item_ids)),
+    )
+
+
+def make_recipe(recipe_id, crafted_item_id, reagents, slots=(), crafted_quantity=None):
+    recipe = {
+        "id": recipe_id,
+        "crafted_item": {"id": crafted_item_id},
+        "reagents": [{"reagent": {"id": item_id}, "quantity": quantity} for item_id, quantity in reagents],
+        "modified_crafting_slots": [{"slot_type": {"id": slot_type_id}} for slot_type_id in slots],
+    }
+    if crafted_quantity is not None:
+        recipe["crafted_quantity"] = crafted_quantity
+    return recipe
+
+
+def test_basic_recipe():
+    book = RecipeBook.from_recipes([make_recipe(1, 900, [(10, 2), (11, 3)])])
+    table = book.profit(make_snapshot({10: 100, 11: 50, 900: 1000}), ah_cut=0.05)
+    np.testing.assert_array_equal(table.recipe_id, [1])
+    assert table.cost[0] == pytest.approx(2 * 100 + 3 * 50)
+    assert table.revenue[0] == pytest.approx(1000 * 0.95)
+    assert table.profit[0] == pytest.approx(950 - 350)
+    assert table.priced[0]
+
+
+def test_crafted_quantity_range_uses_the_average():
+    book = RecipeBook.from_recipes([make_recipe(1, 900, [(10, 1)], crafted_quantity={"minimum": 1, "maximum": 3})])
+    table = book.profit(make_snapshot({10: 100, 900: 1000}), ah_cut=0)
+    assert table.revenue[0] == pytest.approx(2000)
+
+
+def test_modified_crafting_slot_uses_cheapest_listed_option():
+    slot_options = {7: {20, 21, 22}}
+    book = RecipeBook.from_recipes([
+        make_recipe(1, 900, [(10, 1)], slots=[7]),
+        make_recipe(2, 901, [(10, 1)], slots=[8]),  # slot type with no known items is ignored
+    ], slot_options)
+    # Item 22 is not listed, so the slot is priced at the cheaper of 20 and 21
+    table = book.profit(make_snapshot({10: 100, 20: 400, 21: 300, 900: 1000, 901: 500}), ah_cut=0)
+    np.testing.assert_allclose(table.cost, [100 + 300, 100])
+    assert table.priced.all()
+
+
+def test_unpriced_reagent_propagates_nan():
+    book = RecipeBook.from_recipes([
+        make_recipe(1, 900, [(10, 1), (12, 1)]),
+        make_recipe(2, 901, [(10, 1)]),
+        make_recipe(3, 902, [(10, 1)]),
+    ], {})
+    table = book.profit(make_snapshot({10: 100, 900: 1000, 901: 500}))
+    assert np.isnan(table.cost[0]) and np.isnan(table.profit[0])
+    assert np.isnan(table.revenue[2]) and np.isnan(table.profit[2])
+    np.testing.assert_array_equal(table.priced, [False, True, False])
+
+
+def test_explicit_prices_override_the_snapshot_minimum():
+    book = RecipeBook.from_recipes([make_recipe(1, 900, [(10, 1)])])
+    snapshot = make_snapshot({10: 100, 900: 1000})
+    table = book.profit(snapshot, prices=(np.array([10, 900]), np.array([200.0, 1000.0])), ah_cut=0)
+    assert table.cost[0] == pytest.approx(200)
+
+
+def test_empty_book():
+    book = RecipeBook.from_recipes([])
+    assert len(book) == 0
+    table = book.profit(make_snapshot({10: 100}))
+    for column in table:
+        assert len(column) == 0
@@ -0,0 +1,96 @@
+import pytest
+
+from wowapi import rate_limit
+from wowapi.rate_limit import RateLimiter, TokenBucket, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    return clock
+
+
+def test_bucket_allows_a_burst_up_to_capacity(clock):
+    bucket = TokenBucket(rate=10, capacity=5)
+    assert [bucket.reserve() for _ in range(5)] == [0.0] * 5
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve() == pytest.approx(0.2)
+
+
+def test_bucket_refills_at_rate_and_caps_at_capacity(clock):
+    bucket = TokenBucket(rate=4, capacity=5)
+    for _ in range(5):
+        bucket.reserve()
+    clock.now += 0.75
+    assert [bucket.reserve() for _ in range(3)] == [0.0] * 3
+    assert bucket.reserve() == pytest.approx(0.25)
+
+    clock.now += 60
+    assert [bucket.reserve() for _ in range(5)] == [0.0] * 5
+    assert bucket.reserve() > 0
+
+
+def test_set_rate_settles_tokens_earned_at_the_old_rate(clock):
+    bucket = TokenBucket(rate=4, capacity=5)
+    for _ in range(5):
+        bucket.reserve()
+    clock.now += 0.5
+    bucket.set_rate(1)
+    assert [bucket.reserve() for _ in range(2)] == [0.0] * 2
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_per_second_limit_paces_requests(clock):
+    limiter = RateLimiter(per_second=4, per_hour=3600)
+    for _ in range(6):
+        limiter.acquire()
+    assert clock.slept == pytest.approx([0.25, 0.25])
+
+
+def test_per_hour_limit_applies_once_its_burst_is_spent(clock):
+    limiter = RateLimiter(per_second=100, per_hour=10)
+    for _ in range(10):
+        limiter.acquire()
+    assert clock.slept == []
+    # The hour bucket refills one request every 360s, far slower than the second bucket
+    limiter.acquire()
+    assert clock.slept == pytest.approx([360.0])
+    clock.now += 3600
+    for _ in range(10):
+        limiter.acquire()
+    assert clock.slept == pytest.approx([360.0])
+
+
+def test_throttling_pauses_and_halves_the_rate(clock):
+    limiter = RateLimiter(per_second=8, per_hour=36000, min_per_second=3)
+    limiter.on_throttled(retry_after=2)
+    assert limiter.second_bucket.rate == 4
+    limiter.acquire()
+    assert clock.slept == pytest.approx([2.0])
+    limiter.on_throttled()
+    assert limiter.second_bucket.rate == 3
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.second_bucket.rate == 8
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("1.5") == 1.5
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
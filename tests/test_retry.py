@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+
+from wowapi import WoWAPI
+from wowapi.retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+        self.content = b"{}"
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+
+    def get(self, url, **kwargs):
+        return FakeResponse(self.statuses.pop(0))
+
+    def close(self):
+        pass
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=60)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire(block=False)
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0)
+    breaker.record_failure()
+    probe = breaker.acquire(block=False)
+    assert probe is not None
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire(block=False)
+    breaker.record_success()
+    breaker.release(probe)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.acquire(block=False) is None
+
+
+def test_failed_probe_reopens_circuit():
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=60)
+    breaker.record_failure()
+    breaker.opened_at -= 60
+    probe = breaker.acquire(block=False)
+    breaker.record_failure()
+    breaker.release(probe)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_released_probe_without_outcome_frees_slot():
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0)
+    breaker.record_failure()
+    probe = breaker.acquire(block=False)
+    breaker.release(probe)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.acquire(block=False) is not None
+
+
+def test_stale_release_keeps_newer_probe():
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0)
+    breaker.record_failure()
+    first = breaker.acquire(block=False)
+    breaker.record_failure()
+    second = breaker.acquire(block=False)
+    breaker.release(first)
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire(block=False)
+    breaker.release(second)
+
+
+def test_send_recovers_from_throttled_probe(monkeypatch):
+    monkeypatch.setenv("BNET_ACCESS_TOKEN", "token")
+    monkeypatch.delenv("BNET_CLIENT_ID", raising=False)
+    api = WoWAPI(retry_policy=RetryPolicy(max_retries=5, backoff_factor=0.01, jitter=False))
+    api.session = FakeSession([503, 429, 200])
+    api.rate_limiter.on_throttled = lambda retry_after: None
+    breaker = api.circuit_breakers.get("/data/wow/item/1")
+    breaker.failure_threshold = 1
+    breaker.recovery_timeout = 0.05
+
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(response=api._send("/data/wow/item/1", {})),
+                              daemon=True)
+    started = time.monotonic()
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive(), "request stuck behind a half-open circuit"
+    assert time.monotonic() - started < 5
+    assert result["response"].status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,82 @@
+import numpy as np
+
+from wowapi.snapshot import CommoditySnapshot
+
+
+def make_snapshot(rows):
+    # rows of (auction_id, item_id, quantity, unit_price, time_left)
+    columns = list(zip(*rows)) if rows else [[], [], [], [], []]
+    return CommoditySnapshot(*columns)
+
+
+SNAPSHOT = make_snapshot([
+    (1, 200, 5, 300, 3),
+    (2, 100, 1, 50, 3),
+    (3, 100, 10, 20, 2),
+    (4, 100, 4, 80, 1),
+    (5, 200, 5, 100, 0),
+])
+
+
+def test_rows_are_sorted_by_item_then_price():
+    np.testing.assert_array_equal(SNAPSHOT.item_id, [100, 100, 100, 200, 200])
+    np.testing.assert_array_equal(SNAPSHOT.unit_price, [20, 50, 80, 100, 300])
+
+
+def test_min_price_and_total_quantity():
+    item_ids, prices = SNAPSHOT.min_price()
+    np.testing.assert_array_equal(item_ids, [100, 200])
+    np.testing.assert_array_equal(prices, [20, 100])
+    _, totals = SNAPSHOT.total_quantity()
+    np.testing.assert_array_equal(totals, [15, 10])
+
+
+def test_weighted_and_unweighted_quantiles():
+    _, median = SNAPSHOT.median_price()
+    np.testing.assert_array_equal(median, [20, 100])
+    _, p90 = SNAPSHOT.quantile_price(0.9)
+    np.testing.assert_array_equal(p90, [80, 300])
+    _, unweighted = SNAPSHOT.median_price(weighted=False)
+    np.testing.assert_array_equal(unweighted, [50, 100])
+    _, lowest = SNAPSHOT.quantile_price(0.0)
+    np.testing.assert_array_equal(lowest, [20, 100])
+
+
+def test_weighted_quantile_is_nan_when_all_quantities_are_zero():
+    snapshot = make_snapshot([
+        (1, 100, 0, 20, 3),
+        (2, 100, 0, 50, 3),
+        (3, 200, 2, 70, 3),
+    ])
+    _, median = snapshot.median_price()
+    assert np.isnan(median[0])
+    assert median[1] == 70
+    _, unweighted = snapshot.median_price(weighted=False)
+    np.testing.assert_array_equal(unweighted, [20, 70])
+
+
+def test_empty_snapshot():
+    snapshot = make_snapshot([])
+    assert len(snapshot) == 0
+    for item_ids, values in (snapshot.min_price(), snapshot.total_quantity(), snapshot.median_price()):
+        assert len(item_ids) == 0
+        assert len(values) == 0
+    summary = snapshot.price_summary()
+    assert len(summary.item_id) == 0
+    diff = snapshot.diff(SNAPSHOT)
+    assert len(diff.new) == 0
+    np.testing.assert_array_equal(diff.removed, [1, 2, 3, 4, 5])
+
+
+def test_diff():
+    current = make_snapshot([
+        (1, 200, 5, 300, 3),  # unchanged
+        (2, 100, 1, 45, 3),  # price changed
+        (3, 100, 7, 20, 2),  # quantity changed
+        (4, 100, 4, 80, 0),  # only time_left changed
+        (6, 100, 2, 60, 3),  # new
+    ])
+    diff = current.diff(SNAPSHOT)
+    np.testing.assert_array_equal(diff.new, [6])
+    np.testing.assert_array_equal(diff.removed, [5])
+    np.testing.assert_array_equal(diff.changed, [2, 3, 4])
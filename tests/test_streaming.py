@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from wowapi.streaming import chunked, iter_json_array
+
+
+DOCUMENT = json.dumps({
+    "_links": {"self": {"href": "https://us.api.blizzard.com/data/wow/auctions/commodities"}},
+    "auctions": [
+        {"id": 1, "item": {"id": 210796}, "quantity": 12, "unit_price": 1234500, "time_left": "LONG"},
+        {"id": 2, "item": {"id": 210796}, "quantity": 3, "unit_price": 99, "time_left": "SHORT"},
+        {"id": 3, "item": {"id": 222417}, "quantity": 1, "unit_price": 7, "time_left": "VERY_LONG",
+         "note": "café ✨"},
+    ],
+}, ensure_ascii=False).encode()
+
+
+def split(data, size):
+    return [data[offset:offset + size] for offset in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(DOCUMENT)])
+def test_elements_split_across_chunks(size):
+    expected = json.loads(DOCUMENT)["auctions"]
+    assert list(iter_json_array(split(DOCUMENT, size), "auctions")) == expected
+
+
+def test_number_at_chunk_boundary():
+    assert list(iter_json_array([b'{"values": [12', b'34, 5', b'6]}'], "values")) == [1234, 56]
+
+
+def test_missing_array():
+    with pytest.raises(ValueError):
+        list(iter_json_array(split(DOCUMENT, 5), "bids"))
+
+
+def test_truncated_document():
+    with pytest.raises(ValueError):
+        list(iter_json_array(split(DOCUMENT[:-40], 5), "auctions"))
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
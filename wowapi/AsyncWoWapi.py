@@ -0,0 +1,439 @@
+import asyncio
+import json
+import logging
+import time
+
+import aiohttp
+
+from .base import BaseClient
+from .rate_limit import parse_retry_after
+from .batch import fetch_many_async
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+class AsyncWoWAPI(BaseClient):
+    """
+    An asyncio client for the World of Warcraft API.
+
+    This class mirrors the endpoint methods of WoWAPI as coroutines. All requests
+    share one pooled aiohttp session, and a semaphore bounds how many of them are
+    in flight at once, so callers can safely gather hundreds of lookups.
+
+    Example:
+        async with AsyncWoWAPI(concurrency=50) as api:
+            recipes = await asyncio.gather(*(api.get_recipe(i) for i in recipe_ids))
+    """
+
+    def __init__(self, region="us", concurrency=20, pool_size=100, pool_size_per_host=50, timeout=30,
+                 rate_limiter=None, retry_policy=None, circuit_breakers=None, wait_on_open_circuit=True,
+                 response_cache=None, memo_cache=None, token_manager=None, metrics=None):
+        """
+        Initialize the AsyncWoWAPI instance.
+
+        Args:
+            region (str, optional): The region for API requests. Defaults to "us".
+            concurrency (int, optional): Maximum number of requests in flight at once. Defaults to 20.
+            pool_size (int, optional): Total number of pooled connections. Defaults to 100.
+            pool_size_per_host (int, optional): Maximum pooled connections per host. Defaults to 50.
+            timeout (float, optional): Total timeout in seconds for each request. Defaults to 30.
+            rate_limiter (RateLimiter, optional): Limiter to pace requests with. Pass the same instance
+                to several clients to share one quota. Defaults to a new limiter with Blizzard's quotas.
+            retry_policy (RetryPolicy, optional): Backoff policy for transient failures.
+                Defaults to RetryPolicy().
+            circuit_breakers (CircuitBreakerRegistry, optional): Per-endpoint circuit breakers.
+                Defaults to a new registry.
+            wait_on_open_circuit (bool, optional): Wait for an open circuit to recover instead of
+                raising CircuitOpenError. Defaults to True.
+            response_cache (ResponseCache, optional): On-disk cache for responses in cacheable
+                namespaces. Defaults to None (no caching).
+            memo_cache (MemoCache, optional): In-memory cache for decoded responses.
+                Defaults to None (no memoization).
+            token_manager (TokenManager, optional): Source of client-credentials access tokens.
+                Defaults to TokenManager.from_env(), falling back to BNET_ACCESS_TOKEN when
+                BNET_CLIENT_ID/BNET_CLIENT_SECRET are not set.
+            metrics (RequestMetrics, optional): Receives an event for every HTTP attempt and cache
+                lookup. Defaults to None (no instrumentation).
+        """
+        super().__init__(region, rate_limiter, retry_policy, circuit_breakers, wait_on_open_circuit, response_cache,
+                         memo_cache, token_manager, metrics)
+        self.concurrency = concurrency
+        self.pool_size = pool_size
+        self.pool_size_per_host = pool_size_per_host
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session = None
+        logger.info(f"AsyncWoWAPI initialized for region: {region} (concurrency={concurrency})")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _get_session(self):
+        """
+        Return the shared aiohttp session, creating it on first use.
+
+        The session has to be created inside a running event loop, so it is
+        opened lazily on the first request rather than in __init__.
+
+        Returns:
+            aiohttp.ClientSession: The pooled session.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.pool_size_per_host)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            logger.debug(f"HTTP session created (limit={self.pool_size}, limit_per_host={self.pool_size_per_host})")
+        return self._session
+
+    async def close(self):
+        """
+        Close the underlying HTTP session and release its pooled connections.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.debug("HTTP session closed")
+
+    async def _get_token(self):
+        """
+        Return the current access token without blocking the event loop.
+        """
+        if self.token_manager is not None:
+            return await self.token_manager.get_token_async()
+        return self._static_token
+
+    async def _send(self, endpoint, params, headers=None):
+        """
+        Send a GET request, retrying transient failures.
+
+        Requests are paced by the rate limiter, bounded by the concurrency
+        semaphore and guarded by the endpoint's circuit breaker. The body is read
+        before the connection is released, so the pool slot is handed back before
+        the caller processes the response. A 401 is retried once with a freshly
+        issued token when a token manager is configured.
+
+        Args:
+            endpoint (str): The API endpoint to request.
+            params (dict): Query parameters for the request, including the access token.
+            headers (dict, optional): Extra request headers. Defaults to None.
+
+        Returns:
+            tuple: (aiohttp.ClientResponse, bytes) for the final response, which may still
+                carry an error status, and its body.
+
+        Raises:
+            aiohttp.ClientError: If the request keeps failing at the network level.
+            CircuitOpenError: If the endpoint's circuit is open and wait_on_open_circuit is False.
+        """
+        url = f"{self.base_url}{endpoint}"
+        breaker = self.circuit_breakers.get(endpoint)
+        attempt = 0
+        reauthenticated = False
+        while True:
+            probe = await breaker.acquire_async(block=self.wait_on_open_circuit)
+            try:
+                async with self._semaphore:
+                    await self.rate_limiter.acquire_async()
+                    logger.debug(f"Making API request to: {url}")
+                    started = time.perf_counter()
+                    try:
+                        async with self._get_session().get(url, params=params, headers=headers) as response:
+                            body = await response.read()
+                    except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                        response = None
+                        error = e
+                if response is None:
+                    self._record_request(endpoint, None, started, attempt=attempt, error=error)
+                    breaker.record_failure()
+                    if attempt >= self.retry_policy.max_retries:
+                        logger.error(f"API request failed: {url}. Error: {str(error)}")
+                        raise error
+                    delay = self.retry_policy.get_delay(attempt)
+                    logger.warning(f"API request error: {url}. Error: {str(error)}. Retrying in {delay:.1f}s")
+                else:
+                    self._record_request(endpoint, response.status, started, len(body), attempt,
+                                         headers=response.headers)
+                    if response.status == 401 and self.token_manager is not None and not reauthenticated:
+                        logger.warning(f"API request unauthorized: {url}. Retrying with a new access token")
+                        self.token_manager.invalidate()
+                        params['access_token'] = await self._get_token()
+                        reauthenticated = True
+                        continue
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    if response.status == 429:
+                        self.rate_limiter.on_throttled(retry_after)
+                        breaker.record_failure()
+                    elif response.status >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                        self.rate_limiter.on_success()
+                    if not self.retry_policy.is_retryable(response.status) or attempt >= self.retry_policy.max_retries:
+                        return response, body
+                    delay = self.retry_policy.get_delay(attempt, retry_after)
+                    logger.warning(f"API request returned {response.status}: {url}. Retrying in {delay:.1f}s")
+            finally:
+                # Hand the half-open probe slot back if this attempt ended without an outcome
+                breaker.release(probe)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _make_request(self, endpoint, params=None):
+        """
+        Make a request to the Blizzard API.
+
+        Responses already held by the memo cache are returned from memory. When a
+        response cache is configured, fresh cached responses are returned without
+        a request and stale ones are revalidated conditionally.
+
+        Args:
+            endpoint (str): The API endpoint to request.
+            params (dict, optional): Additional parameters for the request. Defaults to None.
+
+        Returns:
+            dict: The JSON response from the API.
+
+        Raises:
+            aiohttp.ClientResponseError: If the request fails.
+        """
+        if params is None:
+            params = {}
+        if self.memo_cache is None or not self.memo_cache.is_cacheable(params):
+            return await self._fetch_json(endpoint, params)
+        # Concurrent identical lookups share one fetch
+        hit, data = await self.memo_cache.get_or_load_async(endpoint, params, lambda: self._fetch_json(endpoint, params))
+        if hit:
+            logger.debug(f"Serving memoized response for {endpoint}")
+            self._record_cache(endpoint, "memo")
+        return data
+
+    async def _fetch_json(self, endpoint, params):
+        # ResponseCache calls block on SQLite, so they run in a worker thread to keep the event loop free
+        cache_key, cache_entry = None, None
+        if self.response_cache is not None:
+            cache_key, cache_entry = await asyncio.to_thread(self.response_cache.lookup, endpoint, params)
+            if cache_entry is not None and cache_entry.is_fresh:
+                logger.debug(f"Serving cached response for {cache_key}")
+                self._record_cache(endpoint, "fresh")
+                return cache_entry.json()
+        params['access_token'] = await self._get_token()
+        url = f"{self.base_url}{endpoint}"
+        headers = cache_entry.conditional_headers() if cache_entry is not None else None
+        response, body = await self._send(endpoint, params, headers=headers)
+        if response.status == 304 and cache_entry is not None:
+            await asyncio.to_thread(self.response_cache.revalidated, cache_key, response.headers)
+            logger.debug(f"API resource not modified: {url}")
+            self._record_cache(endpoint, "revalidated")
+            return cache_entry.json()
+        self._record_cache(endpoint, "miss")
+        try:
+            response.raise_for_status()
+            logger.debug(f"API request successful: {url}")
+            data = json.loads(body)
+        except aiohttp.ClientResponseError as e:
+            logger.error(f"API request failed: {url}. Error: {str(e)}")
+            raise
+        if cache_key is not None:
+            await asyncio.to_thread(self.response_cache.store, cache_key, response.headers, body)
+        return data
+
+    async def _get_data(self, endpoint, namespace=None, locale="en_US", **extra_params):
+        params = {
+            "namespace": namespace or f"static-{self.region}",
+            "locale": locale,
+            **extra_params
+        }
+        return await self._make_request(endpoint, params)
+
+    # Auction House
+    async def get_ah_commodities_data(self):
+        return await self._get_data("/data/wow/auctions/commodities", namespace=f"dynamic-{self.region}")
+
+    # Connected Realms
+    async def get_connected_realms_index(self):
+        return await self._get_data("/data/wow/connected-realm/index", namespace=f"dynamic-{self.region}")
+
+    async def get_connected_realm(self, connected_realm_id):
+        return await self._get_data(f"/data/wow/connected-realm/{connected_realm_id}",
+                                    namespace=f"dynamic-{self.region}")
+
+    async def get_connected_realm_auctions(self, connected_realm_id):
+        return await self._get_data(f"/data/wow/connected-realm/{connected_realm_id}/auctions",
+                                    namespace=f"dynamic-{self.region}")
+
+    # Professions
+    async def get_professions_index(self):
+        return await self._get_data("/data/wow/profession/index")
+
+    async def get_profession(self, profession_id):
+        return await self._get_data(f"/data/wow/profession/{profession_id}")
+
+    async def get_profession_media(self, profession_id):
+        return await self._get_data(f"/data/wow/media/profession/{profession_id}")
+
+    async def get_profession_skill_tier(self, profession_id, skill_tier_id):
+        return await self._get_data(f"/data/wow/profession/{profession_id}/skill-tier/{skill_tier_id}")
+
+    # Recipes
+    async def get_recipe(self, recipe_id):
+        return await self._get_data(f"/data/wow/recipe/{recipe_id}")
+
+    async def get_recipe_media(self, recipe_id):
+        return await self._get_data(f"/data/wow/media/recipe/{recipe_id}")
+
+    async def get_recipes(self, ids):
+        """
+        Fetch many recipes concurrently.
+
+        Args:
+            ids (Iterable[int]): IDs to fetch. Duplicates are fetched once.
+
+        Yields:
+            BatchResult: (id, data, error) for each ID, in completion order.
+        """
+        async for result in fetch_many_async(self.get_recipe, ids,
+                                             lambda i: self._is_memoized(f"/data/wow/recipe/{i}")):
+            yield result
+
+    async def get_recipe_medias(self, ids):
+        """
+        Fetch many recipe media assets concurrently.
+
+        Args:
+            ids (Iterable[int]): IDs to fetch. Duplicates are fetched once.
+
+        Yields:
+            BatchResult: (id, data, error) for each ID, in completion order.
+        """
+        async for result in fetch_many_async(self.get_recipe_media, ids,
+                                             lambda i: self._is_memoized(f"/data/wow/media/recipe/{i}")):
+            yield result
+
+    # Item Classes
+    async def get_item_classes_index(self):
+        return await self._get_data("/data/wow/item-class/index")
+
+    async def get_item_class(self, item_class_id):
+        return await self._get_data(f"/data/wow/item-class/{item_class_id}")
+
+    async def get_item_subclass(self, item_class_id, item_subclass_id):
+        return await self._get_data(f"/data/wow/item-class/{item_class_id}/item-subclass/{item_subclass_id}")
+
+    # Item Sets
+    async def get_item_sets_index(self):
+        return await self._get_data("/data/wow/item-set/index")
+
+    async def get_item_set(self, item_set_id):
+        return await self._get_data(f"/data/wow/item-set/{item_set_id}")
+
+    # Items
+    async def search_items(self, search_term, _pagesize=100, _page=1):
+        params = {
+            "namespace": f"static-{self.region}",
+            "name.en_US": search_term,
+            "_pageSize": _pagesize,
+            "_page": _page
+        }
+        return await self._make_request("/data/wow/search/item", params)
+
+    async def iter_search_items(self, search_term=None, filters=None, orderby=None, page_size=100, prefetch=3):
+        """
+        Iterate over every result of an item search, page by page.
+
+        The first page reveals the page count; up to prefetch further pages are
+        then requested concurrently while the caller consumes the current one.
+        Iteration stops after the last page reported by pageCount.
+
+        Args:
+            search_term (str, optional): Match against name.en_US. Defaults to None.
+            filters (dict, optional): Additional search parameters, e.g. {"id": "[1,1000]"}
+                for an ID range or {"item_class.id": 7}. Defaults to None.
+            orderby (str, optional): Sort order, e.g. "id" or "id:desc". Defaults to None.
+            page_size (int, optional): Results per page (the API allows up to 1000). Defaults to 100.
+            prefetch (int, optional): Pages requested ahead of the one being consumed. Defaults to 3.
+
+        Yields:
+            dict: Search results, each with "key" and "data" members.
+        """
+        params = {"namespace": f"static-{self.region}", "_pageSize": page_size, **(filters or {})}
+        if search_term is not None:
+            params["name.en_US"] = search_term
+        if orderby is not None:
+            params["orderby"] = orderby
+
+        def fetch_page(page):
+            return asyncio.ensure_future(self._make_request("/data/wow/search/item", {**params, "_page": page}))
+
+        first = await fetch_page(1)
+        page_count = first.get("pageCount", 1)
+        logger.debug(f"Item search has {page_count} pages")
+        for result in first.get("results", []):
+            yield result
+
+        pending = {}
+        next_page = 2
+        try:
+            for page in range(2, page_count + 1):
+                while next_page <= page_count and next_page <= page + prefetch:
+                    pending[next_page] = fetch_page(next_page)
+                    next_page += 1
+                for result in (await pending.pop(page)).get("results", []):
+                    yield result
+        finally:
+            for task in pending.values():
+                task.cancel()
+            # Wait for the cancelled prefetches to finish so none outlives the iterator
+            await asyncio.gather(*pending.values(), return_exceptions=True)
+
+    async def get_item_data(self, item_id):
+        return await self._get_data(f"/data/wow/item/{item_id}")
+
+    async def get_item_media(self, item_id):
+        return await self._get_data(f"/data/wow/media/item/{item_id}")
+
+    async def get_items(self, ids):
+        """
+        Fetch many items concurrently.
+
+        Args:
+            ids (Iterable[int]): IDs to fetch. Duplicates are fetched once.
+
+        Yields:
+            BatchResult: (id, data, error) for each ID, in completion order.
+        """
+        async for result in fetch_many_async(self.get_item_data, ids,
+                                             lambda i: self._is_memoized(f"/data/wow/item/{i}")):
+            yield result
+
+    async def get_item_medias(self, ids):
+        """
+        Fetch many item media assets concurrently.
+
+        Args:
+            ids (Iterable[int]): IDs to fetch. Duplicates are fetched once.
+
+        Yields:
+            BatchResult: (id, data, error) for each ID, in completion order.
+        """
+        async for result in fetch_many_async(self.get_item_media, ids,
+                                             lambda i: self._is_memoized(f"/data/wow/media/item/{i}")):
+            yield result
+
+    # Modified Crafting API
+    async def get_modified_crafting_index(self):
+        return await self._get_data("/data/wow/modified-crafting/index")
+
+    async def get_modified_crafting_category_index(self):
+        return await self._get_data("/data/wow/modified-crafting/category/index")
+
+    async def get_modified_crafting_category(self, category_id):
+        return await self._get_data(f"/data/wow/modified-crafting/category/{category_id}")
+
+    async def get_modified_crafting_reagent_slot_type_index(self):
+        return await self._get_data("/data/wow/modified-crafting/reagent-slot-type/index")
+
+    async def get_modified_crafting_reagent_slot_type(self, slot_type_id):
+        return await self._get_data(f"/data/wow/modified-crafting/reagent-slot-type/{slot_type_id}")
@@ -1,14 +1,31 @@
-import os
+import re
 import requests
 import datetime
 import logging
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+from .base import BaseClient
+from .batch import fetch_many
+from .rate_limit import parse_retry_after
+from .streaming import chunked, iter_json_array
 
 
 # Create a logger for this module
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
-class WoWAPI:
+CONNECTED_REALM_HREF = re.compile(r"/connected-realm/(\d+)")
+
+AuctionStream = namedtuple("AuctionStream", ["last_modified", "auctions"])
+AuctionStream.__doc__ = """
+An opened auction snapshot: its Last-Modified header and a lazy iterator over
+its auctions, or None when a conditional request found it unchanged.
+"""
+
+class WoWAPI(BaseClient):
     """
     A class to interact with the World of Warcraft API.
 
@@ -16,18 +33,74 @@ class WoWAPI:
     including auction house commodities, item data, and item media.
     """
 
-    def __init__(self, region="us"):
+    def __init__(self, region="us", pool_connections=10, pool_maxsize=20, timeout=(5, 30), rate_limiter=None,
+                 retry_policy=None, circuit_breakers=None, wait_on_open_circuit=True, response_cache=None,
+                 memo_cache=None, token_manager=None, metrics=None):
         """
         Initialize the WoWAPI instance.
 
         Args:
             region (str, optional): The region for API requests. Defaults to "us".
+            pool_connections (int, optional): Number of per-host connection pools to keep. Defaults to 10.
+            pool_maxsize (int, optional): Maximum number of keep-alive connections per host. Defaults to 20.
+            timeout (float | tuple, optional): Connect/read timeout in seconds passed to every request.
+                Defaults to (5, 30).
+            rate_limiter (RateLimiter, optional): Limiter to pace requests with. Pass the same instance
+                to several clients to share one quota. Defaults to a new limiter with Blizzard's quotas.
+            retry_policy (RetryPolicy, optional): Backoff policy for transient failures.
+                Defaults to RetryPolicy().
+            circuit_breakers (CircuitBreakerRegistry, optional): Per-endpoint circuit breakers.
+                Defaults to a new registry.
+            wait_on_open_circuit (bool, optional): Wait for an open circuit to recover instead of
+                raising CircuitOpenError. Defaults to True.
+            response_cache (ResponseCache, optional): On-disk cache for responses in cacheable
+                namespaces. Defaults to None (no caching).
+            memo_cache (MemoCache, optional): In-memory cache for decoded responses.
+                Defaults to None (no memoization).
+            token_manager (TokenManager, optional): Source of client-credentials access tokens.
+                Defaults to TokenManager.from_env(), falling back to BNET_ACCESS_TOKEN when
+                BNET_CLIENT_ID/BNET_CLIENT_SECRET are not set.
+            metrics (RequestMetrics, optional): Receives an event for every HTTP attempt and cache
+                lookup. Defaults to None (no instrumentation).
         """
-        self.access_token = self._get_access_token()
-        self.region = region
-        self.base_url = f"https://{region}.api.blizzard.com"
+        super().__init__(region, rate_limiter, retry_policy, circuit_breakers, wait_on_open_circuit, response_cache,
+                         memo_cache, token_manager, metrics)
+        self.timeout = timeout
+        self.session = self._create_session(pool_connections, pool_maxsize)
         logger.info(f"WoWAPI initialized for region: {region}")
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def _create_session(pool_connections, pool_maxsize):
+        """
+        Create a keep-alive session with a pooled HTTPS adapter.
+
+        Args:
+            pool_connections (int): Number of per-host connection pools to keep.
+            pool_maxsize (int): Maximum number of connections kept open per host.
+
+        Returns:
+            requests.Session: The configured session.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        logger.debug(f"HTTP session created (pool_connections={pool_connections}, pool_maxsize={pool_maxsize})")
+        return session
+
+    def close(self):
+        """
+        Close the underlying HTTP session and release its pooled connections.
+        """
+        self.session.close()
+        logger.debug("HTTP session closed")
+
     @staticmethod
     def add_timestamp(item_data):
         """
@@ -42,27 +115,110 @@ class WoWAPI:
         logger.debug("Adding timestamp to item data")
         item_data["ts"] = datetime.datetime.now(datetime.timezone.utc)
 
-    def _get_access_token(self):
+    @property
+    def access_token(self):
+        """
+        The current access token, refreshed by the token manager when one is configured.
+        """
+        if self.token_manager is not None:
+            return self.token_manager.get_token()
+        return self._static_token
+
+    def _send(self, endpoint, params, headers=None, stream=False, timing=None):
         """
-        Retrieve the Blizzard API access token from environment variables.
+        Send a GET request, retrying transient failures.
+
+        Requests are paced by the rate limiter and guarded by the endpoint's
+        circuit breaker. Connection errors, timeouts and retryable statuses are
+        retried with backoff, honoring the server's Retry-After header. A 401 is
+        retried once with a freshly issued token when a token manager is configured.
+
+        Args:
+            endpoint (str): The API endpoint to request.
+            params (dict): Query parameters for the request, including the access token.
+            headers (dict, optional): Extra request headers. Defaults to None.
+            stream (bool, optional): Leave the response body unread. Defaults to False.
+            timing (dict, optional): With stream, receives the "started" time and "attempt" of the
+                returned response, which is not recorded in the metrics: the caller records it once
+                the body has been read. Defaults to None.
 
         Returns:
-            str: The access token.
+            requests.Response: The final response, which may still carry an error status.
 
         Raises:
-            Exception: If the access token is not found in environment variables.
+            requests.RequestException: If the request keeps failing at the network level.
+            CircuitOpenError: If the endpoint's circuit is open and wait_on_open_circuit is False.
         """
-        token = os.getenv("BNET_ACCESS_TOKEN")
-        if not token:
-            logger.error("Blizzard API access token not found in environment variables.")
-            raise Exception("Blizzard API access token not found in environment variables.")
-        logger.debug("Access token retrieved successfully")
-        return token
+        url = f"{self.base_url}{endpoint}"
+        breaker = self.circuit_breakers.get(endpoint)
+        attempt = 0
+        reauthenticated = False
+
+        def discard(response):
+            # A streamed body that is not handed to the caller is never read
+            if stream:
+                self._record_request(endpoint, response.status_code, started, 0, attempt, headers=response.headers)
+            response.close()
+
+        while True:
+            probe = breaker.acquire(block=self.wait_on_open_circuit)
+            try:
+                self.rate_limiter.acquire()
+                logger.debug(f"Making API request to: {url}")
+                started = time.perf_counter()
+                try:
+                    response = self.session.get(url, params=params, headers=headers, stream=stream,
+                                                timeout=self.timeout)
+                except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                    self._record_request(endpoint, None, started, attempt=attempt, error=e)
+                    breaker.record_failure()
+                    if attempt >= self.retry_policy.max_retries:
+                        logger.error(f"API request failed: {url}. Error: {str(e)}")
+                        raise
+                    delay = self.retry_policy.get_delay(attempt)
+                    logger.warning(f"API request error: {url}. Error: {str(e)}. Retrying in {delay:.1f}s")
+                else:
+                    if not stream:
+                        self._record_request(endpoint, response.status_code, started, len(response.content), attempt,
+                                             headers=response.headers)
+                    if response.status_code == 401 and self.token_manager is not None and not reauthenticated:
+                        discard(response)
+                        logger.warning(f"API request unauthorized: {url}. Retrying with a new access token")
+                        self.token_manager.invalidate()
+                        params['access_token'] = self.access_token
+                        reauthenticated = True
+                        continue
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    if response.status_code == 429:
+                        self.rate_limiter.on_throttled(retry_after)
+                        breaker.record_failure()
+                    elif response.status_code >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                        self.rate_limiter.on_success()
+                    if (not self.retry_policy.is_retryable(response.status_code)
+                            or attempt >= self.retry_policy.max_retries):
+                        if timing is not None:
+                            timing.update(started=started, attempt=attempt)
+                        return response
+                    discard(response)
+                    delay = self.retry_policy.get_delay(attempt, retry_after)
+                    logger.warning(f"API request returned {response.status_code}: {url}. Retrying in {delay:.1f}s")
+            finally:
+                # Hand the half-open probe slot back if this attempt ended without an outcome
+                breaker.release(probe)
+            attempt += 1
+            time.sleep(delay)
 
     def _make_request(self, endpoint, params=None):
         """
         Make a request to the Blizzard API.
 
+        Responses already held by the memo cache are returned from memory. When a
+        response cache is configured, fresh cached responses are returned without
+        a request and stale ones are revalidated conditionally.
+
         Args:
             endpoint (str): The API endpoint to request.
             params (dict, optional): Additional parameters for the request. Defaults to None.
@@ -75,21 +231,47 @@ class WoWAPI:
         """
         if params is None:
             params = {}
+        if self.memo_cache is None or not self.memo_cache.is_cacheable(params):
+            return self._fetch_json(endpoint, params)
+        # Concurrent identical lookups share one fetch
+        hit, data = self.memo_cache.get_or_load(endpoint, params, lambda: self._fetch_json(endpoint, params))
+        if hit:
+            logger.debug(f"Serving memoized response for {endpoint}")
+            self._record_cache(endpoint, "memo")
+        return data
+
+    def _fetch_json(self, endpoint, params):
+        cache_key, cache_entry = None, None
+        if self.response_cache is not None:
+            cache_key, cache_entry = self.response_cache.lookup(endpoint, params)
+            if cache_entry is not None and cache_entry.is_fresh:
+                logger.debug(f"Serving cached response for {cache_key}")
+                self._record_cache(endpoint, "fresh")
+                return cache_entry.json()
         params['access_token'] = self.access_token
         url = f"{self.base_url}{endpoint}"
-        logger.info(f"Making API request to: {url}")
+        headers = cache_entry.conditional_headers() if cache_entry is not None else None
+        response = self._send(endpoint, params, headers=headers)
+        if response.status_code == 304 and cache_entry is not None:
+            self.response_cache.revalidated(cache_key, response.headers)
+            logger.debug(f"API resource not modified: {url}")
+            self._record_cache(endpoint, "revalidated")
+            return cache_entry.json()
+        self._record_cache(endpoint, "miss")
         try:
-            response = requests.get(url, params=params)
             response.raise_for_status()
             logger.debug(f"API request successful: {url}")
-            return response.json()
+            data = response.json()
         except requests.HTTPError as e:
             logger.error(f"API request failed: {url}. Error: {str(e)}")
             raise
+        if cache_key is not None:
+            self.response_cache.store(cache_key, response.headers, response.content)
+        return data
 
-    def _get_data(self, endpoint, namespace="static-us", locale="en_US", **extra_params):
+    def _get_data(self, endpoint, namespace=None, locale="en_US", **extra_params):
         params = {
-            "namespace": namespace,
+            "namespace": namespace or f"static-{self.region}",
             "locale": locale,
             **extra_params
         }
@@ -97,7 +279,169 @@ class WoWAPI:
 
     # Auction House
     def get_ah_commodities_data(self):
-        return self._get_data("/data/wow/auctions/commodities", namespace="dynamic-us")
+        return self._get_data("/data/wow/auctions/commodities", namespace=f"dynamic-{self.region}")
+
+    def stream_ah_commodities(self, batch_size=None, chunk_size=64 * 1024):
+        """
+        Stream the region-wide commodities snapshot without loading it all into memory.
+
+        The response body is parsed incrementally as it downloads, so auctions
+        can be filtered and stored while the rest of the snapshot is still in
+        flight.
+
+        Args:
+            batch_size (int, optional): Yield lists of up to this many auctions instead of
+                single auctions. Defaults to None.
+            chunk_size (int, optional): Bytes read from the network at a time. Defaults to 64 KiB.
+
+        Yields:
+            dict | list[dict]: Auctions, or batches of auctions when batch_size is set.
+
+        Raises:
+            requests.HTTPError: If the request fails.
+        """
+        yield from self.open_ah_commodities(batch_size=batch_size, chunk_size=chunk_size).auctions
+
+    def open_ah_commodities(self, if_modified_since=None, batch_size=None, chunk_size=64 * 1024):
+        """
+        Request the commodities snapshot, unless it has not changed since if_modified_since.
+
+        Args:
+            if_modified_since (str, optional): Last-Modified value of the snapshot already held.
+                Defaults to None.
+            batch_size (int, optional): Yield batches of up to this many auctions. Defaults to None.
+            chunk_size (int, optional): Bytes read from the network at a time. Defaults to 64 KiB.
+
+        Returns:
+            AuctionStream: See open_auction_stream().
+        """
+        return self.open_auction_stream("/data/wow/auctions/commodities", if_modified_since, batch_size, chunk_size)
+
+    def open_auction_stream(self, endpoint, if_modified_since=None, batch_size=None, chunk_size=64 * 1024):
+        """
+        Request an auction snapshot and return its Last-Modified with a lazy auction stream.
+
+        With if_modified_since set the request is conditional: when the snapshot
+        has not been republished the server answers 304 and no body is
+        downloaded. Otherwise the auctions are parsed incrementally as they are
+        consumed; iterate or close() the stream to release the connection.
+
+        Args:
+            endpoint (str): An auctions endpoint in the dynamic namespace.
+            if_modified_since (str, optional): Last-Modified value of the snapshot already held.
+                Defaults to None.
+            batch_size (int, optional): Yield batches of up to this many auctions. Defaults to None.
+            chunk_size (int, optional): Bytes read from the network at a time. Defaults to 64 KiB.
+
+        Returns:
+            AuctionStream: (last_modified, auctions); auctions is None if the snapshot is unchanged.
+
+        Raises:
+            requests.HTTPError: If the request fails.
+        """
+        params = {"namespace": f"dynamic-{self.region}", "locale": "en_US", "access_token": self.access_token}
+        headers = {"If-Modified-Since": if_modified_since} if if_modified_since else None
+        url = f"{self.base_url}{endpoint}"
+        timing = {}
+        response = self._send(endpoint, params, headers=headers, stream=True, timing=timing)
+        if response.status_code == 304:
+            response.close()
+            self._record_request(endpoint, 304, timing["started"], 0, timing["attempt"], headers=response.headers)
+            logger.debug(f"Auction snapshot not modified: {url}")
+            return AuctionStream(if_modified_since, None)
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as e:
+            self._record_request(endpoint, response.status_code, timing["started"], len(response.content),
+                                 timing["attempt"], headers=response.headers)
+            response.close()
+            logger.error(f"API request failed: {url}. Error: {str(e)}")
+            raise
+        logger.debug(f"Streaming API response: {url}")
+        timing["latency"] = time.perf_counter() - timing["started"]
+        return AuctionStream(response.headers.get("Last-Modified"),
+                             self._iter_auctions(endpoint, response, batch_size, chunk_size, timing))
+
+    def _iter_auctions(self, endpoint, response, batch_size, chunk_size, timing):
+        """
+        Parse a streamed auction snapshot, recording the request once the body has been read.
+
+        The recorded latency covers the response headers plus the time spent
+        reading the body, but not the time the consumer spends between chunks;
+        the recorded size counts the body bytes actually received.
+        """
+        received = 0
+        error = None
+
+        def chunks():
+            nonlocal received
+            content = response.iter_content(chunk_size)
+            while True:
+                read_started = time.perf_counter()
+                chunk = next(content, None)
+                timing["latency"] += time.perf_counter() - read_started
+                if chunk is None:
+                    return
+                received += len(chunk)
+                yield chunk
+
+        try:
+            with response:
+                auctions = iter_json_array(chunks(), "auctions")
+                if batch_size:
+                    yield from chunked(auctions, batch_size)
+                else:
+                    yield from auctions
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            # _record_request measures latency from a start time, so backdate one
+            self._record_request(endpoint, response.status_code, time.perf_counter() - timing["latency"], received,
+                                 timing["attempt"], error=error, headers=response.headers)
+
+    # Connected Realms
+    def get_connected_realms_index(self):
+        return self._get_data("/data/wow/connected-realm/index", namespace=f"dynamic-{self.region}")
+
+    def get_connected_realm_ids(self):
+        """
+        List the IDs of every connected realm in the region.
+
+        Returns:
+            list[int]: Connected realm IDs, parsed from the index's hrefs.
+        """
+        realm_ids = []
+        for realm in self.get_connected_realms_index().get("connected_realms", []):
+            match = CONNECTED_REALM_HREF.search(realm.get("href", ""))
+            if match:
+                realm_ids.append(int(match.group(1)))
+        return realm_ids
+
+    def get_connected_realm(self, connected_realm_id):
+        return self._get_data(f"/data/wow/connected-realm/{connected_realm_id}", namespace=f"dynamic-{self.region}")
+
+    def get_connected_realm_auctions(self, connected_realm_id):
+        return self._get_data(f"/data/wow/connected-realm/{connected_realm_id}/auctions",
+                              namespace=f"dynamic-{self.region}")
+
+    def open_connected_realm_auctions(self, connected_realm_id, if_modified_since=None, batch_size=None,
+                                      chunk_size=64 * 1024):
+        """
+        Request a connected realm's auction snapshot, unless it has not changed.
+
+        Args:
+            connected_realm_id (int): The connected realm ID.
+            if_modified_since (str, optional): Last-Modified value of the snapshot already held.
+                Defaults to None.
+            batch_size (int, optional): Yield batches of up to this many auctions. Defaults to None.
+            chunk_size (int, optional): Bytes read from the network at a time. Defaults to 64 KiB.
+
+        Returns:
+            AuctionStream: See open_auction_stream().
+        """
+        return self.open_auction_stream(f"/data/wow/connected-realm/{connected_realm_id}/auctions",
+                                        if_modified_since, batch_size, chunk_size)
 
     # Professions
     def get_professions_index(self):
@@ -119,6 +463,32 @@ class WoWAPI:
     def get_recipe_media(self, recipe_id):
         return self._get_data(f"/data/wow/media/recipe/{recipe_id}")
 
+    def get_recipes(self, ids, max_workers=16):
+        """
+        Fetch many recipes concurrently.
+
+        Args:
+            ids (Iterable[int]): IDs to fetch. Duplicates are fetched once.
+            max_workers (int, optional): Number of concurrent requests. Defaults to 16.
+
+        Yields:
+            BatchResult: (id, data, error) for each ID, in completion order.
+        """
+        return fetch_many(self.get_recipe, ids, max_workers, lambda i: self._is_memoized(f"/data/wow/recipe/{i}"))
+
+    def get_recipe_medias(self, ids, max_workers=16):
+        """
+        Fetch many recipe media assets concurrently.
+
+        Args:
+            ids (Iterable[int]): IDs to fetch. Duplicates are fetched once.
+            max_workers (int, optional): Number of concurrent requests. Defaults to 16.
+
+        Yields:
+            BatchResult: (id, data, error) for each ID, in completion order.
+        """
+        return fetch_many(self.get_recipe_media, ids, max_workers, lambda i: self._is_memoized(f"/data/wow/media/recipe/{i}"))
+
     # Item Classes
     def get_item_classes_index(self):
         return self._get_data("/data/wow/item-class/index")
@@ -146,12 +516,87 @@ class WoWAPI:
         }
         return self._make_request("/data/wow/search/item", params)
 
+    def iter_search_items(self, search_term=None, filters=None, orderby=None, page_size=100, prefetch=3):
+        """
+        Iterate over every result of an item search, page by page.
+
+        The first page reveals the page count; up to prefetch further pages are
+        then requested in the background while the caller consumes the current
+        one, so page latency overlaps with processing. Iteration stops after the
+        last page reported by pageCount.
+
+        Args:
+            search_term (str, optional): Match against name.en_US. Defaults to None.
+            filters (dict, optional): Additional search parameters, e.g. {"id": "[1,1000]"}
+                for an ID range or {"item_class.id": 7}. Defaults to None.
+            orderby (str, optional): Sort order, e.g. "id" or "id:desc". Defaults to None.
+            page_size (int, optional): Results per page (the API allows up to 1000). Defaults to 100.
+            prefetch (int, optional): Pages requested ahead of the one being consumed. Defaults to 3.
+
+        Yields:
+            dict: Search results, each with "key" and "data" members.
+        """
+        params = {"namespace": f"static-{self.region}", "_pageSize": page_size, **(filters or {})}
+        if search_term is not None:
+            params["name.en_US"] = search_term
+        if orderby is not None:
+            params["orderby"] = orderby
+
+        def fetch_page(page):
+            return self._make_request("/data/wow/search/item", {**params, "_page": page})
+
+        first = fetch_page(1)
+        page_count = first.get("pageCount", 1)
+        logger.debug(f"Item search has {page_count} pages")
+        yield from first.get("results", [])
+        if page_count <= 1:
+            return
+
+        with ThreadPoolExecutor(max_workers=prefetch + 1) as executor:
+            pending = {}
+            next_page = 2
+            try:
+                for page in range(2, page_count + 1):
+                    while next_page <= page_count and next_page <= page + prefetch:
+                        pending[next_page] = executor.submit(fetch_page, next_page)
+                        next_page += 1
+                    yield from pending.pop(page).result().get("results", [])
+            finally:
+                for future in pending.values():
+                    future.cancel()
+
     def get_item_data(self, item_id):
         return self._get_data(f"/data/wow/item/{item_id}")
 
     def get_item_media(self, item_id):
         return self._get_data(f"/data/wow/media/item/{item_id}")
 
+    def get_items(self, ids, max_workers=16):
+        """
+        Fetch many items concurrently.
+
+        Args:
+            ids (Iterable[int]): IDs to fetch. Duplicates are fetched once.
+            max_workers (int, optional): Number of concurrent requests. Defaults to 16.
+
+        Yields:
+            BatchResult: (id, data, error) for each ID, in completion order.
+        """
+        return fetch_many(self.get_item_data, ids, max_workers, lambda i: self._is_memoized(f"/data/wow/item/{i}"))
+
+    def get_item_medias(self, ids, max_workers=16):
+        """
+        Fetch many item media assets concurrently.
+
+        Args:
+            ids (Iterable[int]): IDs to fetch. Duplicates are fetched once.
+            max_workers (int, optional): Number of concurrent requests. Defaults to 16.
+
+        Yields:
+            BatchResult: (id, data, error) for each ID, in completion order.
+        """
+        return fetch_many(self.get_item_media, ids, max_workers, lambda i: self._is_memoized(f"/data/wow/media/item/{i}"))
+
     # Modified Crafting API
     def get_modified_crafting_index(self):
         return self._get_data("/data/wow/modified-crafting/index")
@@ -1,3 +1,15 @@
 from .WoWapi import WoWAPI
+from .AsyncWoWapi import AsyncWoWAPI
+from .auth import TokenManager
+from .batch import BatchResult
+from .http_cache import ResponseCache
+from .memo import MemoCache
+from .metrics import RequestMetrics
+from .multi_region import MultiRegionAPI
+from .pipeline import Pipeline, PipelineStats
+from .rate_limit import RateLimiter
+from .retry import CircuitBreakerRegistry, CircuitOpenError, RetryPolicy
+from .snapshot import CommoditySnapshot, SnapshotDiff
 
-__all__ = ['WoWAPI']
+__all__ = ['WoWAPI', 'AsyncWoWAPI', 'BatchResult', 'MemoCache', 'Pipeline', 'PipelineStats', 'RateLimiter', 'ResponseCache', 'RetryPolicy', 'CircuitBreakerRegistry', 'CircuitOpenError',
+           'CommoditySnapshot', 'SnapshotDiff', 'TokenManager', 'MultiRegionAPI', 'RequestMetrics']
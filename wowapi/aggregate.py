@@ -0,0 +1,410 @@
+import copy
+import datetime
+import logging
+import math
+import os
+from collections import namedtuple
+
+import numpy as np
+from pymongo import UpdateOne
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Truncate a UTC timestamp to the start of its bucket
+PERIODS = {
+    "hour": lambda ts: ts.replace(minute=0, second=0, microsecond=0),
+    "day": lambda ts: ts.replace(hour=0, minute=0, second=0, microsecond=0),
+}
+
+DEFAULT_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+PriceBucket = namedtuple("PriceBucket", ["period", "start", "snapshots", "item_id", "min_price", "avg_price",
+                                         "quantity", "quantiles"])
+PriceBucket.__doc__ = """
+Per-item price statistics of one time bucket as parallel arrays ordered by
+item_id: minimum and quantity-weighted average unit price, average listed
+quantity per snapshot, and an (items x quantile levels) array of unit price
+quantiles over every unit listed during the bucket.
+"""
+
+
+class PriceSketch:
+    """
+    A mergeable, quantity-weighted unit price sketch for many items at once.
+
+    Prices are counted in logarithmic bins (as in DDSketch), so any quantile
+    read back is within relative_accuracy of an exact one, and the size is
+    bounded by the spread of prices rather than the number of auctions. The
+    sketch is stored column-wise as (item_id, bin) keys with summed weights;
+    merging two sketches is a concatenation and one group-by.
+    """
+
+    def __init__(self, key=None, weight=None, relative_accuracy=0.01):
+        """
+        Initialize the PriceSketch instance.
+
+        Args:
+            key (array-like, optional): Sorted, distinct item_id << 32 | bin keys. Defaults to empty.
+            weight (array-like, optional): Units counted under each key. Defaults to empty.
+            relative_accuracy (float, optional): Relative error bound of quantiles. Defaults to 0.01.
+        """
+        self.key = np.asarray(key if key is not None else [], dtype=np.int64)
+        self.weight = np.asarray(weight if weight is not None else [], dtype=np.float64)
+        self.relative_accuracy = relative_accuracy
+        self._log_gamma = math.log((1 + relative_accuracy) / (1 - relative_accuracy))
+
+    def __len__(self):
+        return len(self.key)
+
+    @classmethod
+    def _from_pairs(cls, key, weight, relative_accuracy):
+        key, inverse = np.unique(key, return_inverse=True)
+        return cls(key, np.bincount(inverse, weights=weight, minlength=len(key)), relative_accuracy)
+
+    def add(self, item_id, unit_price, quantity):
+        """
+        Count listings in the sketch.
+
+        Args:
+            item_id (array-like): Item ID of each listing.
+            unit_price (array-like): Unit price of each listing in copper.
+            quantity (array-like): Units in each listing.
+
+        Returns:
+            PriceSketch: A new sketch holding both the old and the new counts.
+        """
+        prices = np.maximum(np.asarray(unit_price, dtype=np.float64), 1)
+        bins = np.ceil(np.log(prices) / self._log_gamma).astype(np.int64)
+        key = (np.asarray(item_id, dtype=np.int64) << 32) | bins
+        return self._from_pairs(
+            np.concatenate([self.key, key]),
+            np.concatenate([self.weight, np.asarray(quantity, dtype=np.float64)]),
+            self.relative_accuracy,
+        )
+
+    def merge(self, other):
+        return self._from_pairs(np.concatenate([self.key, other.key]), np.concatenate([self.weight, other.weight]),
+                                self.relative_accuracy)
+
+    def quantiles(self, levels):
+        """
+        Estimate unit price quantiles for every item in the sketch.
+
+        Args:
+            levels (Iterable[float]): Quantile levels in [0, 1].
+
+        Returns:
+            tuple: (item_ids, prices) where prices has one column per level.
+        """
+        levels = np.asarray(list(levels), dtype=np.float64)
+        item_id = (self.key >> 32).astype(np.int32)
+        item_ids, starts = np.unique(item_id, return_index=True)
+        if not len(item_ids):
+            return item_ids, np.empty((0, len(levels)))
+        ends = np.append(starts[1:], len(item_id))
+        cumulative = np.cumsum(self.weight)
+        before = np.where(starts > 0, cumulative[starts - 1], 0)
+        totals = cumulative[ends - 1] - before
+        targets = before[:, None] + levels[None, :] * totals[:, None]
+        rows = np.searchsorted(cumulative, targets, side="left")
+        rows = np.clip(rows, starts[:, None], (ends - 1)[:, None])
+        bins = (self.key[rows] & 0xFFFFFFFF).astype(np.float64)
+        gamma = math.exp(self._log_gamma)
+        # The midpoint of bin i, (gamma^(i-1), gamma^i], in relative terms
+        return item_ids, 2 * np.exp(bins * self._log_gamma) / (gamma + 1)
+
+
+class PriceAccumulator:
+    """
+    Running per-item statistics of the snapshots in one time bucket.
+    """
+
+    def __init__(self, start, relative_accuracy=0.01):
+        self.start = start
+        self.snapshots = 0
+        self.item_id = np.empty(0, dtype=np.int32)
+        self.min_price = np.empty(0, dtype=np.int64)
+        self.price_volume = np.empty(0, dtype=np.float64)
+        self.quantity = np.empty(0, dtype=np.int64)
+        self.sketch = PriceSketch(relative_accuracy=relative_accuracy)
+
+    def update(self, snapshot):
+        """
+        Fold one snapshot into the bucket.
+
+        Args:
+            snapshot (CommoditySnapshot): The snapshot.
+        """
+        item_ids, starts, _ = snapshot._group_bounds()
+        if len(item_ids):
+            min_price = snapshot.unit_price[starts]
+            quantity = np.add.reduceat(snapshot.quantity, starts, dtype=np.int64)
+            price_volume = np.add.reduceat(snapshot.unit_price * snapshot.quantity.astype(np.float64), starts)
+        else:
+            min_price = quantity = price_volume = np.empty(0)
+
+        all_ids = np.union1d(self.item_id, item_ids).astype(np.int32)
+        self.min_price = np.minimum(_align(self.item_id, self.min_price, all_ids, np.iinfo(np.int64).max),
+                                    _align(item_ids, min_price, all_ids, np.iinfo(np.int64).max))
+        self.quantity = (_align(self.item_id, self.quantity, all_ids, 0)
+                         + _align(item_ids, quantity, all_ids, 0))
+        self.price_volume = (_align(self.item_id, self.price_volume, all_ids, 0, np.float64)
+                             + _align(item_ids, price_volume, all_ids, 0, np.float64))
+        self.item_id = all_ids
+        self.sketch = self.sketch.add(snapshot.item_id, snapshot.unit_price, snapshot.quantity)
+        self.snapshots += 1
+
+    def summary(self, period, levels):
+        """
+        Summarize the bucket.
+
+        Returns:
+            PriceBucket: The bucket's statistics.
+        """
+        _, quantiles = self.sketch.quantiles(levels)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg_price = np.where(self.quantity > 0, self.price_volume / self.quantity, np.nan)
+        return PriceBucket(
+            period=period,
+            start=self.start,
+            snapshots=self.snapshots,
+            item_id=self.item_id,
+            min_price=self.min_price,
+            avg_price=avg_price,
+            quantity=self.quantity / max(self.snapshots, 1),
+            quantiles=quantiles,
+        )
+
+
+def _align(ids, values, all_ids, fill, dtype=np.int64):
+    """
+    Scatter per-item values onto a superset of sorted item IDs.
+    """
+    result = np.full(len(all_ids), fill, dtype=dtype)
+    if len(ids):
+        result[np.searchsorted(all_ids, ids)] = values
+    return result
+
+
+class PriceAggregator:
+    """
+    Incrementally maintained per-item price series in hourly and daily buckets.
+
+    Each ingested snapshot is folded into the open bucket of every period:
+    minimum and quantity-weighted average unit price, listed quantity and a
+    PriceSketch for percentiles. Only these accumulators are kept, in a
+    compressed .npz state file, so the cost of an update depends on the size
+    of one snapshot, not on the length of the price history. A snapshot in a
+    later bucket closes the previous one.
+
+    Updates are keyed by the snapshot's timestamp, which should be its
+    Last-Modified time: a snapshot no newer than the last one applied is
+    ignored, so the same publication is never counted twice. update() only
+    stages the new state; call commit() once the bucket documents are stored.
+
+    Example:
+        aggregator = PriceAggregator(".cache/prices-us.npz")
+        for bucket in aggregator.update(snapshot):
+            ...  # upsert aggregator.to_documents(bucket)
+        aggregator.commit()
+    """
+
+    def __init__(self, state_path, periods=("hour", "day"), quantiles=DEFAULT_QUANTILES, relative_accuracy=0.01):
+        """
+        Initialize the PriceAggregator instance.
+
+        Args:
+            state_path (str): File holding the open buckets' accumulators.
+            periods (Iterable[str], optional): Bucket sizes, keys of PERIODS. Defaults to ("hour", "day").
+            quantiles (Iterable[float], optional): Quantile levels to report. Defaults to DEFAULT_QUANTILES.
+            relative_accuracy (float, optional): Relative error bound of the quantiles. Defaults to 0.01.
+        """
+        self.state_path = state_path
+        self.periods = tuple(periods)
+        self.quantiles = tuple(quantiles)
+        self.relative_accuracy = relative_accuracy
+        self.buckets = {}
+        self.last_timestamp = None
+        self._staged = None
+        if os.path.exists(state_path):
+            self._load()
+
+    def update(self, snapshot):
+        """
+        Fold a snapshot into its buckets, staging the new state for commit().
+
+        Args:
+            snapshot (CommoditySnapshot): The ingested snapshot.
+
+        Returns:
+            list[PriceBucket]: The updated summary of the snapshot's bucket in every period; empty if
+                the snapshot is not newer than the last one applied.
+        """
+        timestamp = snapshot.timestamp.astimezone(datetime.timezone.utc)
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            logger.info(f"Skipping snapshot from {timestamp}, already aggregated up to {self.last_timestamp}")
+            self._staged = None
+            return []
+        buckets = dict(self.buckets)
+        updated = []
+        for period in self.periods:
+            start = PERIODS[period](timestamp)
+            bucket = buckets.get(period)
+            if bucket is not None and start < bucket.start:
+                logger.warning(f"Skipping snapshot from {timestamp} older than the open {period} bucket")
+                continue
+            if bucket is None or start > bucket.start:
+                bucket = PriceAccumulator(start, self.relative_accuracy)
+            else:
+                # PriceAccumulator.update rebinds its arrays, so the committed state is left untouched
+                bucket = copy.copy(bucket)
+            bucket.update(snapshot)
+            buckets[period] = bucket
+            updated.append(bucket.summary(period, self.quantiles))
+        self._staged = (buckets, timestamp)
+        logger.info(f"Aggregated snapshot from {timestamp} into {len(updated)} buckets")
+        return updated
+
+    def commit(self):
+        """
+        Make the state staged by the last update() current and persist it.
+
+        Call this only after the documents of the returned buckets have been
+        stored; until then a crash or failed write leaves the snapshot unapplied.
+        """
+        if self._staged is None:
+            return
+        self.buckets, self.last_timestamp = self._staged
+        self._staged = None
+        self._save()
+
+    def to_documents(self, bucket):
+        """
+        Convert a bucket summary into one document per item.
+
+        Args:
+            bucket (PriceBucket): The bucket summary.
+
+        Returns:
+            list[dict]: Documents keyed by item_id, period and start.
+        """
+        names = [f"p{round(level * 100)}" for level in self.quantiles]
+        documents = []
+        for row, item_id in enumerate(bucket.item_id.tolist()):
+            document = {
+                "item_id": item_id,
+                "period": bucket.period,
+                "start": bucket.start,
+                "snapshots": bucket.snapshots,
+                "min_price": int(bucket.min_price[row]),
+                "avg_price": float(bucket.avg_price[row]),
+                "quantity": float(bucket.quantity[row]),
+            }
+            document.update(zip(names, (int(round(price)) for price in bucket.quantiles[row].tolist())))
+            documents.append(document)
+        return documents
+
+    def _load(self):
+        with np.load(self.state_path) as state:
+            if "last_timestamp" in state:
+                self.last_timestamp = datetime.datetime.fromtimestamp(float(state["last_timestamp"]),
+                                                                      datetime.timezone.utc)
+            for period in self.periods:
+                if f"{period}_start" not in state:
+                    continue
+                bucket = PriceAccumulator(
+                    datetime.datetime.fromtimestamp(float(state[f"{period}_start"]), datetime.timezone.utc),
+                    self.relative_accuracy,
+                )
+                bucket.snapshots = int(state[f"{period}_snapshots"])
+                bucket.item_id = state[f"{period}_item_id"]
+                bucket.min_price = state[f"{period}_min_price"]
+                bucket.price_volume = state[f"{period}_price_volume"]
+                bucket.quantity = state[f"{period}_quantity"]
+                bucket.sketch = PriceSketch(state[f"{period}_sketch_key"], state[f"{period}_sketch_weight"],
+                                            self.relative_accuracy)
+                self.buckets[period] = bucket
+        logger.debug(f"Loaded {len(self.buckets)} open price buckets from {self.state_path}")
+
+    def _save(self):
+        arrays = {"last_timestamp": self.last_timestamp.timestamp()} if self.last_timestamp is not None else {}
+        for period, bucket in self.buckets.items():
+            arrays.update({
+                f"{period}_start": bucket.start.timestamp(),
+                f"{period}_snapshots": bucket.snapshots,
+                f"{period}_item_id": bucket.item_id,
+                f"{period}_min_price": bucket.min_price,
+                f"{period}_price_volume": bucket.price_volume,
+                f"{period}_quantity": bucket.quantity,
+                f"{period}_sketch_key": bucket.sketch.key,
+                f"{period}_sketch_weight": bucket.sketch.weight,
+            })
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, self.state_path)
+
+
+# Unique key of price_history before documents carried a region
+LEGACY_PRICE_HISTORY_INDEX = "item_id_1_period_1_start_1"
+
+
+def ensure_price_history_indexes(collection, legacy_region="us"):
+    """
+    Create the region-scoped unique index of a price history collection.
+
+    Databases written before price series were kept per region have a unique
+    (item_id, period, start) index and documents without a region, which
+    would make a second region's upserts fail with duplicate key errors. That
+    index is dropped and those documents are assigned to legacy_region first.
+
+    Args:
+        collection (pymongo.collection.Collection): The price history collection.
+        legacy_region (str, optional): Region of documents written without one. Defaults to "us",
+            the only region ah_scan.py used to scan.
+    """
+    if LEGACY_PRICE_HISTORY_INDEX in collection.index_information():
+        collection.drop_index(LEGACY_PRICE_HISTORY_INDEX)
+        logger.info(f"Dropped legacy index {LEGACY_PRICE_HISTORY_INDEX} from {collection.name}")
+    result = collection.update_many({"region": {"$exists": False}}, {"$set": {"region": legacy_region}})
+    if result.modified_count:
+        logger.info(f"Assigned {result.modified_count} price series in {collection.name} to region {legacy_region}")
+    collection.create_index([("region", 1), ("item_id", 1), ("period", 1), ("start", 1)], unique=True)
+
+
+def write_price_history(collection, aggregator, snapshot, region):
+    """
+    Fold a snapshot into an aggregator and upsert the updated price series.
+
+    The aggregator's state is committed only after every bucket has been
+    written, so a failed write is retried with the next delivery of the
+    snapshot instead of being lost or counted twice.
+
+    Args:
+        collection (pymongo.collection.Collection): The price history collection.
+        aggregator (PriceAggregator): The region's aggregator.
+        snapshot (CommoditySnapshot): The snapshot, stamped with its Last-Modified time.
+        region (str): Region stored on, and part of the key of, every document.
+
+    Returns:
+        list[PriceBucket]: The buckets written.
+    """
+    buckets = aggregator.update(snapshot)
+    for bucket in buckets:
+        documents = aggregator.to_documents(bucket)
+        if documents:
+            collection.bulk_write(
+                [UpdateOne({"region": region, "item_id": doc["item_id"], "period": doc["period"],
+                            "start": doc["start"]},
+                           {"$set": {"region": region, **doc}}, upsert=True) for doc in documents],
+                ordered=False,
+            )
+        logger.info(f"{region}: updated {len(documents)} {bucket.period} price series from {bucket.start}")
+    aggregator.commit()
+    return buckets
@@ -0,0 +1,290 @@
+import datetime
+import logging
+import mmap
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from .snapshot import CommoditySnapshot
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+MAGIC = b"WOWSNAP\x00"
+VERSION = 1
+SUFFIX = ".wsnap"
+
+# magic, version, timestamp, rows, chunk_rows, items
+HEADER = struct.Struct("<8sHxxxxxxdQII")
+
+# Stored columns and their on-disk types; item_id is implied by the item index
+COLUMNS = (
+    ("auction_id", np.dtype("<i8")),
+    ("quantity", np.dtype("<i4")),
+    ("unit_price", np.dtype("<i8")),
+    ("time_left", np.dtype("u1")),
+)
+
+
+def _padded(size):
+    return (size + 7) & ~7
+
+
+def _shuffle(values):
+    # Group the n-th byte of every value together; zlib then sees long runs of
+    # the mostly zero high bytes of small integers
+    return values.view(np.uint8).reshape(-1, values.dtype.itemsize).T.tobytes()
+
+
+def _unshuffle(data, dtype, count):
+    return np.frombuffer(data, dtype=np.uint8).reshape(dtype.itemsize, count).T.copy().view(dtype).ravel()
+
+
+def write_snapshot(snapshot, path, chunk_rows=4096, level=6):
+    """
+    Write a snapshot as a compressed, columnar archive file.
+
+    The file starts with a fixed header, followed by the uncompressed item
+    index (sorted item IDs and each item's first row) and a table locating
+    every compressed block. Rows are stored in the snapshot's item/price
+    order, in chunks of chunk_rows rows; each column of a chunk is one
+    byte-shuffled, zlib-compressed block of fixed-width values.
+
+    Args:
+        snapshot (CommoditySnapshot): The snapshot to write.
+        path (str): Destination file. It is replaced atomically.
+        chunk_rows (int, optional): Rows per compressed chunk. Smaller chunks make single-item
+            reads cheaper at some cost in compression. Defaults to 4096.
+        level (int, optional): zlib compression level. Defaults to 6.
+
+    Returns:
+        int: Size of the written file in bytes.
+    """
+    item_ids, starts, _ = snapshot._group_bounds()
+    rows = len(snapshot)
+    chunks = (rows + chunk_rows - 1) // chunk_rows
+    row_offsets = np.append(starts, rows).astype("<i8")
+
+    blocks = []
+    for chunk in range(chunks):
+        rows_slice = slice(chunk * chunk_rows, (chunk + 1) * chunk_rows)
+        for name, dtype in COLUMNS:
+            values = np.ascontiguousarray(getattr(snapshot, name)[rows_slice], dtype=dtype)
+            blocks.append(zlib.compress(_shuffle(values), level))
+
+    index_offset = _padded(HEADER.size)
+    offsets_offset = index_offset + _padded(4 * len(item_ids))
+    table_offset = offsets_offset + 8 * len(row_offsets)
+    data_offset = table_offset + 16 * len(blocks)
+    table = np.empty((len(blocks), 2), dtype="<u8")
+    position = data_offset
+    for i, block in enumerate(blocks):
+        table[i] = (position, len(block))
+        position += len(block)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, snapshot.timestamp.timestamp(), rows, chunk_rows, len(item_ids)))
+        f.write(b"\x00" * (index_offset - HEADER.size))
+        f.write(np.ascontiguousarray(item_ids, dtype="<i4").tobytes())
+        f.write(b"\x00" * (offsets_offset - index_offset - 4 * len(item_ids)))
+        f.write(row_offsets.tobytes())
+        f.write(table.tobytes())
+        for block in blocks:
+            f.write(block)
+    os.replace(tmp_path, path)
+    logger.debug(f"Archived snapshot with {rows} auctions to {path} ({position} bytes, "
+                 f"{snapshot.nbytes} bytes in memory)")
+    return position
+
+
+class SnapshotReader:
+    """
+    Memory-mapped reader for a snapshot archive file.
+
+    Opening a file only maps it and reads the header, item index and block
+    table; column data is decompressed on demand, chunk by chunk, so reading
+    one item touches only the few chunks holding its rows.
+
+    Example:
+        with SnapshotReader(path) as reader:
+            wax = reader.read_item(222417)
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the SnapshotReader instance.
+
+        Args:
+            path (str): The archive file.
+
+        Raises:
+            ValueError: If the file is not a snapshot archive.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, timestamp, rows, chunk_rows, items = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a version {VERSION} snapshot archive")
+        self.timestamp = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+        self.rows = rows
+        self.chunk_rows = chunk_rows
+        index_offset = _padded(HEADER.size)
+        offsets_offset = index_offset + _padded(4 * items)
+        table_offset = offsets_offset + 8 * (items + 1)
+        chunks = (rows + chunk_rows - 1) // chunk_rows
+        # The index is small, so it is copied out of the map rather than held as a view
+        self.item_ids = np.frombuffer(self._mmap, dtype="<i4", count=items, offset=index_offset).copy()
+        self._row_offsets = np.frombuffer(self._mmap, dtype="<i8", count=items + 1, offset=offsets_offset).copy()
+        self._table = np.frombuffer(self._mmap, dtype="<u8", count=2 * chunks * len(COLUMNS),
+                                    offset=table_offset).reshape(chunks, len(COLUMNS), 2).copy()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.rows
+
+    def close(self):
+        self._mmap.close()
+
+    def _chunk_column(self, chunk, column):
+        offset, length = (int(v) for v in self._table[chunk, column])
+        count = min(self.chunk_rows, self.rows - chunk * self.chunk_rows)
+        return _unshuffle(zlib.decompress(self._mmap[offset:offset + length]), COLUMNS[column][1], count)
+
+    def _read_rows(self, start, end):
+        """
+        Decode the rows start:end, decompressing only the chunks that hold them.
+
+        Returns:
+            CommoditySnapshot: The rows, with the archive's timestamp.
+        """
+        first, last = start // self.chunk_rows, max(end - 1, start) // self.chunk_rows
+        columns = {}
+        for column, (name, dtype) in enumerate(COLUMNS):
+            if end <= start:
+                columns[name] = np.empty(0, dtype=dtype)
+                continue
+            values = np.concatenate([self._chunk_column(chunk, column) for chunk in range(first, last + 1)])
+            columns[name] = values[start - first * self.chunk_rows:end - first * self.chunk_rows]
+        lo, hi = np.searchsorted(self._row_offsets[:-1], [start, end], side="right") - 1
+        counts = np.diff(np.clip(self._row_offsets[lo:hi + 2], start, end))
+        item_id = np.repeat(self.item_ids[lo:hi + 1], counts) if end > start else np.empty(0, dtype=np.int32)
+        return CommoditySnapshot(columns["auction_id"], item_id, columns["quantity"], columns["unit_price"],
+                                 columns["time_left"], timestamp=self.timestamp)
+
+    def read(self):
+        """
+        Decode the whole snapshot.
+
+        Returns:
+            CommoditySnapshot: The snapshot.
+        """
+        return self._read_rows(0, self.rows)
+
+    def read_item(self, item_id):
+        """
+        Decode the auctions of one item.
+
+        Args:
+            item_id (int): The item ID.
+
+        Returns:
+            CommoditySnapshot: The item's auctions; empty if it was not listed.
+        """
+        position = np.searchsorted(self.item_ids, item_id)
+        if position == len(self.item_ids) or self.item_ids[position] != item_id:
+            return self._read_rows(0, 0)
+        return self._read_rows(int(self._row_offsets[position]), int(self._row_offsets[position + 1]))
+
+
+class SnapshotArchive:
+    """
+    A directory of snapshot archive files, one per scan, named by timestamp.
+
+    Example:
+        archive = SnapshotArchive("archive/commodities-us")
+        archive.write(snapshot)
+        for item_snapshot in archive.item_history(222417, start=last_week):
+            print(item_snapshot.timestamp, item_snapshot.min_price())
+    """
+
+    def __init__(self, directory, chunk_rows=4096, level=6):
+        """
+        Initialize the SnapshotArchive instance.
+
+        Args:
+            directory (str): Directory holding the archive files.
+            chunk_rows (int, optional): Rows per compressed chunk of new files. Defaults to 4096.
+            level (int, optional): zlib compression level of new files. Defaults to 6.
+        """
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.level = level
+
+    def path_for(self, timestamp):
+        name = timestamp.astimezone(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        return os.path.join(self.directory, f"{name}{SUFFIX}")
+
+    def write(self, snapshot):
+        """
+        Archive a snapshot under its timestamp.
+
+        Args:
+            snapshot (CommoditySnapshot): The snapshot.
+
+        Returns:
+            str: Path of the written file.
+        """
+        path = self.path_for(snapshot.timestamp)
+        size = write_snapshot(snapshot, path, self.chunk_rows, self.level)
+        logger.info(f"Archived {len(snapshot)} auctions to {path} ({size / 1024 / 1024:.1f} MiB)")
+        return path
+
+    def paths(self, start=None, end=None):
+        """
+        List archive files in time order.
+
+        Args:
+            start (datetime, optional): Earliest snapshot time to include. Defaults to None.
+            end (datetime, optional): Latest snapshot time to include. Defaults to None.
+
+        Returns:
+            list[str]: Paths of the matching files.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        low = os.path.basename(self.path_for(start)) if start else ""
+        high = os.path.basename(self.path_for(end)) if end else None
+        names = sorted(name for name in os.listdir(self.directory) if name.endswith(SUFFIX))
+        return [os.path.join(self.directory, name) for name in names
+                if name >= low and (high is None or name <= high)]
+
+    def item_history(self, item_id, start=None, end=None):
+        """
+        Read one item's auctions from every archived snapshot in a time range.
+
+        Args:
+            item_id (int): The item ID.
+            start (datetime, optional): Earliest snapshot time to include. Defaults to None.
+            end (datetime, optional): Latest snapshot time to include. Defaults to None.
+
+        Yields:
+            CommoditySnapshot: The item's auctions in each snapshot, oldest first.
+        """
+        for path in self.paths(start, end):
+            with SnapshotReader(path) as reader:
+                yield reader.read_item(item_id)
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+
+import requests
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+TOKEN_URL = "https://oauth.battle.net/token"
+
+
+class TokenManager:
+    """
+    OAuth client-credentials token manager for the Blizzard API.
+
+    Tokens are requested with BNET_CLIENT_ID/BNET_CLIENT_SECRET, cached with
+    their expiry and renewed refresh_margin seconds before they expire by a
+    background thread, so requests never wait on authentication in steady
+    state. One manager can be shared by several clients, threads and asyncio
+    tasks; concurrent callers that find the token stale trigger a single
+    refresh.
+    """
+
+    def __init__(self, client_id, client_secret, token_url=TOKEN_URL, refresh_margin=300, retry_interval=30,
+                 background=True, timeout=10):
+        """
+        Initialize the TokenManager instance.
+
+        Args:
+            client_id (str): The Battle.net application client ID.
+            client_secret (str): The Battle.net application client secret.
+            token_url (str, optional): The OAuth token endpoint. Defaults to TOKEN_URL.
+            refresh_margin (float, optional): Seconds before expiry to refresh the token. Defaults to 300.
+            retry_interval (float, optional): Seconds between background refresh attempts after a
+                failure. Defaults to 30.
+            background (bool, optional): Refresh proactively on a daemon thread. Defaults to True.
+            timeout (float, optional): Timeout in seconds for token requests. Defaults to 10.
+        """
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token_url = token_url
+        self.refresh_margin = refresh_margin
+        self.retry_interval = retry_interval
+        self.background = background
+        self.timeout = timeout
+        self._token = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        """
+        Create a token manager from BNET_CLIENT_ID and BNET_CLIENT_SECRET.
+
+        Args:
+            **kwargs: Passed on to TokenManager.
+
+        Returns:
+            TokenManager: The manager, or None if the credentials are not set.
+        """
+        client_id = os.getenv("BNET_CLIENT_ID")
+        client_secret = os.getenv("BNET_CLIENT_SECRET")
+        if not client_id or not client_secret:
+            return None
+        return cls(client_id, client_secret, **kwargs)
+
+    def _is_fresh(self):
+        return self._token is not None and time.monotonic() < self._expires_at - self.refresh_margin
+
+    def get_token(self):
+        """
+        Return a valid access token, fetching a new one if needed.
+
+        Returns:
+            str: The access token.
+
+        Raises:
+            requests.HTTPError: If the token request fails.
+        """
+        if not self._is_fresh():
+            with self._lock:
+                if not self._is_fresh():
+                    self._refresh()
+        if self.background and self._thread is None:
+            self._start()
+        return self._token
+
+    async def get_token_async(self):
+        """
+        Return a valid access token without blocking the event loop.
+
+        Returns:
+            str: The access token.
+        """
+        if self._is_fresh():
+            return self._token
+        return await asyncio.to_thread(self.get_token)
+
+    def invalidate(self):
+        """
+        Drop the cached token, e.g. after the API rejected it with 401.
+        """
+        with self._lock:
+            self._expires_at = 0.0
+
+    def _refresh(self):
+        logger.debug(f"Requesting access token from {self.token_url}")
+        response = requests.post(
+            self.token_url,
+            data={"grant_type": "client_credentials"},
+            auth=(self.client_id, self.client_secret),
+            timeout=self.timeout,
+        )
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as e:
+            logger.error(f"Access token request failed. Error: {str(e)}")
+            raise
+        data = response.json()
+        self._token = data["access_token"]
+        self._expires_at = time.monotonic() + data.get("expires_in", 86400)
+        logger.info(f"Access token refreshed, expires in {data.get('expires_in', 86400)}s")
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._refresh_periodically, daemon=True)
+                self._thread.start()
+
+    def _refresh_periodically(self):
+        wait = max(0.0, self._expires_at - self.refresh_margin - time.monotonic())
+        while not self._stopped.wait(wait):
+            try:
+                with self._lock:
+                    self._refresh()
+                wait = max(0.0, self._expires_at - self.refresh_margin - time.monotonic())
+            except Exception as e:
+                logger.warning(f"Background token refresh failed, retrying in {self.retry_interval}s: {str(e)}")
+                wait = self.retry_interval
+
+    def close(self):
+        """
+        Stop the background refresh thread.
+        """
+        self._stopped.set()
@@ -0,0 +1,70 @@
+import logging
+import os
+import time
+
+from .auth import TokenManager
+from .rate_limit import RateLimiter
+from .retry import CircuitBreakerRegistry, RetryPolicy
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class BaseClient:
+    """
+    Configuration and bookkeeping shared by WoWAPI and AsyncWoWAPI.
+
+    Holds the access token source, the request pacing and retry policies, the
+    caches and the metrics collector; the subclasses add the HTTP transport
+    and the endpoint methods.
+    """
+
+    def __init__(self, region="us", rate_limiter=None, retry_policy=None, circuit_breakers=None,
+                 wait_on_open_circuit=True, response_cache=None, memo_cache=None, token_manager=None, metrics=None):
+        """
+        Initialize the shared client state. See WoWAPI for the arguments.
+        """
+        self.token_manager = token_manager if token_manager is not None else TokenManager.from_env()
+        self._static_token = self._get_access_token() if self.token_manager is None else None
+        self.metrics = metrics
+        self.region = region
+        self.base_url = f"https://{region}.api.blizzard.com"
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breakers = circuit_breakers if circuit_breakers is not None else CircuitBreakerRegistry()
+        self.wait_on_open_circuit = wait_on_open_circuit
+        self.response_cache = response_cache
+        self.memo_cache = memo_cache
+
+    def _get_access_token(self):
+        """
+        Retrieve the Blizzard API access token from environment variables.
+
+        Returns:
+            str: The access token.
+
+        Raises:
+            Exception: If the access token is not found in environment variables.
+        """
+        token = os.getenv("BNET_ACCESS_TOKEN")
+        if not token:
+            logger.error("Blizzard API access token not found in environment variables.")
+            raise Exception("Blizzard API access token not found in environment variables.")
+        logger.debug("Access token retrieved successfully")
+        return token
+
+    def _is_memoized(self, endpoint, namespace=None, locale="en_US"):
+        if self.memo_cache is None:
+            return False
+        return self.memo_cache.peek(endpoint, {"namespace": namespace or f"static-{self.region}", "locale": locale})
+
+    def _record_request(self, endpoint, status, started, size=0, attempt=0, error=None, headers=None):
+        if self.metrics is not None:
+            self.metrics.record_request(self.region, endpoint, status, time.perf_counter() - started, size, attempt,
+                                        error, headers)
+
+    def _record_cache(self, endpoint, result):
+        if self.metrics is not None and (self.memo_cache is not None or self.response_cache is not None):
+            self.metrics.record_cache(self.region, endpoint, result)
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+BatchResult = namedtuple("BatchResult", ["id", "data", "error"])
+BatchResult.__doc__ = """
+The outcome of one lookup in a batch: data is set on success, error holds the
+raised exception on failure.
+"""
+
+
+def unique_ids(ids):
+    """
+    Drop duplicate and empty IDs while keeping their first-seen order.
+
+    Args:
+        ids (Iterable): The requested IDs.
+
+    Returns:
+        list: The distinct IDs.
+    """
+    return list(dict.fromkeys(i for i in ids if i is not None))
+
+
+def fetch_many(fetch, ids, max_workers=16, is_cached=None):
+    """
+    Fetch many resources concurrently on a thread pool.
+
+    Cached IDs are resolved first on the calling thread; the rest are fanned out
+    to the pool and yielded in completion order. A failing ID produces a result
+    carrying its exception instead of aborting the batch.
+
+    Args:
+        fetch (Callable): Function fetching a single resource by ID.
+        ids (Iterable): IDs to fetch. Duplicates are fetched once.
+        max_workers (int, optional): Number of concurrent requests. Defaults to 16.
+        is_cached (Callable, optional): Predicate telling whether an ID can be served from cache.
+
+    Yields:
+        BatchResult: One result per distinct ID.
+    """
+    pending = []
+    for resource_id in unique_ids(ids):
+        if is_cached is not None and is_cached(resource_id):
+            yield _call(fetch, resource_id)
+        else:
+            pending.append(resource_id)
+    if not pending:
+        return
+    logger.debug(f"Fetching {len(pending)} resources with {max_workers} workers")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_call, fetch, resource_id) for resource_id in pending]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def _call(fetch, resource_id):
+    try:
+        return BatchResult(resource_id, fetch(resource_id), None)
+    except Exception as e:
+        logger.warning(f"Batch lookup failed for ID {resource_id}: {str(e)}")
+        return BatchResult(resource_id, None, e)
+
+
+async def fetch_many_async(fetch, ids, is_cached=None):
+    """
+    Fetch many resources concurrently on the running event loop.
+
+    Concurrency is bounded by the client's semaphore and rate limiter, so every
+    uncached ID is scheduled at once and yielded in completion order.
+
+    Args:
+        fetch (Callable): Coroutine function fetching a single resource by ID.
+        ids (Iterable): IDs to fetch. Duplicates are fetched once.
+        is_cached (Callable, optional): Predicate telling whether an ID can be served from cache.
+
+    Yields:
+        BatchResult: One result per distinct ID.
+    """
+    pending = []
+    for resource_id in unique_ids(ids):
+        if is_cached is not None and is_cached(resource_id):
+            yield await _call_async(fetch, resource_id)
+        else:
+            pending.append(resource_id)
+    tasks = [asyncio.ensure_future(_call_async(fetch, resource_id)) for resource_id in pending]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _call_async(fetch, resource_id):
+    try:
+        return BatchResult(resource_id, await fetch(resource_id), None)
+    except Exception as e:
+        logger.warning(f"Batch lookup failed for ID {resource_id}: {str(e)}")
+        return BatchResult(resource_id, None, e)
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# The item search endpoint returns at most 1000 results per query
+MAX_SEARCH_PAGE_SIZE = 1000
+
+
+class CatalogSyncStats:
+    """
+    Counters collected while a catalog sync runs.
+    """
+
+    def __init__(self):
+        self.ranges = 0
+        self.changed_ranges = 0
+        self.items = 0
+        self.written = 0
+        self.failed = []
+
+    def __repr__(self):
+        return (f"CatalogSyncStats(ranges={self.ranges}, changed_ranges={self.changed_ranges}, "
+                f"items={self.items}, written={self.written}, failed={len(self.failed)})")
+
+
+class ItemCatalogSync:
+    """
+    Mirror the full static item catalog by sweeping the item search endpoint.
+
+    The ID space is split into fixed ranges (id=[a,b], orderby=id) that are
+    searched concurrently, replacing one get_item_data call per item with one
+    paged search per range. A digest of each range's content is kept in a
+    small JSON state file; on later runs ranges whose digest is unchanged are
+    not written again. Combined with a ResponseCache on the client, unchanged
+    ranges are also revalidated with cheap conditional requests instead of
+    being downloaded again.
+
+    The sweep covers IDs up to max_item_id and then keeps extending, a wave
+    of tail_ranges at a time, until a whole wave comes back empty.
+
+    A range's digest is only saved once its items are known to be written:
+    with a buffering sink, pass confirm (e.g. BulkWriter.confirm) so pending
+    writes are flushed before every save, and ranges with rejected items are
+    searched and written again on the next run.
+    """
+
+    def __init__(self, api, sink, state_path, range_size=MAX_SEARCH_PAGE_SIZE, max_item_id=250000, workers=8,
+                 tail_ranges=10, confirm=None):
+        """
+        Initialize the ItemCatalogSync instance.
+
+        Args:
+            api (WoWAPI): The client used for the searches.
+            sink (Callable): Called with the list of item documents of each changed range.
+            state_path (str): File holding the per-range content digests.
+            range_size (int, optional): Item IDs per range. Defaults to 1000, the search result limit.
+            max_item_id (int, optional): Highest ID expected in the catalog. Defaults to 250000.
+            workers (int, optional): Number of ranges searched concurrently. Defaults to 8.
+            tail_ranges (int, optional): Ranges per wave searched beyond max_item_id. Defaults to 10.
+            confirm (Callable, optional): Called with the IDs of items passed to sink before their
+                ranges' digests are saved; returns the IDs that were not written. Defaults to None,
+                for sinks that write synchronously.
+        """
+        self.api = api
+        self.sink = sink
+        self.state_path = state_path
+        self.range_size = range_size
+        self.max_item_id = max_item_id
+        self.workers = workers
+        self.tail_ranges = tail_ranges
+        self.confirm = confirm
+        self.digests = {}
+        self._pending = {}
+        if os.path.exists(state_path):
+            with open(state_path) as f:
+                self.digests = json.load(f)
+
+    def run(self, full=False):
+        """
+        Sweep the item catalog and write every range whose content changed.
+
+        Args:
+            full (bool, optional): Write every range, ignoring stored digests. Defaults to False.
+
+        Returns:
+            CatalogSyncStats: Range and item counters, and (range_start, exception) failures.
+        """
+        stats = CatalogSyncStats()
+        starts = range(1, self.max_item_id + 1, self.range_size)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            found = self._sweep(executor, starts, stats, full)
+            next_start = starts[-1] + self.range_size
+            while found:
+                wave = range(next_start, next_start + self.tail_ranges * self.range_size, self.range_size)
+                found = self._sweep(executor, wave, stats, full)
+                next_start = wave[-1] + self.range_size
+        self._checkpoint(stats)
+        logger.info(f"Item catalog sync finished: {stats}")
+        return stats
+
+    def _sweep(self, executor, starts, stats, full):
+        """
+        Search a set of ranges concurrently and write the changed ones.
+
+        Returns:
+            bool: True if any of the last tail_ranges ranges contained items.
+        """
+        futures = {executor.submit(self._fetch_range, start): start for start in starts}
+        tail = set(starts[-self.tail_ranges:])
+        found_in_tail = False
+        for future in as_completed(futures):
+            start = futures[future]
+            stats.ranges += 1
+            try:
+                items = future.result()
+            except Exception as e:
+                logger.error(f"Item search failed for range starting at {start}: {str(e)}")
+                stats.failed.append((start, e))
+                continue
+            stats.items += len(items)
+            if items and start in tail:
+                found_in_tail = True
+            digest = hashlib.sha1(json.dumps(items, sort_keys=True).encode()).hexdigest()
+            if not full and self.digests.get(str(start)) == digest:
+                continue
+            stats.changed_ranges += 1
+            if items:
+                self.sink(items)
+                stats.written += len(items)
+            self._pending[str(start)] = (digest, [item["id"] for item in items])
+            if stats.changed_ranges % 50 == 0:
+                self._checkpoint(stats)
+        return found_in_tail
+
+    def _checkpoint(self, stats):
+        """
+        Confirm the writes of the ranges changed since the last checkpoint and save their digests.
+
+        Raises:
+            Exception: Whatever confirm raises; the pending digests are then not saved.
+        """
+        failed = set()
+        if self.confirm is not None and self._pending:
+            failed = set(self.confirm([item_id for _, item_ids in self._pending.values() for item_id in item_ids]))
+        for start, (digest, item_ids) in self._pending.items():
+            unwritten = failed.intersection(item_ids)
+            if unwritten:
+                logger.error(f"{len(unwritten)} items in range starting at {start} were not written")
+                stats.failed.append((int(start), Exception(f"{len(unwritten)} items were not written")))
+                continue
+            self.digests[start] = digest
+        self._pending.clear()
+        self._save()
+
+    def _fetch_range(self, start):
+        end = start + self.range_size - 1
+        results = self.api.iter_search_items(filters={"id": f"[{start},{end}]"}, orderby="id",
+                                             page_size=min(self.range_size, MAX_SEARCH_PAGE_SIZE), prefetch=0)
+        items = [result["data"] for result in results]
+        logger.debug(f"Item range [{start},{end}] returned {len(items)} items")
+        return items
+
+    def _save(self):
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.digests, f)
+        os.replace(tmp_path, self.state_path)
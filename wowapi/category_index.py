@@ -0,0 +1,109 @@
+import logging
+import threading
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class CategoryIndex:
+    """
+    An in-memory index of modified crafting category ID -> item IDs.
+
+    The index is built once from the stored items with a single projected
+    query and kept current by calling add() whenever an item is stored, so
+    category lookups no longer need a count_documents per category. Categories
+    that could not be resolved are tracked alongside it. The MongoDB indexes
+    backing these queries are created on build.
+    """
+
+    def __init__(self, item_collection, missed_collection=None):
+        """
+        Initialize the CategoryIndex instance.
+
+        Args:
+            item_collection (pymongo.collection.Collection): Collection of stored items.
+            missed_collection (pymongo.collection.Collection, optional): Collection recording
+                categories no items were found for. Defaults to None.
+        """
+        self.item_collection = item_collection
+        self.missed_collection = missed_collection
+        self._items = {}
+        self._missed = set()
+        self._lock = threading.Lock()
+
+    def ensure_indexes(self):
+        self.item_collection.create_index("id")
+        self.item_collection.create_index("modified_crafting.category.id")
+        if self.missed_collection is not None:
+            self.missed_collection.create_index("category_id")
+
+    def build(self):
+        """
+        Create the MongoDB indexes and load the category mapping from stored items.
+
+        Returns:
+            CategoryIndex: This index, for chaining.
+        """
+        self.ensure_indexes()
+        items = {}
+        cursor = self.item_collection.find(
+            {"modified_crafting.category.id": {"$exists": True}},
+            {"_id": 0, "id": 1, "modified_crafting.category.id": 1},
+        )
+        for item in cursor:
+            items.setdefault(item["modified_crafting"]["category"]["id"], set()).add(item["id"])
+        missed = set()
+        if self.missed_collection is not None:
+            missed = set(self.missed_collection.distinct("category_id"))
+        with self._lock:
+            self._items = items
+            self._missed = missed
+        logger.info(f"Category index built: {len(items)} categories, {len(missed)} missed")
+        return self
+
+    def add(self, item):
+        """
+        Record a stored item under its modified crafting category, if it has one.
+
+        Args:
+            item (dict): The item document.
+        """
+        category_id = item.get("modified_crafting", {}).get("category", {}).get("id")
+        if category_id is None:
+            return
+        with self._lock:
+            self._items.setdefault(category_id, set()).add(item["id"])
+
+    def items_for(self, category_id):
+        """
+        Look up the stored items of a category.
+
+        Args:
+            category_id (int): The modified crafting category ID.
+
+        Returns:
+            set: IDs of stored items in the category.
+        """
+        with self._lock:
+            return set(self._items.get(category_id, ()))
+
+    def is_missed(self, category_id):
+        with self._lock:
+            return category_id in self._missed
+
+    def mark_missed(self, category_id, **details):
+        """
+        Record a category that no items could be found for.
+
+        Args:
+            category_id (int): The modified crafting category ID.
+            **details: Extra fields stored with the record, e.g. category_name.
+        """
+        with self._lock:
+            if category_id in self._missed:
+                return
+            self._missed.add(category_id)
+        if self.missed_collection is not None:
+            self.missed_collection.insert_one({"category_id": category_id, **details})
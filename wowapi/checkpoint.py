@@ -0,0 +1,133 @@
+import json
+import logging
+import os
+import threading
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class Checkpoint:
+    """
+    Persistent progress for a resumable scrape job.
+
+    Records which work units completed, which failed (with their error) and an
+    optional cursor such as the last processed document ID, in a small JSON
+    file. A rerun skips completed units, resumes after the cursor and retries
+    only the failures. Units are compared by their string form, so IDs stay
+    stable across the JSON round trip.
+
+    Example:
+        checkpoint = Checkpoint(".cache/checkpoints/recipes.json")
+        for recipe_id in checkpoint.pending(recipe_ids):
+            ...
+            checkpoint.mark_done(recipe_id)
+        checkpoint.finish()
+    """
+
+    def __init__(self, path, save_every=100):
+        """
+        Initialize the Checkpoint instance, loading any saved progress.
+
+        Args:
+            path (str): Location of the checkpoint file.
+            save_every (int, optional): Save after this many recorded units. Defaults to 100.
+        """
+        self.path = path
+        self.save_every = save_every
+        self.completed = set()
+        self.failed = {}
+        self.cursor = None
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+            self.completed = set(state.get("completed", []))
+            self.failed = state.get("failed", {})
+            self.cursor = state.get("cursor")
+            logger.info(f"Resuming from checkpoint {path}: {len(self.completed)} completed, "
+                        f"{len(self.failed)} failed, cursor={self.cursor}")
+
+    def is_done(self, unit):
+        return str(unit) in self.completed
+
+    def pending(self, units):
+        """
+        Filter out units that already completed.
+
+        Args:
+            units (Iterable): The work units of the job.
+
+        Yields:
+            The units still to be processed, including previous failures.
+        """
+        for unit in units:
+            if not self.is_done(unit):
+                yield unit
+
+    def mark_done(self, *units):
+        with self._lock:
+            for unit in units:
+                key = str(unit)
+                self.completed.add(key)
+                self.failed.pop(key, None)
+            self._record(len(units))
+
+    def mark_failed(self, unit, error):
+        with self._lock:
+            self.failed[str(unit)] = str(error)
+            self._record(1)
+
+    def set_cursor(self, cursor):
+        """
+        Record the position reached and save immediately.
+
+        Args:
+            cursor: A JSON-serializable position, e.g. the last processed document ID as a string.
+        """
+        with self._lock:
+            self.cursor = cursor
+            self._save()
+
+    def _record(self, count):
+        self._unsaved += count
+        if self._unsaved >= self.save_every:
+            self._save()
+
+    def save(self):
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"completed": sorted(self.completed), "failed": self.failed, "cursor": self.cursor}, f)
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
+
+    def finish(self):
+        """
+        End the run: remove the checkpoint if nothing failed, otherwise keep it so
+        the next run only retries the failures.
+
+        Returns:
+            bool: True if the job completed without failures.
+        """
+        with self._lock:
+            if self.failed:
+                self._save()
+                logger.warning(f"Job finished with {len(self.failed)} failures, checkpoint kept at {self.path}")
+                return False
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.completed.clear()
+            self.cursor = None
+            self._unsaved = 0
+        logger.info(f"Job finished, checkpoint {self.path} cleared")
+        return True
@@ -0,0 +1,178 @@
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class CrawlStats:
+    """
+    Per-entity counters collected while a crawl runs.
+    """
+
+    def __init__(self):
+        self.fetched = {}
+        self.skipped = {}
+        self.failed = []
+        self._lock = threading.Lock()
+
+    def _count(self, counter, kind):
+        with self._lock:
+            counter[kind] = counter.get(kind, 0) + 1
+
+    def __repr__(self):
+        return f"CrawlStats(fetched={self.fetched}, skipped={self.skipped}, failed={len(self.failed)})"
+
+
+class CatalogCrawler:
+    """
+    A concurrent crawler over the crafting catalog's dependency graph.
+
+    The catalog is treated as a graph: the profession index links to
+    professions, professions to skill tiers, skill tiers to recipes, and
+    recipes to their reagent items and modified crafting slot types. Each node
+    is fetched on a thread pool, and as soon as it resolves its children are
+    enqueued, so recipes start downloading while other professions are still
+    in flight. Every node is fetched at most once per crawl.
+
+    Fetched documents are handed to per-entity sinks, for example
+    BulkWriter.add. Recipe documents get "profession" and "category" fields
+    from the skill tier they were found in, matching recipe_scraper.
+
+    Example:
+        crawler = CatalogCrawler(api, sinks={"recipe": recipe_writer.add, "item": item_writer.add},
+                                 skill_tier_filter=lambda tier: "Khaz Algar" in tier["name"])
+        stats = crawler.run()
+    """
+
+    PROFESSION_INDEX = "profession_index"
+    PROFESSION = "profession"
+    SKILL_TIER = "skill_tier"
+    RECIPE = "recipe"
+    ITEM = "item"
+    SLOT_TYPE = "slot_type"
+
+    def __init__(self, api, sinks=None, is_known=None, skill_tier_filter=None, workers=16):
+        """
+        Initialize the CatalogCrawler instance.
+
+        Args:
+            api (WoWAPI): The client used to fetch every node.
+            sinks (dict, optional): Maps an entity kind ("skill_tier", "recipe", "item", "slot_type")
+                to a callable receiving each fetched document. Defaults to None.
+            is_known (dict, optional): Maps an entity kind to a predicate on its ID; known leaf
+                entities (items and slot types) are not fetched again. Defaults to None.
+            skill_tier_filter (Callable, optional): Predicate on a profession's skill tier
+                reference; only matching tiers are crawled. Defaults to crawling every tier.
+            workers (int, optional): Number of concurrent requests. Defaults to 16.
+        """
+        self.api = api
+        self.sinks = sinks or {}
+        self.is_known = is_known or {}
+        self.skill_tier_filter = skill_tier_filter
+        self.workers = workers
+        self._handlers = {
+            self.PROFESSION_INDEX: self._crawl_profession_index,
+            self.PROFESSION: self._crawl_profession,
+            self.SKILL_TIER: self._crawl_skill_tier,
+            self.RECIPE: self._crawl_recipe,
+            self.ITEM: self._crawl_item,
+            self.SLOT_TYPE: self._crawl_slot_type,
+        }
+
+    def run(self, roots=None):
+        """
+        Crawl the graph from the given roots until no new nodes are discovered.
+
+        Args:
+            roots (Iterable[tuple], optional): Starting nodes as (kind, key, context) tuples.
+                Defaults to the profession index.
+
+        Returns:
+            CrawlStats: Fetched and skipped counts per kind, and (node, exception) failures.
+        """
+        stats = CrawlStats()
+        seen = set()
+        futures = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            def enqueue(node):
+                kind, key, _ = node
+                if (kind, key) in seen:
+                    return
+                seen.add((kind, key))
+                known = self.is_known.get(kind)
+                if known is not None and known(key):
+                    stats._count(stats.skipped, kind)
+                    return
+                futures[executor.submit(self._handlers[kind], key, node[2])] = node
+
+            for node in roots or [(self.PROFESSION_INDEX, None, None)]:
+                enqueue(node)
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = futures.pop(future)
+                    try:
+                        children = future.result()
+                    except Exception as e:
+                        logger.error(f"Crawl failed for {node[0]} {node[1]}: {str(e)}")
+                        stats.failed.append((node, e))
+                        continue
+                    stats._count(stats.fetched, node[0])
+                    for child in children:
+                        enqueue(child)
+
+        logger.info(f"Crawl finished: {stats}")
+        return stats
+
+    def _sink(self, kind, document):
+        sink = self.sinks.get(kind)
+        if sink is not None:
+            sink(document)
+
+    def _crawl_profession_index(self, _, __):
+        index = self.api.get_professions_index()
+        return [(self.PROFESSION, profession["id"], None) for profession in index.get("professions", [])]
+
+    def _crawl_profession(self, profession_id, _):
+        profession = self.api.get_profession(profession_id)
+        tiers = [tier for tier in profession.get("skill_tiers", [])
+                 if self.skill_tier_filter is None or self.skill_tier_filter(tier)]
+        return [(self.SKILL_TIER, (profession_id, tier["id"]), None) for tier in tiers]
+
+    def _crawl_skill_tier(self, key, _):
+        profession_id, skill_tier_id = key
+        skill_tier = self.api.get_profession_skill_tier(profession_id, skill_tier_id)
+        self._sink(self.SKILL_TIER, skill_tier)
+        profession_name = skill_tier.get("name", "Unknown Profession")
+        children = []
+        for category in skill_tier.get("categories", []):
+            context = {"profession": profession_name, "category": category.get("name", "Unknown Category")}
+            children.extend((self.RECIPE, recipe["id"], context) for recipe in category.get("recipes", [])
+                            if recipe.get("id"))
+        return children
+
+    def _crawl_recipe(self, recipe_id, context):
+        recipe = self.api.get_recipe(recipe_id)
+        if context:
+            recipe.update(context)
+        self._sink(self.RECIPE, recipe)
+        children = [(self.ITEM, reagent["reagent"]["id"], None) for reagent in recipe.get("reagents", [])
+                    if reagent.get("reagent", {}).get("id")]
+        children.extend((self.SLOT_TYPE, slot["slot_type"]["id"], None)
+                        for slot in recipe.get("modified_crafting_slots", [])
+                        if slot.get("slot_type", {}).get("id"))
+        return children
+
+    def _crawl_item(self, item_id, _):
+        self._sink(self.ITEM, self.api.get_item_data(item_id))
+        return []
+
+    def _crawl_slot_type(self, slot_type_id, _):
+        self._sink(self.SLOT_TYPE, self.api.get_modified_crafting_reagent_slot_type(slot_type_id))
+        return []
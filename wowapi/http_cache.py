@@ -0,0 +1,239 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Seconds a cached response is served without revalidation, by namespace prefix.
+# Static data only changes on game patches; dynamic data is not cached by default.
+DEFAULT_TTLS = {
+    "static": 6 * 3600,
+}
+
+
+class CacheEntry:
+    """
+    A cached API response together with its HTTP validators.
+    """
+
+    def __init__(self, key, etag, last_modified, body, stored_at, ttl):
+        self.key = key
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.stored_at = stored_at
+        self.ttl = ttl
+
+    @property
+    def is_fresh(self):
+        return time.time() - self.stored_at < self.ttl
+
+    def json(self):
+        return json.loads(self.body)
+
+    def conditional_headers(self):
+        """
+        Build the headers that revalidate this entry with the server.
+
+        Returns:
+            dict: If-None-Match and/or If-Modified-Since headers.
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    An on-disk HTTP response cache for the WoW API.
+
+    Responses are keyed by endpoint and query parameters (minus the access
+    token) and stored compressed in SQLite with their ETag and Last-Modified
+    validators. Fresh entries are served without a request; stale ones are
+    revalidated with a conditional request, so an unchanged resource costs a
+    304 instead of a full download. Least recently used entries are evicted
+    once the cache grows past max_size bytes.
+
+    The database runs in WAL mode with synchronous=NORMAL, and cache hits do
+    not write: access times are collected in memory and written in batches
+    of touch_batch, before eviction and on close.
+    """
+
+    def __init__(self, path=os.path.join(".cache", "wowapi-responses.sqlite3"), ttls=None, max_size=512 * 1024 * 1024,
+                 touch_batch=256):
+        """
+        Initialize the ResponseCache instance.
+
+        Args:
+            path (str, optional): Location of the SQLite database. Defaults to ".cache/wowapi-responses.sqlite3".
+            ttls (dict, optional): Seconds to serve entries without revalidation, keyed by namespace
+                prefix (e.g. "static", "dynamic"). Namespaces without a TTL are not cached.
+                Defaults to DEFAULT_TTLS.
+            max_size (int, optional): Maximum total size of stored bodies in bytes. Defaults to 512 MiB.
+            touch_batch (int, optional): Cache hits whose access times are buffered before they are
+                written. Defaults to 256.
+        """
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_size = max_size
+        self.touch_batch = touch_batch
+        self._touched = {}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB, "
+            "size INTEGER, stored_at REAL, accessed_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self._conn.commit()
+        logger.info(f"Response cache opened at {path}")
+
+    @staticmethod
+    def make_key(endpoint, params):
+        """
+        Build the cache key for a request.
+
+        Args:
+            endpoint (str): The API endpoint.
+            params (dict): Query parameters; the access token is ignored.
+
+        Returns:
+            str: The cache key.
+        """
+        items = sorted((k, str(v)) for k, v in params.items() if k != "access_token")
+        query = "&".join(f"{k}={v}" for k, v in items)
+        return f"{endpoint}?{query}"
+
+    def ttl_for(self, namespace):
+        """
+        Look up the TTL for a namespace such as "static-us".
+
+        Args:
+            namespace (str): The namespace of the request.
+
+        Returns:
+            float: TTL in seconds, or None if the namespace is not cached.
+        """
+        if not namespace:
+            return None
+        return self.ttls.get(namespace.split("-", 1)[0])
+
+    def lookup(self, endpoint, params):
+        """
+        Find the cache entry for a request.
+
+        Args:
+            endpoint (str): The API endpoint.
+            params (dict): Query parameters of the request.
+
+        Returns:
+            tuple: (key, entry). key is None when the request's namespace is not cached;
+                entry is None when nothing has been stored yet.
+        """
+        ttl = self.ttl_for(params.get("namespace"))
+        if ttl is None:
+            return None, None
+        key = self.make_key(endpoint, params)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return key, None
+            self._touched[key] = time.time()
+            if len(self._touched) >= self.touch_batch:
+                self._flush_touched()
+                self._conn.commit()
+        etag, last_modified, body, stored_at = row
+        return key, CacheEntry(key, etag, last_modified, zlib.decompress(body), stored_at, ttl)
+
+    def store(self, key, headers, body):
+        """
+        Store a response body with its validators.
+
+        Args:
+            key (str): The cache key returned by lookup.
+            headers (Mapping): The response headers.
+            body (bytes): The raw response body.
+        """
+        compressed = zlib.compress(body)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, headers.get("ETag"), headers.get("Last-Modified"), compressed, len(compressed), now, now),
+            )
+            self._touched.pop(key, None)
+            self._flush_touched()
+            self._evict()
+            self._conn.commit()
+        logger.debug(f"Cached response for {key}")
+
+    def revalidated(self, key, headers=None):
+        """
+        Mark an entry as fresh again after a 304 Not Modified response.
+
+        Args:
+            key (str): The cache key returned by lookup.
+            headers (Mapping, optional): The 304 response headers, which may carry new validators.
+        """
+        headers = headers or {}
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (time.time(), headers.get("ETag"), headers.get("Last-Modified"), key),
+            )
+            self._conn.commit()
+        logger.debug(f"Revalidated cached response for {key}")
+
+    def _flush_touched(self):
+        if not self._touched:
+            return
+        self._conn.executemany("UPDATE responses SET accessed_at = ? WHERE key = ?",
+                               [(accessed_at, key) for key, accessed_at in self._touched.items()])
+        self._touched.clear()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_size:
+            return
+        evicted = 0
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if total <= self.max_size:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.debug(f"Evicted {evicted} cached responses")
+
+    def clear(self):
+        """
+        Remove every cached response.
+        """
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._flush_touched()
+            self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,165 @@
+import datetime
+import logging
+import os
+
+import numpy as np
+from pymongo import UpdateOne
+
+from .snapshot import CommoditySnapshot, SnapshotDiff
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class IncrementalIngestor:
+    """
+    Incremental commodities ingestion based on snapshot diffs.
+
+    Instead of comparing every scan against all auction IDs ever stored, the
+    ingestor keeps only the previous snapshot's columns in a compressed .npz
+    file and diffs the new snapshot against it. Callers write the returned
+    delta and then commit the new snapshot as the baseline for the next scan,
+    so a crash between the two simply replays the same delta.
+
+    Example:
+        ingestor = IncrementalIngestor(".cache/commodities-us.npz")
+        snapshot = CommoditySnapshot.from_auctions(api.stream_ah_commodities())
+        diff = ingestor.diff(snapshot)
+        ...  # write diff.new / diff.removed / diff.changed
+        ingestor.commit(snapshot)
+    """
+
+    def __init__(self, state_path):
+        """
+        Initialize the IncrementalIngestor instance.
+
+        Args:
+            state_path (str): File holding the previous snapshot.
+        """
+        self.state_path = state_path
+        self._previous = None
+
+    @property
+    def previous(self):
+        """
+        The previous snapshot, loaded from disk on first access.
+
+        Returns:
+            CommoditySnapshot: The previous snapshot, or None on the first run.
+        """
+        if self._previous is None and os.path.exists(self.state_path):
+            with np.load(self.state_path) as state:
+                self._previous = CommoditySnapshot(
+                    state["auction_id"], state["item_id"], state["quantity"],
+                    state["unit_price"], state["time_left"],
+                    timestamp=datetime.datetime.fromtimestamp(float(state["timestamp"]), datetime.timezone.utc),
+                )
+            logger.debug(f"Loaded previous snapshot with {len(self._previous)} auctions from {self.state_path}")
+        return self._previous
+
+    def diff(self, snapshot):
+        """
+        Classify the auctions of a new snapshot against the previous one.
+
+        On the first run every auction is reported as new.
+
+        Args:
+            snapshot (CommoditySnapshot): The new snapshot.
+
+        Returns:
+            SnapshotDiff: Auction IDs that are new, removed (sold or expired) or changed.
+        """
+        previous = self.previous
+        if previous is None:
+            empty = np.empty(0, dtype=np.int64)
+            diff = SnapshotDiff(new=np.unique(snapshot.auction_id), removed=empty, changed=empty)
+        else:
+            diff = snapshot.diff(previous)
+        logger.info(f"Snapshot diff: {len(diff.new)} new, {len(diff.removed)} removed, {len(diff.changed)} changed")
+        return diff
+
+    def commit(self, snapshot):
+        """
+        Store a snapshot as the baseline for the next diff.
+
+        Args:
+            snapshot (CommoditySnapshot): The snapshot whose delta has been written.
+        """
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                auction_id=snapshot.auction_id,
+                item_id=snapshot.item_id,
+                quantity=snapshot.quantity,
+                unit_price=snapshot.unit_price,
+                time_left=snapshot.time_left,
+                timestamp=snapshot.timestamp.timestamp(),
+            )
+        os.replace(tmp_path, self.state_path)
+        self._previous = snapshot
+        logger.debug(f"Committed snapshot with {len(snapshot)} auctions to {self.state_path}")
+
+
+def rows_for_auctions(snapshot, auction_ids):
+    """
+    Find the snapshot rows holding the given auction IDs.
+
+    Args:
+        snapshot (CommoditySnapshot): The snapshot to search.
+        auction_ids (array-like): Auction IDs present in the snapshot.
+
+    Returns:
+        numpy.ndarray: Row indices, usable with CommoditySnapshot.to_auctions().
+    """
+    return np.flatnonzero(np.isin(snapshot.auction_id, auction_ids))
+
+
+def write_auction_delta(collection, snapshot, diff, ts, **fields):
+    """
+    Write the delta between two snapshots to an auctions collection.
+
+    New auctions are inserted with $setOnInsert upserts, changed ones get their
+    quantity, price and time left updated, and removed ones are stamped with
+    removed_ts. Every write is idempotent, so replaying a delta after a crash
+    (or on the first incremental run over a populated collection) does not
+    duplicate auctions.
+
+    Args:
+        collection (pymongo.collection.Collection): The auctions collection.
+        snapshot (CommoditySnapshot): The new snapshot.
+        diff (SnapshotDiff): The snapshot's diff against the previous one.
+        ts (datetime): Time stamped on new, changed and removed auctions.
+        **fields: Extra fields identifying the snapshot's auctions, e.g. connected_realm_id;
+            they are part of every filter and stored on new auctions.
+
+    Returns:
+        tuple: Numbers of (new, changed, removed) auctions written.
+    """
+    new_auctions = snapshot.to_auctions(rows_for_auctions(snapshot, diff.new))
+    if new_auctions:
+        collection.bulk_write(
+            [UpdateOne({**fields, "id": auction["id"]}, {"$setOnInsert": {**auction, **fields, "ts": ts}},
+                       upsert=True) for auction in new_auctions],
+            ordered=False,
+        )
+
+    changed_auctions = snapshot.to_auctions(rows_for_auctions(snapshot, diff.changed))
+    if changed_auctions:
+        collection.bulk_write(
+            [UpdateOne({**fields, "id": auction["id"]},
+                       {"$set": {"quantity": auction["quantity"], "unit_price": auction["unit_price"],
+                                 "time_left": auction["time_left"], "updated_ts": ts}})
+             for auction in changed_auctions],
+            ordered=False,
+        )
+
+    if len(diff.removed):
+        collection.update_many({**fields, "id": {"$in": diff.removed.tolist()}, "removed_ts": {"$exists": False}},
+                               {"$set": {"removed_ts": ts}})
+    return len(new_auctions), len(changed_auctions), len(diff.removed)
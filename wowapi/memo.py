@@ -0,0 +1,274 @@
+import asyncio
+import concurrent.futures
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from .retry import endpoint_template
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class MemoCache:
+    """
+    An in-process LRU/TTL cache for decoded API responses.
+
+    Entries are keyed by endpoint and query parameters (minus the access
+    token). Hits and misses are counted per endpoint template, and entries can
+    be invalidated by exact endpoint, by template or all at once. Values are
+    deep-copied on the way in and out so callers that mutate results (for
+    example by inserting them into MongoDB) cannot corrupt the cache.
+
+    get_or_load and get_or_load_async coalesce concurrent misses: while one
+    caller fetches a response, other threads or tasks asking for the same key
+    wait for that fetch instead of issuing their own.
+    """
+
+    def __init__(self, max_entries=10000, ttl=None, namespaces=("static",)):
+        """
+        Initialize the MemoCache instance.
+
+        Args:
+            max_entries (int, optional): Maximum number of cached responses. Defaults to 10000.
+            ttl (float, optional): Seconds before an entry expires. Defaults to None (no expiry).
+            namespaces (Iterable[str], optional): Namespace prefixes eligible for caching.
+                Defaults to ("static",).
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.namespaces = tuple(namespaces)
+        self.hits = {}
+        self.misses = {}
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._loading_async = {}
+        self._lock = threading.Lock()
+
+    def is_cacheable(self, params):
+        namespace = params.get("namespace") or ""
+        return namespace.split("-", 1)[0] in self.namespaces
+
+    @staticmethod
+    def make_key(endpoint, params):
+        return endpoint, tuple(sorted((k, str(v)) for k, v in params.items() if k != "access_token"))
+
+    def get(self, endpoint, params):
+        """
+        Look up a cached response.
+
+        Args:
+            endpoint (str): The API endpoint.
+            params (dict): Query parameters of the request.
+
+        Returns:
+            tuple: (hit, value). value is None on a miss.
+        """
+        key = self.make_key(endpoint, params)
+        with self._lock:
+            entry = self._lookup(key, endpoint_template(endpoint))
+        if entry is None:
+            return False, None
+        return True, copy.deepcopy(entry[1])
+
+    def get_or_load(self, endpoint, params, load):
+        """
+        Look up a cached response, calling load on a miss.
+
+        If another thread is already loading the same key, wait for its result
+        instead of calling load again.
+
+        Args:
+            endpoint (str): The API endpoint.
+            params (dict): Query parameters of the request.
+            load (Callable): Called without arguments to fetch the response on a miss.
+
+        Returns:
+            tuple: (hit, value). hit is False only for the caller that ran load.
+
+        Raises:
+            Exception: Whatever load raised, in the loading thread and every waiting one.
+        """
+        key = self.make_key(endpoint, params)
+        with self._lock:
+            hit, pending = self._claim(key, endpoint_template(endpoint), self._loading, concurrent.futures.Future)
+        if hit:
+            return True, copy.deepcopy(pending)
+        if pending is not None:
+            return True, copy.deepcopy(pending.result())
+
+        pending = self._loading[key]
+        try:
+            value = load()
+        except BaseException as e:
+            self._release(key, self._loading)
+            pending.set_exception(e)
+            raise
+        pending.set_result(self._store(key, value, self._loading))
+        return False, value
+
+    async def get_or_load_async(self, endpoint, params, load):
+        """
+        Look up a cached response, awaiting load() on a miss.
+
+        The asyncio counterpart of get_or_load: tasks asking for a key that
+        another task is already loading await that task's result.
+
+        Args:
+            endpoint (str): The API endpoint.
+            params (dict): Query parameters of the request.
+            load (Callable): Called without arguments to return an awaitable of the response.
+
+        Returns:
+            tuple: (hit, value). hit is False only for the task that ran load.
+
+        Raises:
+            Exception: Whatever load raised, in the loading task and every waiting one.
+        """
+        key = self.make_key(endpoint, params)
+        with self._lock:
+            hit, pending = self._claim(key, endpoint_template(endpoint), self._loading_async,
+                                       asyncio.get_running_loop().create_future)
+        if hit:
+            return True, copy.deepcopy(pending)
+        if pending is not None:
+            # Shield the shared future so a cancelled waiter does not cancel the load for everyone
+            return True, copy.deepcopy(await asyncio.shield(pending))
+
+        pending = self._loading_async[key]
+        try:
+            value = await load()
+        except BaseException as e:
+            self._release(key, self._loading_async)
+            if isinstance(e, asyncio.CancelledError):
+                pending.cancel()
+            else:
+                pending.set_exception(e)
+                # Waiters are not guaranteed to exist; don't log the exception as never retrieved
+                pending.exception()
+            raise
+        pending.set_result(self._store(key, value, self._loading_async))
+        return False, value
+
+    def _lookup(self, key, template):
+        """
+        Find an unexpired entry and count the hit or miss. Must be called with the lock held.
+
+        Returns:
+            tuple: The (stored_at, value) entry, or None on a miss.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and self.ttl is not None and time.monotonic() - entry[0] >= self.ttl:
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.misses[template] = self.misses.get(template, 0) + 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits[template] = self.hits.get(template, 0) + 1
+        return entry
+
+    def _claim(self, key, template, loading, make_future):
+        """
+        Resolve a lookup for get_or_load. Must be called with the lock held.
+
+        Returns:
+            tuple: (True, value) on a hit, (False, future) when another caller is already
+                loading the key, or (False, None) when the caller must load it; a future for
+                the caller's load has then been registered in loading.
+        """
+        pending = loading.get(key)
+        if pending is not None:
+            # Waiting on another caller's load saves a request, so it counts as a hit
+            self.hits[template] = self.hits.get(template, 0) + 1
+            return False, pending
+        entry = self._lookup(key, template)
+        if entry is not None:
+            return True, entry[1]
+        loading[key] = make_future()
+        return False, None
+
+    def _store(self, key, value, loading):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._put(key, value)
+            del loading[key]
+        return value
+
+    def _release(self, key, loading):
+        with self._lock:
+            del loading[key]
+
+    def peek(self, endpoint, params):
+        """
+        Check whether a response is cached without counting a hit or miss.
+
+        Args:
+            endpoint (str): The API endpoint.
+            params (dict): Query parameters of the request.
+
+        Returns:
+            bool: True if an unexpired entry exists.
+        """
+        key = self.make_key(endpoint, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (self.ttl is None or time.monotonic() - entry[0] < self.ttl)
+
+    def set(self, endpoint, params, value):
+        key = self.make_key(endpoint, params)
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._put(key, value)
+
+    def _put(self, key, value):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, endpoint=None):
+        """
+        Drop cached responses.
+
+        Args:
+            endpoint (str, optional): An exact endpoint such as "/data/wow/item/123" or a template
+                such as "/data/wow/item/{id}". Defaults to None, which clears the whole cache.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        with self._lock:
+            if endpoint is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                keys = [key for key in self._entries
+                        if key[0] == endpoint or endpoint_template(key[0]) == endpoint]
+                for key in keys:
+                    del self._entries[key]
+                removed = len(keys)
+        logger.debug(f"Invalidated {removed} memoized responses")
+        return removed
+
+    def stats(self):
+        """
+        Summarize cache usage.
+
+        Returns:
+            dict: Entry count plus total and per-endpoint-template hit/miss counters.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": sum(self.hits.values()),
+                "misses": sum(self.misses.values()),
+                "by_endpoint": {
+                    template: {"hits": self.hits.get(template, 0), "misses": self.misses.get(template, 0)}
+                    for template in set(self.hits) | set(self.misses)
+                },
+            }
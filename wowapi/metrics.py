@@ -0,0 +1,249 @@
+import bisect
+import logging
+import threading
+from collections import namedtuple
+
+from .retry import endpoint_template
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Response headers reporting the remaining API quota
+QUOTA_HEADERS = ("X-Plan-Quota-Current", "X-Plan-Quota-Allotted", "X-Plan-QPS-Current", "X-Plan-QPS-Allotted",
+                 "X-RateLimit-Remaining", "X-RateLimit-Limit")
+
+RequestEvent = namedtuple("RequestEvent", ["region", "endpoint", "template", "status", "latency", "bytes",
+                                           "attempt", "error", "quota"])
+RequestEvent.__doc__ = """
+One HTTP attempt: status is None and error holds the exception when no
+response arrived; attempt is 0 for the first try and counts retries after
+that; quota maps the quota headers present on the response to their values.
+"""
+
+CacheEvent = namedtuple("CacheEvent", ["region", "endpoint", "template", "result"])
+CacheEvent.__doc__ = """
+How a request was served from cache: "memo" (in-memory hit), "fresh" (fresh
+response cache hit), "revalidated" (304 on a stale entry) or "miss".
+"""
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class RequestMetrics:
+    """
+    Per-request instrumentation for WoWAPI and AsyncWoWAPI.
+
+    Pass an instance as the metrics argument of one or more clients. Every
+    HTTP attempt and every cache lookup is recorded as an event: events are
+    aggregated into latency histograms, status, byte, retry and cache
+    counters per region and endpoint template, plus the latest quota header
+    values, and handed to any registered hooks. to_prometheus() renders the
+    aggregates in the Prometheus text exposition format.
+
+    Example:
+        metrics = RequestMetrics()
+        metrics.add_hook(lambda event: print(event))
+        api = WoWAPI(metrics=metrics)
+        ...
+        print(metrics.to_prometheus())
+    """
+
+    def __init__(self, hooks=None, buckets=LATENCY_BUCKETS, quota_headers=QUOTA_HEADERS):
+        """
+        Initialize the RequestMetrics instance.
+
+        Args:
+            hooks (Iterable[Callable], optional): Called with every RequestEvent and CacheEvent.
+                Defaults to None.
+            buckets (Iterable[float], optional): Latency histogram bucket bounds in seconds.
+                Defaults to LATENCY_BUCKETS.
+            quota_headers (Iterable[str], optional): Response headers recorded as quota gauges.
+                Defaults to QUOTA_HEADERS.
+        """
+        self.hooks = list(hooks or [])
+        self.buckets = tuple(sorted(buckets))
+        self.quota_headers = tuple(quota_headers)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Clear every aggregate. Hooks are kept.
+        """
+        with self._lock:
+            self._latency = {}
+            self._requests = {}
+            self._bytes = {}
+            self._retries = {}
+            self._errors = {}
+            self._cache = {}
+            self._quota = {}
+
+    def add_hook(self, hook):
+        """
+        Register a callable to receive every RequestEvent and CacheEvent.
+
+        Args:
+            hook (Callable): The hook. It runs on the requesting thread, so it should be quick.
+        """
+        self.hooks.append(hook)
+
+    def record_request(self, region, endpoint, status, latency, size=0, attempt=0, error=None, headers=None):
+        """
+        Record one HTTP attempt.
+
+        Args:
+            region (str): The client's region.
+            endpoint (str): The API endpoint requested.
+            status (int): The response status, or None if the attempt failed without a response.
+            latency (float): Seconds until the response body was read or the attempt failed.
+            size (int, optional): Response body size in bytes. Defaults to 0.
+            attempt (int, optional): 0 for the first try, n for the n-th retry. Defaults to 0.
+            error (Exception, optional): The network error, if any. Defaults to None.
+            headers (Mapping, optional): The response headers. Defaults to None.
+        """
+        quota = {}
+        for name in self.quota_headers:
+            value = headers.get(name) if headers is not None else None
+            if value is not None:
+                try:
+                    quota[name.lower()] = float(value)
+                except ValueError:
+                    continue
+        event = RequestEvent(region, endpoint, endpoint_template(endpoint), status, latency, size, attempt,
+                             error, quota)
+        key = (region, event.template)
+        with self._lock:
+            histogram = self._latency.get(key)
+            if histogram is None:
+                histogram = self._latency[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            histogram[0][bisect.bisect_left(self.buckets, latency)] += 1
+            histogram[1] += latency
+            status_key = key + (str(status) if status is not None else "error",)
+            self._requests[status_key] = self._requests.get(status_key, 0) + 1
+            self._bytes[key] = self._bytes.get(key, 0) + size
+            if attempt:
+                self._retries[key] = self._retries.get(key, 0) + 1
+            if error is not None:
+                error_key = key + (type(error).__name__,)
+                self._errors[error_key] = self._errors.get(error_key, 0) + 1
+            for name, value in quota.items():
+                self._quota[(region, name)] = value
+        self._emit(event)
+
+    def record_cache(self, region, endpoint, result):
+        """
+        Record how a request was served with respect to the caches.
+
+        Args:
+            region (str): The client's region.
+            endpoint (str): The API endpoint requested.
+            result (str): "memo", "fresh", "revalidated" or "miss".
+        """
+        event = CacheEvent(region, endpoint, endpoint_template(endpoint), result)
+        key = (region, event.template, result)
+        with self._lock:
+            self._cache[key] = self._cache.get(key, 0) + 1
+        self._emit(event)
+
+    def _emit(self, event):
+        for hook in self.hooks:
+            try:
+                hook(event)
+            except Exception as e:
+                logger.warning(f"Metrics hook {getattr(hook, '__name__', hook)} failed: {str(e)}")
+
+    def summary(self):
+        """
+        Summarize the aggregates per region and endpoint template.
+
+        Returns:
+            dict: (region, template) -> dict with requests, mean_latency, bytes, retries,
+                statuses and cache counts.
+        """
+        with self._lock:
+            result = {}
+            for key, (counts, total) in self._latency.items():
+                requests = sum(counts)
+                result[key] = {
+                    "requests": requests,
+                    "mean_latency": total / requests if requests else 0.0,
+                    "bytes": self._bytes.get(key, 0),
+                    "retries": self._retries.get(key, 0),
+                    "statuses": {},
+                    "cache": {},
+                }
+            for (region, template, status), count in self._requests.items():
+                result[(region, template)]["statuses"][status] = count
+            for (region, template, cache_result), count in self._cache.items():
+                entry = result.setdefault((region, template), {"requests": 0, "mean_latency": 0.0, "bytes": 0,
+                                                               "retries": 0, "statuses": {}, "cache": {}})
+                entry["cache"][cache_result] = count
+            return result
+
+    def to_prometheus(self, prefix="wowapi"):
+        """
+        Render the aggregates in the Prometheus text exposition format.
+
+        Args:
+            prefix (str, optional): Metric name prefix. Defaults to "wowapi".
+
+        Returns:
+            str: The exposition text.
+        """
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        with self._lock:
+            family("request_duration_seconds", "histogram", "API request latency by endpoint template.")
+            for (region, template), (counts, total) in sorted(self._latency.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{prefix}_request_duration_seconds_bucket"
+                                 f"{_labels(region=region, endpoint=template, le=le)} {cumulative}")
+                labels = _labels(region=region, endpoint=template)
+                lines.append(f"{prefix}_request_duration_seconds_sum{labels} {total}")
+                lines.append(f"{prefix}_request_duration_seconds_count{labels} {cumulative}")
+
+            family("requests_total", "counter", "API requests by endpoint template and response status.")
+            for (region, template, status), count in sorted(self._requests.items()):
+                lines.append(f"{prefix}_requests_total{_labels(region=region, endpoint=template, status=status)} {count}")
+
+            family("response_bytes_total", "counter", "Response body bytes received by endpoint template.")
+            for (region, template), count in sorted(self._bytes.items()):
+                lines.append(f"{prefix}_response_bytes_total{_labels(region=region, endpoint=template)} {count}")
+
+            family("retries_total", "counter", "Retried API requests by endpoint template.")
+            for (region, template), count in sorted(self._retries.items()):
+                lines.append(f"{prefix}_retries_total{_labels(region=region, endpoint=template)} {count}")
+
+            family("request_errors_total", "counter", "API requests that failed without a response.")
+            for (region, template, error), count in sorted(self._errors.items()):
+                lines.append(f"{prefix}_request_errors_total"
+                             f"{_labels(region=region, endpoint=template, error=error)} {count}")
+
+            family("cache_requests_total", "counter", "Requests by cache outcome and endpoint template.")
+            for (region, template, result), count in sorted(self._cache.items()):
+                lines.append(f"{prefix}_cache_requests_total"
+                             f"{_labels(region=region, endpoint=template, result=result)} {count}")
+
+            family("quota", "gauge", "Latest API quota header values.")
+            for (region, header), value in sorted(self._quota.items()):
+                lines.append(f"{prefix}_quota{_labels(region=region, header=header)} {value}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,174 @@
+import logging
+import queue
+import threading
+
+from .WoWapi import WoWAPI
+from .auth import TokenManager
+from .batch import BatchResult, fetch_many
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+REGIONS = ("us", "eu", "kr", "tw")
+
+_DONE = object()
+
+
+class MultiRegionAPI:
+    """
+    Fan requests out to several regions concurrently.
+
+    One WoWAPI client is kept per region, each with its own connection pool
+    and rate limiter for its regional API host, so a slow or throttled region
+    does not hold back the others. The clients share one TokenManager, since
+    Battle.net tokens are valid in every region served from oauth.battle.net.
+    Results from all regions are merged into a single stream keyed by region.
+
+    Example:
+        with MultiRegionAPI() as api:
+            for region, batch, error in api.stream_ah_commodities(batch_size=1000):
+                ...
+    """
+
+    def __init__(self, regions=REGIONS, token_manager=None, **client_kwargs):
+        """
+        Initialize the MultiRegionAPI instance.
+
+        Args:
+            regions (Iterable[str], optional): Regions to query. Defaults to REGIONS.
+            token_manager (TokenManager, optional): Token source shared by every region's client.
+                Defaults to TokenManager.from_env().
+            **client_kwargs: Passed on to each WoWAPI client, e.g. pool_maxsize or response_cache.
+                Passing a rate_limiter shares that one quota between all regions.
+        """
+        self.token_manager = token_manager if token_manager is not None else TokenManager.from_env()
+        self.clients = {
+            region: WoWAPI(region, token_manager=self.token_manager, **client_kwargs)
+            for region in regions
+        }
+        logger.info(f"MultiRegionAPI initialized for regions: {', '.join(self.clients)}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getitem__(self, region):
+        return self.clients[region]
+
+    @property
+    def regions(self):
+        return list(self.clients)
+
+    def close(self):
+        """
+        Close every region's HTTP session.
+        """
+        for client in self.clients.values():
+            client.close()
+
+    def fan_out(self, call, regions=None):
+        """
+        Run one call against several regions concurrently.
+
+        Args:
+            call (Callable): Called with each region's WoWAPI client, e.g.
+                lambda api: api.get_item_data(19019).
+            regions (Iterable[str], optional): Regions to query. Defaults to every configured region.
+
+        Yields:
+            BatchResult: (region, data, error) for each region, in completion order.
+        """
+        regions = list(regions) if regions is not None else self.regions
+        return fetch_many(lambda region: call(self.clients[region]), regions, max_workers=len(regions) or 1)
+
+    def get_ah_commodities_data(self, regions=None):
+        """
+        Fetch the commodities snapshot of several regions concurrently.
+
+        Args:
+            regions (Iterable[str], optional): Regions to query. Defaults to every configured region.
+
+        Yields:
+            BatchResult: (region, snapshot, error) for each region, in completion order.
+        """
+        return self.fan_out(lambda api: api.get_ah_commodities_data(), regions)
+
+    def stream(self, call, regions=None, queue_size=64):
+        """
+        Merge one streaming call per region into a single stream.
+
+        Each region's generator is drained on its own thread into a shared
+        bounded queue, so all downloads progress together and a slow consumer
+        throttles every producer. Closing the returned generator stops the
+        producers.
+
+        Args:
+            call (Callable): Called with each region's WoWAPI client; returns an iterable,
+                e.g. lambda api: api.stream_ah_commodities(batch_size=1000).
+            regions (Iterable[str], optional): Regions to query. Defaults to every configured region.
+            queue_size (int, optional): Capacity of the shared queue. Defaults to 64.
+
+        Yields:
+            BatchResult: (region, item, None) for every item produced, and (region, None, error)
+                if a region's stream fails.
+        """
+        regions = list(regions) if regions is not None else self.regions
+        results = queue.Queue(maxsize=queue_size)
+        stopped = threading.Event()
+
+        def put(result):
+            while not stopped.is_set():
+                try:
+                    results.put(result, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce(region):
+            items = None
+            try:
+                items = call(self.clients[region])
+                for item in items:
+                    if not put(BatchResult(region, item, None)):
+                        return
+            except Exception as e:
+                logger.error(f"Stream failed for region {region}: {str(e)}")
+                put(BatchResult(region, None, e))
+            finally:
+                if hasattr(items, "close"):
+                    items.close()
+                put(_DONE)
+
+        threads = [threading.Thread(target=produce, args=(region,), daemon=True) for region in regions]
+        for thread in threads:
+            thread.start()
+        try:
+            remaining = len(threads)
+            while remaining:
+                result = results.get()
+                if result is _DONE:
+                    remaining -= 1
+                else:
+                    yield result
+        finally:
+            stopped.set()
+            for thread in threads:
+                thread.join()
+
+    def stream_ah_commodities(self, regions=None, batch_size=1000):
+        """
+        Stream the commodities snapshots of several regions at once.
+
+        Args:
+            regions (Iterable[str], optional): Regions to query. Defaults to every configured region.
+            batch_size (int, optional): Auctions per yielded batch. Defaults to 1000.
+
+        Yields:
+            BatchResult: (region, list[dict], error) batches from all regions, interleaved.
+        """
+        return self.stream(lambda api: api.stream_ah_commodities(batch_size=batch_size), regions)
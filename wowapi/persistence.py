@@ -0,0 +1,187 @@
+import logging
+import threading
+
+from pymongo import ReplaceOne
+from pymongo.errors import BulkWriteError
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class BulkWriter:
+    """
+    Buffered, idempotent MongoDB writes for scraped documents.
+
+    Documents are buffered and flushed as unordered bulk_write batches of
+    upserts keyed on the Blizzard "id", so rerunning a scrape replaces
+    documents instead of duplicating them. A batch is flushed when it reaches
+    batch_size, when flush_interval seconds have passed since the last flush,
+    and on close.
+
+    If a bulk write fails outright (e.g. AutoReconnect) the batch is put back
+    in the buffer and the error is raised to the caller of flush(), add() or
+    close(); the periodic flush logs it and tries again later. Documents the
+    server rejects individually are dropped from the buffer and listed in
+    failed, so callers can tell them apart from documents that were written.
+
+    Example:
+        with BulkWriter(db["recipes"]) as writer:
+            for recipe in recipes:
+                writer.add(recipe)
+    """
+
+    def __init__(self, collection, key="id", batch_size=500, flush_interval=5.0):
+        """
+        Initialize the BulkWriter instance.
+
+        Args:
+            collection (pymongo.collection.Collection): The collection to write to.
+            key (str, optional): Field identifying a document. Defaults to "id".
+            batch_size (int, optional): Documents per bulk write. Defaults to 500.
+            flush_interval (float, optional): Maximum seconds a document stays buffered.
+                Defaults to 5.0. Use None to flush only on batch_size and close.
+        """
+        self.collection = collection
+        self.key = key
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.errors = 0
+        self.failed = {}
+        self._buffer = {}
+        self._known = None
+        self._lock = threading.RLock()
+        self._closed = threading.Event()
+        self._timer = None
+        if flush_interval:
+            self._timer = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._timer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Periodic flush to {self.collection.name} failed, will retry: {str(e)}")
+
+    def contains(self, value):
+        """
+        Check whether a document is stored or buffered.
+
+        The collection's keys are read once on first use; after that the check
+        is answered from memory and kept current by add().
+
+        Args:
+            value: The key value, e.g. an item ID.
+
+        Returns:
+            bool: True if a document with this key exists.
+        """
+        with self._lock:
+            if self._known is None:
+                self._known = set(self.collection.distinct(self.key))
+                logger.debug(f"Loaded {len(self._known)} existing keys from {self.collection.name}")
+            return value in self._known or value in self._buffer
+
+    def add(self, document):
+        """
+        Buffer a document for upsert, flushing if the batch is full.
+
+        Args:
+            document (dict): The document; it must contain the key field.
+        """
+        value = document[self.key]
+        with self._lock:
+            self._buffer[value] = document
+            if self._known is not None:
+                self._known.add(value)
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+
+    def add_many(self, documents):
+        """
+        Buffer several documents for upsert.
+
+        Args:
+            documents (Iterable[dict]): The documents; each must contain the key field.
+        """
+        for document in documents:
+            self.add(document)
+
+    def flush(self):
+        """
+        Write all buffered documents in one unordered bulk write.
+
+        Documents rejected by the server are recorded in failed, keyed by their
+        key value, instead of being counted as written.
+
+        Returns:
+            int: Number of documents written.
+
+        Raises:
+            pymongo.errors.PyMongoError: If the bulk write fails as a whole. The
+                documents stay buffered for the next flush.
+        """
+        with self._lock:
+            if not self._buffer:
+                return 0
+            documents, self._buffer = self._buffer, {}
+            values = list(documents)
+            operations = [ReplaceOne({self.key: value}, documents[value], upsert=True) for value in values]
+            rejected = {}
+            try:
+                self.collection.bulk_write(operations, ordered=False)
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    rejected[values[error["index"]]] = error.get("errmsg", "")
+                logger.error(f"Bulk write to {self.collection.name} failed for {len(rejected)} documents: {str(e)}")
+            except Exception:
+                # Nothing is known to be written: keep the batch, behind anything added since
+                documents.update(self._buffer)
+                self._buffer = documents
+                raise
+            if self.failed:
+                for value in values:
+                    self.failed.pop(value, None)
+            self.failed.update(rejected)
+            if self._known is not None:
+                self._known.difference_update(rejected)
+            written = len(operations) - len(rejected)
+            self.errors += len(rejected)
+            self.written += written
+        logger.debug(f"Flushed {written} documents to {self.collection.name}")
+        return written
+
+    def confirm(self, values):
+        """
+        Flush the buffer and report which of the given documents were not written.
+
+        Args:
+            values (Iterable): Key values of documents previously added.
+
+        Returns:
+            set: The values whose documents the server rejected.
+
+        Raises:
+            pymongo.errors.PyMongoError: If the flush fails as a whole.
+        """
+        with self._lock:
+            self.flush()
+            return {value for value in values if value in self.failed}
+
+    def close(self):
+        """
+        Stop the periodic flush and write any remaining documents.
+        """
+        self._closed.set()
+        if self._timer is not None:
+            self._timer.join()
+        self.flush()
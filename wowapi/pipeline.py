@@ -0,0 +1,179 @@
+import logging
+import queue
+import threading
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+_DONE = object()
+
+
+class PipelineStats:
+    """
+    Counters collected while a pipeline runs.
+    """
+
+    def __init__(self):
+        self.fetched = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = []
+        self.unwritten = []
+        self.callback_errors = []
+        self._lock = threading.Lock()
+
+    def _add(self, name, count=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + count)
+
+    def _fail(self, work_item, error):
+        with self._lock:
+            self.failed.append((work_item, error))
+
+    def _unwritten(self, documents, error):
+        with self._lock:
+            self.unwritten.extend((document, error) for document in documents)
+
+    def _callback_error(self, work_item, error):
+        with self._lock:
+            self.callback_errors.append((work_item, error))
+
+    def __repr__(self):
+        return (f"PipelineStats(fetched={self.fetched}, dropped={self.dropped}, "
+                f"written={self.written}, failed={len(self.failed)}, unwritten={len(self.unwritten)}, "
+                f"callback_errors={len(self.callback_errors)})")
+
+
+class Pipeline:
+    """
+    A producer/consumer scrape pipeline: fetch -> transform -> batched sink.
+
+    Work items flow through bounded queues into a pool of fetch workers, an
+    optional transform step and a single sink thread that receives documents
+    in batches. The bounded queues provide backpressure, so a slow database
+    throttles fetching rather than buffering the catalog in memory, and the
+    network never waits on the database or vice versa.
+
+    Example:
+        with BulkWriter(db["recipes"]) as writer:
+            pipeline = Pipeline(lambda recipe_id: api.get_recipe(recipe_id), sink=writer.add_many)
+            stats = pipeline.run(recipe_ids)
+    """
+
+    def __init__(self, fetch, sink=None, transform=None, workers=8, queue_size=256, batch_size=100,
+                 batch_timeout=1.0, on_item=None):
+        """
+        Initialize the Pipeline instance.
+
+        Args:
+            fetch (Callable): Called with each work item; returns the fetched data.
+            sink (Callable, optional): Called with each list of documents. Defaults to None,
+                in which case documents are discarded after the transform.
+            transform (Callable, optional): Called with (work_item, data); returns the document to
+                sink, or None to drop it. Defaults to passing the data through unchanged.
+            workers (int, optional): Number of concurrent fetch workers. Defaults to 8.
+            queue_size (int, optional): Capacity of each inter-stage queue. Defaults to 256.
+            batch_size (int, optional): Maximum documents per sink call. Defaults to 100.
+            batch_timeout (float, optional): Seconds to wait before sinking a partial batch.
+                Defaults to 1.0.
+            on_item (Callable, optional): Called with each work item once it has been fetched
+                or has failed, e.g. to advance a progress bar. Errors it raises are logged and
+                recorded in PipelineStats.callback_errors. Defaults to None.
+        """
+        self.fetch = fetch
+        self.sink = sink
+        self.transform = transform
+        self.workers = workers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.on_item = on_item
+
+    def run(self, work_items):
+        """
+        Push work items through the pipeline and wait for it to drain.
+
+        Failures in fetch or transform are recorded per work item and do not
+        stop the pipeline.
+
+        Args:
+            work_items (Iterable): The work items, consumed lazily.
+
+        Returns:
+            PipelineStats: Counters, the (work_item, exception) pairs that failed to fetch or
+                transform, and the (document, exception) pairs the sink rejected.
+        """
+        stats = PipelineStats()
+        inbox = queue.Queue(self.queue_size)
+        outbox = queue.Queue(self.queue_size)
+        workers = [threading.Thread(target=self._fetch_stage, args=(inbox, outbox, stats), daemon=True)
+                   for _ in range(self.workers)]
+        sink = threading.Thread(target=self._sink_stage, args=(outbox, stats), daemon=True)
+        for thread in workers:
+            thread.start()
+        sink.start()
+
+        try:
+            for work_item in work_items:
+                inbox.put(work_item)
+        finally:
+            for _ in workers:
+                inbox.put(_DONE)
+            for thread in workers:
+                thread.join()
+            outbox.put(_DONE)
+            sink.join()
+        logger.info(f"Pipeline finished: {stats}")
+        return stats
+
+    def _fetch_stage(self, inbox, outbox, stats):
+        while True:
+            work_item = inbox.get()
+            if work_item is _DONE:
+                return
+            try:
+                data = self.fetch(work_item)
+                stats._add("fetched")
+                document = self.transform(work_item, data) if self.transform is not None else data
+            except Exception as e:
+                logger.error(f"Pipeline failed on work item {work_item!r}: {str(e)}")
+                stats._fail(work_item, e)
+            else:
+                if document is None:
+                    stats._add("dropped")
+                else:
+                    outbox.put(document)
+            if self.on_item is not None:
+                try:
+                    self.on_item(work_item)
+                except Exception as e:
+                    logger.error(f"Pipeline on_item callback failed for work item {work_item!r}: {str(e)}")
+                    stats._callback_error(work_item, e)
+
+    def _sink_stage(self, outbox, stats):
+        batch = []
+        done = False
+        while not done:
+            try:
+                document = outbox.get(timeout=self.batch_timeout)
+            except queue.Empty:
+                document = None
+            if document is _DONE:
+                done = True
+            elif document is not None:
+                batch.append(document)
+            if batch and (done or document is None or len(batch) >= self.batch_size):
+                self._write(batch, stats)
+                batch = []
+
+    def _write(self, batch, stats):
+        if self.sink is None:
+            return
+        try:
+            self.sink(batch)
+            stats._add("written", len(batch))
+        except Exception as e:
+            logger.error(f"Pipeline sink failed for {len(batch)} documents: {str(e)}")
+            stats._unwritten(batch, e)
@@ -0,0 +1,212 @@
+import datetime
+import email.utils
+import json
+import logging
+import os
+import threading
+import time
+
+from .snapshot import CommoditySnapshot
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Blizzard republishes the commodities snapshot about once an hour
+PUBLISH_INTERVAL = 3600
+
+
+def parse_last_modified(value):
+    """
+    Parse a Last-Modified header.
+
+    Args:
+        value (str): The header value.
+
+    Returns:
+        datetime: The time in UTC, or None if the value is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).astimezone(datetime.timezone.utc)
+    except (TypeError, ValueError):
+        return None
+
+
+class PollerStats:
+    """
+    Counters collected while a poller runs.
+    """
+
+    def __init__(self):
+        self.checks = 0
+        self.unchanged = 0
+        self.snapshots = 0
+        self.failed = []
+        self._lock = threading.Lock()
+
+    def _add(self, name, count=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + count)
+
+    def _fail(self, region, error):
+        with self._lock:
+            self.failed.append((region, error))
+
+    def __repr__(self):
+        return (f"PollerStats(checks={self.checks}, unchanged={self.unchanged}, "
+                f"snapshots={self.snapshots}, failed={len(self.failed)})")
+
+
+class AuctionPoller:
+    """
+    A long-running commodities poller for one or more regions.
+
+    Each region is polled on its own thread with a conditional request
+    carrying the Last-Modified of the snapshot last seen, so checks between
+    publications cost a 304 instead of a multi-MB download. After a new
+    snapshot the next check is deferred until about publish_interval past its
+    Last-Modified. New snapshots are parsed into a CommoditySnapshot stamped
+    with their Last-Modified time and handed to every sink in turn.
+
+    Each region's Last-Modified is kept in a small JSON state file, so a
+    restarted poller does not download a snapshot it has already delivered.
+    It only advances once every sink has accepted the snapshot; if any sink
+    fails, the snapshot is downloaded and delivered to all sinks again on the
+    next check, so sinks must tolerate receiving the same snapshot twice.
+
+    Example:
+        poller = AuctionPoller([WoWAPI("us"), WoWAPI("eu")], sinks=[archive_sink, ingest_sink])
+        poller.run()
+    """
+
+    def __init__(self, clients, sinks, state_path=None, interval=60, publish_interval=PUBLISH_INTERVAL):
+        """
+        Initialize the AuctionPoller instance.
+
+        Args:
+            clients (Iterable[WoWAPI]): One client per region to poll.
+            sinks (Iterable[Callable]): Called with (region, snapshot) for every new snapshot,
+                from that region's thread.
+            state_path (str, optional): File holding each region's Last-Modified. Defaults to None,
+                in which case the first check of every region downloads the snapshot.
+            interval (float, optional): Seconds between checks while waiting for a new snapshot.
+                Defaults to 60.
+            publish_interval (float, optional): Expected seconds between publications.
+                Defaults to PUBLISH_INTERVAL.
+        """
+        self.clients = {client.region: client for client in clients}
+        self.sinks = list(sinks)
+        self.state_path = state_path
+        self.interval = interval
+        self.publish_interval = publish_interval
+        self.last_modified = {}
+        self.stats = PollerStats()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        if state_path and os.path.exists(state_path):
+            with open(state_path) as f:
+                self.last_modified = json.load(f)
+
+    def poll(self, region):
+        """
+        Check one region once and deliver its snapshot if it has changed.
+
+        Returns:
+            bool: True if a new snapshot was delivered to every sink.
+
+        Raises:
+            requests.HTTPError: If the request fails.
+        """
+        client = self.clients[region]
+        self.stats._add("checks")
+        last_modified, auctions = client.open_ah_commodities(self.last_modified.get(region))
+        if auctions is None:
+            self.stats._add("unchanged")
+            logger.debug(f"Commodities for {region} unchanged since {last_modified}")
+            return False
+        try:
+            snapshot = CommoditySnapshot.from_auctions(auctions, timestamp=parse_last_modified(last_modified))
+        finally:
+            auctions.close()
+        logger.info(f"New commodities snapshot for {region}: {len(snapshot)} auctions, last modified {last_modified}")
+        delivered = True
+        for sink in self.sinks:
+            try:
+                sink(region, snapshot)
+            except Exception as e:
+                logger.error(f"Snapshot sink {getattr(sink, '__name__', sink)} failed for {region}: {str(e)}")
+                self.stats._fail(region, e)
+                delivered = False
+        self.stats._add("snapshots")
+        if not delivered:
+            return False
+        if last_modified:
+            with self._lock:
+                self.last_modified[region] = last_modified
+                self._save()
+        return True
+
+    def next_check(self, region, changed):
+        """
+        Decide how long to wait before checking a region again.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        published = parse_last_modified(self.last_modified.get(region))
+        if changed and published is not None:
+            expected = published.timestamp() + self.publish_interval - time.time()
+            return max(expected, self.interval)
+        return self.interval
+
+    def run(self):
+        """
+        Poll every region until stop() is called.
+
+        Returns:
+            PollerStats: Counters over the poller's lifetime.
+        """
+        threads = [threading.Thread(target=self._run_region, args=(region,), name=f"poller-{region}", daemon=True)
+                   for region in self.clients]
+        logger.info(f"Polling commodities for regions: {', '.join(self.clients)}")
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(1)
+        except KeyboardInterrupt:
+            self.stop()
+            for thread in threads:
+                thread.join()
+        logger.info(f"Poller stopped: {self.stats}")
+        return self.stats
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run_region(self, region):
+        while not self._stopped.is_set():
+            try:
+                changed = self.poll(region)
+            except Exception as e:
+                logger.error(f"Commodities check failed for {region}: {str(e)}")
+                self.stats._fail(region, e)
+                changed = False
+            delay = self.next_check(region, changed)
+            logger.debug(f"Next commodities check for {region} in {delay:.0f}s")
+            self._stopped.wait(delay)
+
+    def _save(self):
+        if not self.state_path:
+            return
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.last_modified, f)
+        os.replace(tmp_path, self.state_path)
@@ -0,0 +1,189 @@
+import logging
+from collections import namedtuple
+
+import numpy as np
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Share of the sale price the auction house keeps
+AUCTION_HOUSE_CUT = 0.05
+
+ProfitTable = namedtuple("ProfitTable", ["recipe_id", "cost", "revenue", "profit", "priced"])
+ProfitTable.__doc__ = """
+Per-recipe crafting cost, net sale revenue and profit in copper as parallel
+float64 arrays, ordered like RecipeBook.recipe_id. A value is NaN when some
+reagent or the crafted item has no price; priced marks the complete rows.
+"""
+
+
+def slot_options_from(slot_types, category_index):
+    """
+    Resolve the items accepted by each modified crafting slot type.
+
+    Args:
+        slot_types (Iterable[dict]): Slot type documents as returned by
+            WoWAPI.get_modified_crafting_reagent_slot_type.
+        category_index (CategoryIndex): Index of stored items by modified crafting category.
+
+    Returns:
+        dict: Slot type ID -> set of accepted item IDs.
+    """
+    options = {}
+    for slot_type in slot_types:
+        items = set()
+        for category in slot_type.get("compatible_categories", []):
+            items |= category_index.items_for(category["id"])
+        options[slot_type["id"]] = items
+    return options
+
+
+class RecipeBook:
+    """
+    Recipe reagent lists flattened into NumPy arrays for vectorized pricing.
+
+    Every reagent of every recipe is one entry in parallel arrays (recipe row,
+    item, quantity), and every modified crafting slot is a contiguous block of
+    the items it accepts. All item IDs are resolved once against a sorted
+    table of the items involved, so pricing a new snapshot is one price lookup
+    for that table followed by gathers and group-by sums, with no per-recipe
+    Python work.
+
+    Example:
+        book = RecipeBook.from_recipes(recipe_collection.find(), slot_options)
+        table = book.profit(snapshot)
+    """
+
+    def __init__(self, recipe_id, crafted_item_id, crafted_quantity, reagent_recipe, reagent_item_id,
+                 reagent_quantity, slot_recipe, option_slot, option_item_id):
+        """
+        Initialize the RecipeBook instance from flat arrays.
+
+        Args:
+            recipe_id (array-like): Recipe IDs, one per recipe row.
+            crafted_item_id (array-like): Crafted item ID per recipe, 0 if unknown.
+            crafted_quantity (array-like): Average number of items crafted per recipe.
+            reagent_recipe (array-like): Recipe row of each reagent entry.
+            reagent_item_id (array-like): Item ID of each reagent entry.
+            reagent_quantity (array-like): Quantity of each reagent entry.
+            slot_recipe (array-like): Recipe row of each modified crafting slot.
+            option_slot (array-like): Slot of each accepted item, grouped by slot.
+            option_item_id (array-like): Accepted item IDs.
+        """
+        self.recipe_id = np.asarray(recipe_id, dtype=np.int64)
+        self.crafted_quantity = np.asarray(crafted_quantity, dtype=np.float64)
+        self.reagent_recipe = np.asarray(reagent_recipe, dtype=np.int64)
+        self.reagent_quantity = np.asarray(reagent_quantity, dtype=np.float64)
+        self.slot_recipe = np.asarray(slot_recipe, dtype=np.int64)
+        crafted_item_id = np.asarray(crafted_item_id, dtype=np.int64)
+        reagent_item_id = np.asarray(reagent_item_id, dtype=np.int64)
+        option_slot = np.asarray(option_slot, dtype=np.int64)
+        option_item_id = np.asarray(option_item_id, dtype=np.int64)
+
+        self.item_id = np.unique(np.concatenate([reagent_item_id, option_item_id, crafted_item_id]))
+        self.crafted_index = np.searchsorted(self.item_id, crafted_item_id)
+        self.reagent_index = np.searchsorted(self.item_id, reagent_item_id)
+        self.option_index = np.searchsorted(self.item_id, option_item_id)
+        self.option_starts = np.flatnonzero(np.diff(option_slot, prepend=-1))
+        logger.debug(f"Built recipe book: {len(self.recipe_id)} recipes, {len(self.reagent_recipe)} reagents, "
+                     f"{len(self.slot_recipe)} modified crafting slots, {len(self.item_id)} distinct items")
+
+    @classmethod
+    def from_recipes(cls, recipes, slot_options=None):
+        """
+        Build a recipe book from recipe documents.
+
+        Modified crafting slots are priced at their cheapest accepted item;
+        slots whose type has no known items are left out.
+
+        Args:
+            recipes (Iterable[dict]): Recipes as returned by WoWAPI.get_recipe.
+            slot_options (dict, optional): Slot type ID -> accepted item IDs, e.g. from
+                slot_options_from(). Defaults to None (modified crafting slots are ignored).
+
+        Returns:
+            RecipeBook: The recipe book.
+        """
+        recipe_id, crafted_item_id, crafted_quantity = [], [], []
+        reagent_recipe, reagent_item_id, reagent_quantity = [], [], []
+        slot_recipe, option_slot, option_item_id = [], [], []
+        for row, recipe in enumerate(recipes):
+            recipe_id.append(recipe["id"])
+            crafted_item = recipe.get("crafted_item") or recipe.get("alliance_crafted_item") or {}
+            crafted_item_id.append(crafted_item.get("id", 0))
+            crafted = recipe.get("crafted_quantity", {})
+            minimum = crafted.get("minimum", 1)
+            crafted_quantity.append(crafted.get("value", (minimum + crafted.get("maximum", minimum)) / 2))
+            for reagent in recipe.get("reagents", []):
+                reagent_recipe.append(row)
+                reagent_item_id.append(reagent["reagent"]["id"])
+                reagent_quantity.append(reagent.get("quantity", 1))
+            for slot in recipe.get("modified_crafting_slots", []):
+                options = (slot_options or {}).get(slot.get("slot_type", {}).get("id"))
+                if not options:
+                    continue
+                option_slot.extend([len(slot_recipe)] * len(options))
+                option_item_id.extend(options)
+                slot_recipe.append(row)
+        return cls(recipe_id, crafted_item_id, crafted_quantity, reagent_recipe, reagent_item_id,
+                   reagent_quantity, slot_recipe, option_slot, option_item_id)
+
+    def __len__(self):
+        return len(self.recipe_id)
+
+    def item_prices(self, item_ids, prices):
+        """
+        Look up a price for every item in the book.
+
+        Args:
+            item_ids (numpy.ndarray): Sorted item IDs, e.g. from CommoditySnapshot.min_price().
+            prices (numpy.ndarray): Price of each item in copper.
+
+        Returns:
+            numpy.ndarray: float64 price per entry of self.item_id, NaN for unlisted items.
+        """
+        result = np.full(len(self.item_id), np.nan)
+        if not len(item_ids):
+            return result
+        rows = np.searchsorted(item_ids, self.item_id)
+        rows = np.minimum(rows, len(item_ids) - 1)
+        listed = item_ids[rows] == self.item_id
+        result[listed] = prices[rows[listed]]
+        return result
+
+    def profit(self, snapshot, prices=None, ah_cut=AUCTION_HOUSE_CUT):
+        """
+        Price every recipe against a commodities snapshot.
+
+        Args:
+            snapshot (CommoditySnapshot): The snapshot to price against.
+            prices (tuple, optional): (item_ids, prices) to use instead of the snapshot's
+                minimum prices, e.g. snapshot.median_price(). Defaults to None.
+            ah_cut (float, optional): Share of the sale price kept by the auction house.
+                Defaults to AUCTION_HOUSE_CUT.
+
+        Returns:
+            ProfitTable: Cost, revenue and profit per recipe.
+        """
+        item_ids, item_prices = prices if prices is not None else snapshot.min_price()
+        price = self.item_prices(item_ids, item_prices)
+        count = len(self.recipe_id)
+
+        cost = np.bincount(self.reagent_recipe, weights=price[self.reagent_index] * self.reagent_quantity,
+                           minlength=count)
+        if len(self.slot_recipe):
+            # fmin skips NaN, so a slot is priced as long as one accepted item is listed
+            slot_cost = np.fmin.reduceat(price[self.option_index], self.option_starts)
+            cost += np.bincount(self.slot_recipe, weights=slot_cost, minlength=count)
+
+        revenue = price[self.crafted_index] * self.crafted_quantity * (1 - ah_cut)
+        profit = revenue - cost
+        return ProfitTable(
+            recipe_id=self.recipe_id,
+            cost=cost,
+            revenue=revenue,
+            profit=profit,
+            priced=~np.isnan(profit),
+        )
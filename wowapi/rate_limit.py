@@ -0,0 +1,174 @@
+import asyncio
+import datetime
+import email.utils
+import logging
+import threading
+import time
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Blizzard API quotas for a single client
+REQUESTS_PER_SECOND = 100
+REQUESTS_PER_HOUR = 36000
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket.
+
+    Tokens are handed out as reservations: taking a token may drive the balance
+    negative, and the caller is told how long to wait until its token is
+    actually available. This keeps the lock out of the sleep, so the same bucket
+    can pace both threads and asyncio tasks.
+    """
+
+    def __init__(self, rate, capacity):
+        """
+        Initialize the TokenBucket instance.
+
+        Args:
+            rate (float): Tokens added per second.
+            capacity (float): Maximum number of tokens the bucket can hold.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, tokens=1):
+        """
+        Reserve tokens from the bucket.
+
+        Args:
+            tokens (float, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            float: Seconds the caller must wait before using the reserved tokens.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def set_rate(self, rate):
+        """
+        Change the refill rate, settling tokens earned at the old rate first.
+
+        Args:
+            rate (float): New number of tokens added per second.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+
+class RateLimiter:
+    """
+    Client-side rate limiter matching Blizzard's per-second and per-hour quotas.
+
+    One instance can be shared between several WoWAPI/AsyncWoWAPI clients, threads
+    and asyncio tasks so that they draw from a single budget. On a 429 response
+    all callers are paused for the server's Retry-After and the per-second rate is
+    halved; it then climbs back towards the configured ceiling on each success.
+    """
+
+    def __init__(self, per_second=REQUESTS_PER_SECOND, per_hour=REQUESTS_PER_HOUR, min_per_second=1):
+        """
+        Initialize the RateLimiter instance.
+
+        Args:
+            per_second (float, optional): Maximum sustained requests per second. Defaults to 100.
+            per_hour (float, optional): Maximum requests per hour. Defaults to 36000.
+            min_per_second (float, optional): Floor for the adaptive per-second rate. Defaults to 1.
+        """
+        self.per_second = per_second
+        self.per_hour = per_hour
+        self.min_per_second = min_per_second
+        self.second_bucket = TokenBucket(per_second, per_second)
+        self.hour_bucket = TokenBucket(per_hour / 3600, per_hour)
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """
+        Reserve one request from every bucket.
+
+        Returns:
+            float: Seconds to wait before the request may be sent.
+        """
+        wait = max(self.second_bucket.reserve(), self.hour_bucket.reserve())
+        with self._lock:
+            blocked = self._blocked_until - time.monotonic()
+        return max(wait, blocked, 0.0)
+
+    def acquire(self):
+        """
+        Block the calling thread until a request may be sent.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            logger.debug(f"Rate limit reached, waiting {wait:.3f}s")
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """
+        Suspend the calling task until a request may be sent.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            logger.debug(f"Rate limit reached, waiting {wait:.3f}s")
+            await asyncio.sleep(wait)
+
+    def on_throttled(self, retry_after=None):
+        """
+        Back off after the API answered with 429 Too Many Requests.
+
+        Args:
+            retry_after (float, optional): Seconds from the Retry-After header. Defaults to 1 second.
+        """
+        pause = retry_after if retry_after is not None else 1.0
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+        rate = max(self.min_per_second, self.second_bucket.rate / 2)
+        self.second_bucket.set_rate(rate)
+        logger.warning(f"Throttled by API, pausing {pause:.1f}s and lowering rate to {rate:.1f} req/s")
+
+    def on_success(self):
+        """
+        Let the adaptive per-second rate recover after a successful request.
+        """
+        if self.second_bucket.rate < self.per_second:
+            self.second_bucket.set_rate(min(self.per_second, self.second_bucket.rate + 1))
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header given either in seconds or as an HTTP date.
+
+    Args:
+        value (str): The header value, or None.
+
+    Returns:
+        float: The delay in seconds, or None if the header is missing or malformed.
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
@@ -0,0 +1,178 @@
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+def normalize_realm_auction(auction):
+    """
+    Give a connected-realm auction the unit_price field of a commodity auction.
+
+    Realm auctions carry a buyout for the whole stack instead of a unit price;
+    with unit_price set they can be loaded with CommoditySnapshot.from_auctions.
+    Auctions listed for bids only have no price to compare and are rejected.
+
+    A snapshot keeps only the base item ID, so the item's bonus_lists and
+    modifiers are not carried over: realm prices are per base item, with
+    every variant of an item priced together.
+
+    Args:
+        auction (dict): An auction from a connected realm's auctions endpoint.
+
+    Returns:
+        dict: The same auction, updated in place, or None if it has no buyout.
+    """
+    if "unit_price" not in auction:
+        buyout = auction.get("buyout")
+        if not buyout:
+            return None
+        auction["unit_price"] = buyout // (auction.get("quantity") or 1)
+    return auction
+
+
+def buyout_auctions(auctions):
+    """
+    Normalize connected-realm auctions, skipping those listed for bids only.
+
+    Args:
+        auctions (Iterable[dict]): Auctions from a connected realm's auctions endpoint.
+
+    Yields:
+        dict: Auctions with unit_price set; see normalize_realm_auction().
+    """
+    for auction in auctions:
+        auction = normalize_realm_auction(auction)
+        if auction is not None:
+            yield auction
+
+
+class RealmScanStats:
+    """
+    Counters collected while a realm scan runs.
+    """
+
+    def __init__(self):
+        self.scanned = 0
+        self.unchanged = 0
+        self.auctions = 0
+        self.failed = []
+
+    def __repr__(self):
+        return (f"RealmScanStats(scanned={self.scanned}, unchanged={self.unchanged}, "
+                f"auctions={self.auctions}, failed={len(self.failed)})")
+
+
+class RealmAuctionScanner:
+    """
+    Scan the auction houses of every connected realm in a region concurrently.
+
+    Realms are requested on a thread pool, so the scan is paced only by the
+    client's rate limiter. Each realm's Last-Modified is kept in a small JSON
+    state file and sent back as If-Modified-Since, so realms whose snapshot has
+    not been republished cost a 304 instead of a full download. Changed realms
+    are streamed straight into the sink without buffering the response.
+
+    A realm's Last-Modified is only recorded after its sink call returns, so a
+    realm whose ingestion failed is downloaded again on the next run.
+
+    Example:
+        scanner = RealmAuctionScanner(api, ingest_realm, ".cache/realm-scan-us.json")
+        stats = scanner.run()
+    """
+
+    def __init__(self, api, sink, state_path=None, workers=8):
+        """
+        Initialize the RealmAuctionScanner instance.
+
+        Args:
+            api (WoWAPI): The client used for the scan. Its pool_maxsize should be at least workers.
+            sink (Callable): Called on a worker thread with (connected_realm_id, auctions, last_modified)
+                for every changed realm; auctions is an iterator the sink consumes.
+            state_path (str, optional): File holding each realm's Last-Modified. Defaults to None,
+                in which case the state is only kept for the lifetime of the scanner.
+            workers (int, optional): Number of realms scanned concurrently. Defaults to 8.
+        """
+        self.api = api
+        self.sink = sink
+        self.state_path = state_path
+        self.workers = workers
+        self.last_modified = {}
+        if state_path and os.path.exists(state_path):
+            with open(state_path) as f:
+                self.last_modified = json.load(f)
+
+    def run(self, realm_ids=None):
+        """
+        Scan the given connected realms and ingest every changed snapshot.
+
+        Args:
+            realm_ids (Iterable[int], optional): Connected realms to scan. Defaults to every
+                realm in the client's region.
+
+        Returns:
+            RealmScanStats: Realm and auction counters, and (realm_id, exception) failures.
+        """
+        stats = RealmScanStats()
+        realm_ids = list(realm_ids) if realm_ids is not None else self.api.get_connected_realm_ids()
+        logger.info(f"Scanning {len(realm_ids)} connected realms with {self.workers} workers")
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self._scan, realm_id): realm_id for realm_id in realm_ids}
+            for future in as_completed(futures):
+                realm_id = futures[future]
+                try:
+                    last_modified, count = future.result()
+                except Exception as e:
+                    logger.error(f"Auction scan failed for connected realm {realm_id}: {str(e)}")
+                    stats.failed.append((realm_id, e))
+                    continue
+                if count is None:
+                    stats.unchanged += 1
+                    continue
+                stats.scanned += 1
+                stats.auctions += count
+                if last_modified:
+                    self.last_modified[str(realm_id)] = last_modified
+        self._save()
+        logger.info(f"Realm scan finished: {stats}")
+        return stats
+
+    def _scan(self, realm_id):
+        """
+        Scan one realm.
+
+        Returns:
+            tuple: (last_modified, auction count), with a count of None if the realm was unchanged.
+        """
+        last_modified, auctions = self.api.open_connected_realm_auctions(realm_id, self.last_modified.get(str(realm_id)))
+        if auctions is None:
+            logger.debug(f"Connected realm {realm_id} unchanged since {last_modified}")
+            return last_modified, None
+        counter = [0]
+
+        def counted():
+            for auction in auctions:
+                counter[0] += 1
+                yield auction
+
+        try:
+            self.sink(realm_id, counted(), last_modified)
+        finally:
+            auctions.close()
+        logger.debug(f"Connected realm {realm_id}: ingested {counter[0]} auctions")
+        return last_modified, counter[0]
+
+    def _save(self):
+        if not self.state_path:
+            return
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.last_modified, f)
+        os.replace(tmp_path, self.state_path)
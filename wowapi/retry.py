@@ -0,0 +1,247 @@
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Statuses worth retrying: throttling and transient server-side failures
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def endpoint_template(endpoint):
+    """
+    Collapse the numeric IDs in an endpoint path into a template.
+
+    Args:
+        endpoint (str): The API endpoint, e.g. "/data/wow/recipe/42".
+
+    Returns:
+        str: The endpoint template, e.g. "/data/wow/recipe/{id}".
+    """
+    return re.sub(r"/\d+(?=/|$)", "/{id}", endpoint)
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a request is refused because its endpoint's circuit is open.
+    """
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for retryable API failures.
+    """
+
+    def __init__(self, max_retries=5, backoff_factor=0.5, max_backoff=60, jitter=True, retry_statuses=RETRY_STATUSES):
+        """
+        Initialize the RetryPolicy instance.
+
+        Args:
+            max_retries (int, optional): Retries after the first attempt before giving up. Defaults to 5.
+            backoff_factor (float, optional): Base delay in seconds, doubled on every attempt. Defaults to 0.5.
+            max_backoff (float, optional): Upper bound for a single delay in seconds. Defaults to 60.
+            jitter (bool, optional): Randomize delays between zero and the backoff. Defaults to True.
+            retry_statuses (Iterable[int], optional): HTTP statuses that are retried.
+                Defaults to 429 and the transient 5xx statuses.
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def is_retryable(self, status):
+        return status in self.retry_statuses
+
+    def get_delay(self, attempt, retry_after=None):
+        """
+        Compute how long to wait before the next attempt.
+
+        Args:
+            attempt (int): Zero-based number of the attempt that just failed.
+            retry_after (float, optional): Delay requested by the server's Retry-After header.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker guarding one endpoint template.
+
+    After failure_threshold consecutive failures the circuit opens and requests
+    are held back for recovery_timeout seconds. The first request after that is
+    let through as a probe: success closes the circuit, failure opens it again.
+    A probe that ends without either outcome must be released, so the next
+    caller can probe instead.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, name, failure_threshold=5, recovery_timeout=30):
+        """
+        Initialize the CircuitBreaker instance.
+
+        Args:
+            name (str): Name used in log messages, usually the endpoint template.
+            failure_threshold (int, optional): Consecutive failures that open the circuit. Defaults to 5.
+            recovery_timeout (float, optional): Seconds to stay open before probing again. Defaults to 30.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe = None
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def _check(self, block):
+        """
+        Decide whether a request may be sent now.
+
+        Args:
+            block (bool): Whether the caller is willing to wait for the circuit to recover.
+
+        Returns:
+            tuple: (wait, probe) where wait is the seconds to wait before asking again, or 0 if the
+                request may proceed, and probe identifies the probe slot granted to the caller.
+
+        Raises:
+            CircuitOpenError: If the circuit is not closed and block is False.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return 0.0, None
+            remaining = self.opened_at + self.recovery_timeout - time.monotonic()
+            if self.state == self.OPEN and remaining <= 0:
+                self.state = self.HALF_OPEN
+                logger.info(f"Circuit for {self.name} half-open, sending probe request")
+            if self.state == self.HALF_OPEN and self._probe is None:
+                self._probes += 1
+                self._probe = self._probes
+                return 0.0, self._probe
+            if not block:
+                raise CircuitOpenError(f"Circuit for {self.name} is {self.state}")
+            # Wait out the open period, or poll while another caller's probe is in flight
+            return (remaining if remaining > 0 else 1.0), None
+
+    def acquire(self, block=True):
+        """
+        Block the calling thread until the circuit lets a request through.
+
+        Args:
+            block (bool, optional): Wait for recovery instead of raising. Defaults to True.
+
+        Returns:
+            int: The probe slot held by the caller, or None; pass it to release() once the
+                request has finished.
+        """
+        while True:
+            wait, probe = self._check(block)
+            if wait <= 0:
+                return probe
+            logger.debug(f"Circuit for {self.name} is {self.state}, waiting {wait:.1f}s")
+            time.sleep(wait)
+
+    async def acquire_async(self, block=True):
+        """
+        Suspend the calling task until the circuit lets a request through.
+
+        Args:
+            block (bool, optional): Wait for recovery instead of raising. Defaults to True.
+
+        Returns:
+            int: The probe slot held by the caller, or None; pass it to release() once the
+                request has finished.
+        """
+        while True:
+            wait, probe = self._check(block)
+            if wait <= 0:
+                return probe
+            logger.debug(f"Circuit for {self.name} is {self.state}, waiting {wait:.1f}s")
+            await asyncio.sleep(wait)
+
+    def release(self, probe):
+        """
+        Give up a probe slot, letting the next caller probe if no outcome was recorded.
+
+        Args:
+            probe (int): The value returned by acquire(); None is ignored.
+        """
+        if probe is None:
+            return
+        with self._lock:
+            if self._probe == probe:
+                self._probe = None
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit for {self.name} closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probe = None
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                logger.warning(f"Circuit for {self.name} opened after {self.failures} failures, "
+                               f"pausing for {self.recovery_timeout}s")
+
+
+class CircuitBreakerRegistry:
+    """
+    Lazily created circuit breakers, one per endpoint template.
+    """
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30):
+        """
+        Initialize the CircuitBreakerRegistry instance.
+
+        Args:
+            failure_threshold (int, optional): Consecutive failures that open a circuit. Defaults to 5.
+            recovery_timeout (float, optional): Seconds a circuit stays open before probing. Defaults to 30.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint):
+        """
+        Return the circuit breaker for an endpoint.
+
+        Args:
+            endpoint (str): The API endpoint being requested.
+
+        Returns:
+            CircuitBreaker: The breaker shared by every endpoint with the same template.
+        """
+        template = endpoint_template(endpoint)
+        with self._lock:
+            breaker = self._breakers.get(template)
+            if breaker is None:
+                breaker = CircuitBreaker(template, self.failure_threshold, self.recovery_timeout)
+                self._breakers[template] = breaker
+            return breaker
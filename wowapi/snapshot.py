@@ -0,0 +1,246 @@
+import datetime
+import logging
+from collections import namedtuple
+
+import numpy as np
+
+from .streaming import chunked
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Encoding of the auction "time_left" strings as small integers
+TIME_LEFT_CODES = {"SHORT": 0, "MEDIUM": 1, "LONG": 2, "VERY_LONG": 3}
+TIME_LEFT_NAMES = {code: name for name, code in TIME_LEFT_CODES.items()}
+UNKNOWN_TIME_LEFT = 255
+
+SnapshotDiff = namedtuple("SnapshotDiff", ["new", "removed", "changed"])
+SnapshotDiff.__doc__ = """
+Auction IDs that appeared, disappeared (sold or expired) or changed quantity,
+price or time_left between two snapshots, each as a sorted int64 array.
+"""
+
+PriceSummary = namedtuple("PriceSummary", ["item_id", "min_price", "median_price", "total_quantity", "auctions"])
+PriceSummary.__doc__ = """
+Per-item price statistics as parallel arrays, ordered by item_id.
+"""
+
+
+class CommoditySnapshot:
+    """
+    A columnar, NumPy-backed commodities auction snapshot.
+
+    Each auction is one row across typed arrays (auction_id, item_id, quantity,
+    unit_price, time_left) rather than a nested dict, which cuts memory per
+    auction to a few dozen bytes and lets per-item statistics run as vectorized
+    group-by operations. Rows are kept sorted by item_id and then unit_price.
+    """
+
+    def __init__(self, auction_id, item_id, quantity, unit_price, time_left, timestamp=None):
+        """
+        Initialize the CommoditySnapshot instance from column arrays.
+
+        Args:
+            auction_id (array-like): Auction IDs.
+            item_id (array-like): Item ID of each auction.
+            quantity (array-like): Quantity listed in each auction.
+            unit_price (array-like): Unit price of each auction in copper.
+            time_left (array-like): Encoded time_left of each auction (see TIME_LEFT_CODES).
+            timestamp (datetime, optional): When the snapshot was taken. Defaults to now (UTC).
+        """
+        auction_id = np.asarray(auction_id, dtype=np.int64)
+        item_id = np.asarray(item_id, dtype=np.int32)
+        unit_price = np.asarray(unit_price, dtype=np.int64)
+        order = np.lexsort((unit_price, item_id))
+        self.auction_id = auction_id[order]
+        self.item_id = item_id[order]
+        self.quantity = np.asarray(quantity, dtype=np.int32)[order]
+        self.unit_price = unit_price[order]
+        self.time_left = np.asarray(time_left, dtype=np.uint8)[order]
+        self.timestamp = timestamp or datetime.datetime.now(datetime.timezone.utc)
+        self._groups = None
+
+    @classmethod
+    def from_auctions(cls, auctions, timestamp=None, batch_size=100000):
+        """
+        Build a snapshot from commodity auction dicts.
+
+        The auctions are consumed in batches, so a stream such as
+        WoWAPI.stream_ah_commodities() never has to be held as dicts in full.
+
+        Args:
+            auctions (Iterable[dict]): Auctions as returned by the commodities endpoint.
+            timestamp (datetime, optional): When the snapshot was taken. Defaults to now (UTC).
+            batch_size (int, optional): Auctions converted to arrays at a time. Defaults to 100000.
+
+        Returns:
+            CommoditySnapshot: The snapshot.
+        """
+        columns = [[], [], [], [], []]
+        for batch in chunked(auctions, batch_size):
+            columns[0].append(np.fromiter((a["id"] for a in batch), dtype=np.int64, count=len(batch)))
+            columns[1].append(np.fromiter((a["item"]["id"] for a in batch), dtype=np.int32, count=len(batch)))
+            columns[2].append(np.fromiter((a.get("quantity", 0) for a in batch), dtype=np.int32, count=len(batch)))
+            columns[3].append(np.fromiter((a.get("unit_price", 0) for a in batch), dtype=np.int64, count=len(batch)))
+            columns[4].append(np.fromiter(
+                (TIME_LEFT_CODES.get(a.get("time_left"), UNKNOWN_TIME_LEFT) for a in batch),
+                dtype=np.uint8, count=len(batch),
+            ))
+        dtypes = (np.int64, np.int32, np.int32, np.int64, np.uint8)
+        arrays = [np.concatenate(column) if column else np.empty(0, dtype=dtype)
+                  for column, dtype in zip(columns, dtypes)]
+        snapshot = cls(*arrays, timestamp=timestamp)
+        logger.debug(f"Built commodity snapshot with {len(snapshot)} auctions")
+        return snapshot
+
+    def __len__(self):
+        return len(self.auction_id)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.auction_id, self.item_id, self.quantity, self.unit_price, self.time_left))
+
+    def _group_bounds(self):
+        """
+        Locate each item's block of rows.
+
+        Returns:
+            tuple: (item_ids, starts, ends) arrays; rows starts[i]:ends[i] belong to item_ids[i].
+        """
+        if self._groups is None:
+            item_ids, starts = np.unique(self.item_id, return_index=True)
+            ends = np.append(starts[1:], len(self.item_id))
+            self._groups = (item_ids, starts, ends)
+        return self._groups
+
+    def item_ids(self):
+        return self._group_bounds()[0]
+
+    def rows_for_item(self, item_id):
+        """
+        Return the row slice for one item.
+
+        Args:
+            item_id (int): The item ID.
+
+        Returns:
+            slice: Rows of that item, ordered by unit price. Empty if the item is not listed.
+        """
+        start, end = np.searchsorted(self.item_id, [item_id, item_id + 1])
+        return slice(int(start), int(end))
+
+    def min_price(self):
+        item_ids, starts, _ = self._group_bounds()
+        if not len(item_ids):
+            return item_ids, np.empty(0, dtype=np.int64)
+        # Rows are sorted by price within each item, so the first row is the cheapest
+        return item_ids, self.unit_price[starts]
+
+    def total_quantity(self):
+        item_ids, starts, _ = self._group_bounds()
+        if not len(item_ids):
+            return item_ids, np.empty(0, dtype=np.int64)
+        return item_ids, np.add.reduceat(self.quantity, starts, dtype=np.int64)
+
+    def quantile_price(self, q, weighted=True):
+        """
+        Compute a price quantile for every item.
+
+        Args:
+            q (float): The quantile in [0, 1], e.g. 0.5 for the median.
+            weighted (bool, optional): Weight each auction by its quantity, so the quantile is over
+                units for sale rather than over auctions. Defaults to True.
+
+        Returns:
+            tuple: (item_ids, prices) arrays. Prices are float64 so that an item whose
+                auctions all have zero quantity can be reported as NaN when weighted.
+        """
+        item_ids, starts, ends = self._group_bounds()
+        if not len(item_ids):
+            return item_ids, np.empty(0, dtype=np.float64)
+        weights = self.quantity if weighted else np.ones(len(self), dtype=np.int64)
+        cumulative = np.cumsum(weights, dtype=np.int64)
+        before = np.where(starts > 0, cumulative[starts - 1], 0)
+        totals = cumulative[ends - 1] - before
+        targets = before + np.maximum(np.ceil(q * totals), 1)
+        rows = np.searchsorted(cumulative, targets, side="left")
+        rows = np.clip(rows, starts, ends - 1)
+        prices = self.unit_price[rows].astype(np.float64)
+        prices[totals == 0] = np.nan
+        return item_ids, prices
+
+    def median_price(self, weighted=True):
+        return self.quantile_price(0.5, weighted)
+
+    def price_summary(self):
+        """
+        Summarize every listed item in one pass.
+
+        Returns:
+            PriceSummary: Minimum and quantity-weighted median price, total quantity and
+                auction count per item.
+        """
+        item_ids, starts, ends = self._group_bounds()
+        return PriceSummary(
+            item_id=item_ids,
+            min_price=self.min_price()[1],
+            median_price=self.median_price()[1],
+            total_quantity=self.total_quantity()[1],
+            auctions=ends - starts,
+        )
+
+    def diff(self, previous):
+        """
+        Compare this snapshot with an earlier one.
+
+        Args:
+            previous (CommoditySnapshot): The earlier snapshot.
+
+        Returns:
+            SnapshotDiff: Auction IDs that are new, removed, or changed in quantity, price or
+                time_left. A time_left step counts as a change so that stored auctions keep an
+                up-to-date expiry bracket.
+        """
+        current_ids, current_rows = np.unique(self.auction_id, return_index=True)
+        previous_ids, previous_rows = np.unique(previous.auction_id, return_index=True)
+        common, current_index, previous_index = np.intersect1d(
+            current_ids, previous_ids, assume_unique=True, return_indices=True
+        )
+        current_common = current_rows[current_index]
+        previous_common = previous_rows[previous_index]
+        changed = (
+            (self.quantity[current_common] != previous.quantity[previous_common])
+            | (self.unit_price[current_common] != previous.unit_price[previous_common])
+            | (self.time_left[current_common] != previous.time_left[previous_common])
+        )
+        return SnapshotDiff(
+            new=np.setdiff1d(current_ids, previous_ids, assume_unique=True),
+            removed=np.setdiff1d(previous_ids, current_ids, assume_unique=True),
+            changed=common[changed],
+        )
+
+    def to_auctions(self, rows=slice(None)):
+        """
+        Convert rows back into auction dicts shaped like the API response.
+
+        Args:
+            rows (slice | array-like, optional): Rows to convert. Defaults to all rows.
+
+        Returns:
+            list[dict]: The auctions.
+        """
+        return [
+            {
+                "id": int(auction_id),
+                "item": {"id": int(item_id)},
+                "quantity": int(quantity),
+                "unit_price": int(unit_price),
+                "time_left": TIME_LEFT_NAMES.get(int(time_left)),
+            }
+            for auction_id, item_id, quantity, unit_price, time_left in zip(
+                self.auction_id[rows], self.item_id[rows], self.quantity[rows],
+                self.unit_price[rows], self.time_left[rows],
+            )
+        ]
@@ -0,0 +1,101 @@
+import codecs
+import json
+import logging
+import re
+from itertools import islice
+
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+_WHITESPACE_AND_COMMAS = re.compile(r"[\s,]*")
+
+
+def iter_json_array(chunks, key):
+    """
+    Incrementally parse the elements of one top-level array in a JSON document.
+
+    Only the array under key is decoded, one element at a time, so memory use is
+    bounded by the size of a single network chunk plus a single element rather
+    than by the whole document.
+
+    Args:
+        chunks (Iterable[bytes]): The raw document, e.g. from response.iter_content().
+        key (str): The name of the array member to stream, e.g. "auctions".
+
+    Yields:
+        The decoded array elements, in document order.
+
+    Raises:
+        ValueError: If the array is missing or the document ends mid-array.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    start = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+    chunks = iter(chunks)
+    buffer = ""
+    exhausted = False
+
+    def read_more():
+        nonlocal buffer, exhausted
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            buffer += text_decoder.decode(b"", final=True)
+        else:
+            buffer += text_decoder.decode(chunk)
+
+    # Skip ahead to the opening bracket of the array
+    while True:
+        match = start.search(buffer)
+        if match:
+            buffer = buffer[match.end():]
+            break
+        if exhausted:
+            raise ValueError(f"JSON array '{key}' not found in response")
+        # Keep a tail in case the key is split across chunks
+        buffer = buffer[-(len(key) + 64):]
+        read_more()
+
+    pos = 0
+    while True:
+        pos = _WHITESPACE_AND_COMMAS.match(buffer, pos).end()
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+        try:
+            element, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if exhausted:
+                raise ValueError(f"Unexpected end of JSON array '{key}'")
+            buffer = buffer[pos:]
+            pos = 0
+            read_more()
+            continue
+        if end == len(buffer) and not exhausted:
+            # A number at the very end of the buffer may continue in the next chunk
+            buffer = buffer[pos:]
+            pos = 0
+            read_more()
+            continue
+        pos = end
+        yield element
+
+
+def chunked(iterable, size):
+    """
+    Group an iterable into lists of at most size elements.
+
+    Args:
+        iterable (Iterable): The elements to group.
+        size (int): Maximum number of elements per list.
+
+    Yields:
+        list: Consecutive groups of elements.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk